@@ -1,10 +1,25 @@
 # Algoritmos Clásicos Visualizados
 # Implementación y análisis de algoritmos famosos
 
+import os
+import sys
 import time
+from array import array
+from operator import itemgetter
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+try:
+    import pyhub
+except ImportError:
+    # Fuera del IDE (python algorithms.py): pyhub está en la raíz del repositorio
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from pyhub import benchmark
+from pyhub.graph import (Graph, astar, bidirectional_dijkstra, dijkstra, euclidean,
+                         random_graph)
+
 print("🧮 Algoritmos Clásicos\n")
 
 # 1. Algoritmos de Ordenamiento con Visualización
@@ -24,62 +39,342 @@ def bubble_sort(arr):
     
     return arr, comparisons, swaps
 
-def quick_sort(arr, comparisons=[0]):
-    """Quick Sort con conteo de operaciones"""
-    if len(arr) <= 1:
-        return arr
-    
-    pivot = arr[len(arr) // 2]
-    left = []
-    middle = []
-    right = []
-    
-    for x in arr:
-        comparisons[0] += 1
-        if x < pivot:
-            left.append(x)
-        elif x == pivot:
-            middle.append(x)
+class SortStats:
+    """Contadores de una llamada a quick_sort (no se comparten entre llamadas)"""
+
+    def __init__(self):
+        self.comparisons = 0
+        self.swaps = 0
+        self.max_depth = 0
+        self.insertion_sorts = 0
+        self.heapsorts = 0
+
+    def __repr__(self):
+        return (f"SortStats(comparaciones={self.comparisons:,}, intercambios={self.swaps:,}, "
+                f"profundidad={self.max_depth}, inserción={self.insertion_sorts}, "
+                f"heapsort={self.heapsorts})")
+
+INSERTION_THRESHOLD = 16  # por debajo, la inserción gana a seguir partiendo
+
+def _insertion_sort(arr, lo, hi, stats):
+    """Ordena arr[lo..hi] por inserción"""
+    comparisons = moves = 0
+    for i in range(lo + 1, hi + 1):
+        value = arr[i]
+        j = i - 1
+        while j >= lo:
+            comparisons += 1
+            if not value < arr[j]:
+                break
+            arr[j + 1] = arr[j]
+            moves += 1
+            j -= 1
+        arr[j + 1] = value
+    stats.comparisons += comparisons
+    stats.swaps += moves
+    stats.insertion_sorts += 1
+
+def _sift_down(arr, lo, root, size, stats):
+    """Hunde arr[lo + root] en el montículo de `size` elementos que empieza en lo"""
+    value = arr[lo + root]
+    child = 2 * root + 1
+    while child < size:
+        if child + 1 < size:
+            stats.comparisons += 1
+            if arr[lo + child] < arr[lo + child + 1]:
+                child += 1
+        stats.comparisons += 1
+        if not value < arr[lo + child]:
+            break
+        arr[lo + root] = arr[lo + child]
+        stats.swaps += 1
+        root = child
+        child = 2 * root + 1
+    arr[lo + root] = value
+
+def _heapsort(arr, lo, hi, stats):
+    """Ordena arr[lo..hi] con heapsort: O(n log n) garantizado"""
+    size = hi - lo + 1
+    for root in range(size // 2 - 1, -1, -1):
+        _sift_down(arr, lo, root, size, stats)
+    for end in range(size - 1, 0, -1):
+        arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+        stats.swaps += 1
+        _sift_down(arr, lo, 0, end, stats)
+    stats.heapsorts += 1
+
+def _partition(arr, lo, hi, stats):
+    """Partición de Hoare con pivote mediana de tres; devuelve el corte p
+    (arr[lo..p] <= pivote <= arr[p+1..hi])"""
+    mid = (lo + hi) // 2
+    swaps = 0
+    if arr[mid] < arr[lo]:
+        arr[lo], arr[mid] = arr[mid], arr[lo]
+        swaps += 1
+    if arr[hi] < arr[lo]:
+        arr[lo], arr[hi] = arr[hi], arr[lo]
+        swaps += 1
+    if arr[hi] < arr[mid]:
+        arr[mid], arr[hi] = arr[hi], arr[mid]
+        swaps += 1
+    comparisons = 3
+    pivot = arr[mid]
+    i = lo - 1
+    j = hi + 1
+    while True:
+        i += 1
+        start = i
+        while arr[i] < pivot:
+            i += 1
+        j -= 1
+        end = j
+        while pivot < arr[j]:
+            j -= 1
+        # Cada bucle hace un avance por comparación más la que lo detiene
+        comparisons += (i - start) + (end - j) + 2
+        if i >= j:
+            stats.comparisons += comparisons
+            stats.swaps += swaps
+            return j
+        arr[i], arr[j] = arr[j], arr[i]
+        swaps += 1
+
+def _introsort(arr, lo, hi, depth_limit, level, stats):
+    stats.max_depth = max(stats.max_depth, level)
+    while hi - lo + 1 > INSERTION_THRESHOLD:
+        if depth_limit == 0:
+            # Demasiadas particiones malas: datos adversarios
+            _heapsort(arr, lo, hi, stats)
+            return
+        depth_limit -= 1
+        p = _partition(arr, lo, hi, stats)
+        # Recursión en la parte pequeña y bucle en la grande: pila O(log n)
+        if p - lo < hi - p:
+            _introsort(arr, lo, p, depth_limit, level + 1, stats)
+            lo = p + 1
         else:
-            right.append(x)
-    
-    return quick_sort(left, comparisons) + middle + quick_sort(right, comparisons)
+            _introsort(arr, p + 1, hi, depth_limit, level + 1, stats)
+            hi = p
+    if lo < hi:
+        _insertion_sort(arr, lo, hi, stats)
 
-# Comparar algoritmos de ordenamiento
-print("📊 Comparando algoritmos de ordenamiento...\n")
+def quick_sort(arr, stats=None):
+    """Quick Sort en el sitio (introsort): mediana de tres, inserción en
+    rangos pequeños y heapsort si la recursión pasa de 2·log2(n) niveles.
+    Ordena arr sin crear listas nuevas y la devuelve; si se pasa un
+    SortStats, lo rellena con los contadores de esta llamada."""
+    if stats is None:
+        stats = SortStats()
+    if len(arr) > 1:
+        _introsort(arr, 0, len(arr) - 1, 2 * (len(arr).bit_length() - 1), 0, stats)
+    return arr
 
-sizes = [10, 50, 100, 200, 500]
-bubble_times = []
-quick_times = []
+# Comparar algoritmos de ordenamiento con pyhub.benchmark: cada punto es la
+# mediana de varias medidas (perf_counter_ns, con calentamiento) y una
+# función deja de medirse cuando el siguiente tamaño superaría el presupuesto
+print("📊 Comparando algoritmos de ordenamiento...\n")
 
-for size in sizes:
-    arr = np.random.randint(0, 1000, size).tolist()
-    
-    # Bubble Sort
-    start = time.time()
-    bubble_sort(arr)
-    bubble_times.append(time.time() - start)
-    
-    # Quick Sort
-    start = time.time()
-    comparisons = [0]
-    quick_sort(arr, comparisons)
-    quick_times.append(time.time() - start)
+sort_benchmark = benchmark(
+    {'Bubble Sort': bubble_sort, 'Quick Sort': quick_sort, 'sorted()': sorted},
+    sizes=[10, 100, 1_000, 10_000, 100_000, 1_000_000],
+    make_input=lambda n: np.random.randint(0, 1_000_000, n).tolist(),
+    repeats=5,
+    budget=1.0,
+)
+print(sort_benchmark.table())
+for name, size in sort_benchmark.skipped.items():
+    print(f"  ⏭️ {name}: sin medir desde n={size:,} (superaría el presupuesto)")
 
-# Visualizar comparación
+# Visualizar comparación: medianas con su rango intercuartílico y la curva ajustada
+colors = {'Bubble Sort': '#667eea', 'Quick Sort': '#764ba2', 'sorted()': '#48bb78'}
+fits = sort_benchmark.fits()
 plt.figure(figsize=(10, 6))
-plt.plot(sizes, bubble_times, 'o-', label='Bubble Sort', linewidth=2, markersize=8, color='#667eea')
-plt.plot(sizes, quick_times, 's-', label='Quick Sort', linewidth=2, markersize=8, color='#764ba2')
+for name, rows in sort_benchmark.results.items():
+    sizes = [row['size'] for row in rows]
+    medians = np.array([row['median_ns'] for row in rows]) / 1e9
+    errors = np.array([[row['median_ns'] - row['q1_ns'], row['q3_ns'] - row['median_ns']]
+                       for row in rows]).T / 1e9
+    plt.errorbar(sizes, medians, yerr=errors, fmt='o-', label=name, linewidth=2,
+                 markersize=7, capsize=4, color=colors[name])
+    fit = fits[name]
+    if fit:
+        plt.plot(sizes, medians[-1] * (np.array(sizes) / sizes[-1]) ** fit['exponent'], '--',
+                 color=colors[name], alpha=0.5, label=f"{name}: {fit['model']} (n^{fit['exponent']:.2f})")
+plt.xscale('log')
+plt.yscale('log')
 plt.xlabel('Tamaño del Array', fontsize=12)
-plt.ylabel('Tiempo (segundos)', fontsize=12)
+plt.ylabel('Tiempo (segundos, mediana)', fontsize=12)
 plt.title('Comparación de Algoritmos de Ordenamiento', fontsize=14, fontweight='bold')
-plt.legend(fontsize=11)
-plt.grid(True, alpha=0.3)
+plt.legend(fontsize=10)
+plt.grid(True, which='both', alpha=0.3)
 plt.tight_layout()
 plt.show()
 
+# Exportar los resultados (mediana, cuartiles, ajuste y entorno) como JSON
+benchmark_json = sort_benchmark.to_json()
+print(f"\n📄 Resultados en JSON ({len(benchmark_json):,} caracteres):")
+print(benchmark_json)
+
 print("✓ Comparación de ordenamiento visualizada")
 
+# Quick Sort frente a entradas difíciles: con pivote fijo, las ordenadas o las
+# construidas a propósito lo llevan a O(n²); la mediana de tres cubre las
+# primeras y el heapsort de respaldo las segundas
+def mcilroy_adversary(n):
+    """Entrada que hace cuadrático a quick_sort (M. D. McIlroy, 'A Killer
+    Adversary for Quicksort'): los valores se deciden durante la ordenación,
+    siempre en contra del pivote elegido"""
+    gas = n  # valor aún sin decidir (mayor que cualquier decidido)
+    values = [gas] * n
+    state = {'solid': 0, 'candidate': 0}
+
+    class Item:
+        __slots__ = ('index',)
+
+        def __init__(self, index):
+            self.index = index
+
+        def compare(self, other):
+            x, y = self.index, other.index
+            if values[x] == gas and values[y] == gas:
+                frozen = x if x == state['candidate'] else y
+                values[frozen] = state['solid']
+                state['solid'] += 1
+            if values[x] == gas:
+                state['candidate'] = x
+            elif values[y] == gas:
+                state['candidate'] = y
+            return values[x] - values[y]
+
+        def __lt__(self, other):
+            return self.compare(other) < 0
+
+        def __gt__(self, other):
+            return self.compare(other) > 0
+
+    quick_sort([Item(i) for i in range(n)])
+    return values
+
+n_hard = 5_000
+hard_inputs = {
+    'Aleatoria': np.random.randint(0, 1_000_000, n_hard).tolist(),
+    'Ordenada': list(range(n_hard)),
+    'Invertida': list(range(n_hard, 0, -1)),
+    'Todos iguales': [7] * n_hard,
+    'Adversaria': mcilroy_adversary(n_hard),
+}
+print(f"\n🧨 Quick Sort con entradas difíciles (n={n_hard:,}):")
+for name, data in hard_inputs.items():
+    stats = SortStats()
+    result = quick_sort(data.copy(), stats)
+    assert result == sorted(data)
+    fallback = f", {stats.heapsorts} heapsort" if stats.heapsorts else ""
+    print(f"  {name:14s} {stats.comparisons:>9,} comparaciones · "
+          f"profundidad {stats.max_depth}{fallback}")
+
+# Backend tipado: las listas de Python guardan cada entero como objeto, así
+# que convertir con .tolist() tira la ventaja de NumPy. Estas funciones
+# trabajan directamente sobre buffers (ndarray o array('i')), sin copiar a
+# listas, y ordenan en el sitio igual que quick_sort
+COUNTING_SORT_LIMIT = 1 << 20  # rango máximo para el counting sort directo
+RADIX_BITS = 16  # dígito de cada pasada del radix sort
+MERGE_RUN = 1 << 16  # tramo que se ordena antes de empezar a mezclar
+
+def as_typed(data):
+    """Vista NumPy de los datos: sin copia para ndarray y array('i'); las
+    listas se convierten"""
+    if isinstance(data, np.ndarray):
+        return data
+    if isinstance(data, array):
+        return np.frombuffer(data, dtype=data.typecode)
+    return np.asarray(data)
+
+def _store_sorted(data, result):
+    """Escribe el resultado en los datos originales y los devuelve"""
+    if isinstance(data, list):
+        data[:] = result.tolist()
+    else:
+        as_typed(data)[:] = result
+    return data
+
+def radix_sort(data):
+    """Ordena enteros acotados en el sitio (lista, array('i') o ndarray).
+    Si el rango cabe en COUNTING_SORT_LIMIT, counting sort: O(n + rango).
+    Si no, radix LSD de 16 bits: cada pasada es una ordenación estable por
+    un dígito, que NumPy resuelve contando (no comparando)."""
+    values = as_typed(data)
+    # Antes que el tipo: np.asarray([]) es float64 y ya está ordenado
+    if values.size < 2:
+        return data
+    if values.dtype.kind not in 'iu':
+        raise TypeError('radix_sort solo ordena enteros')
+    low = int(values.min())
+    span = int(values.max()) - low
+    if span < COUNTING_SORT_LIMIT:
+        counts = np.bincount(values.astype(np.int64) - low, minlength=span + 1)
+        result = np.repeat(np.arange(low, low + span + 1, dtype=values.dtype), counts)
+    else:
+        # Claves sin signo desde el mínimo: así los negativos también valen
+        keys = (values.astype(np.int64) - low).astype(np.uint64)
+        shift = 0
+        while span >> shift:
+            digits = ((keys >> np.uint64(shift)) & np.uint64((1 << RADIX_BITS) - 1)).astype(np.uint16)
+            order = np.argsort(digits, kind='stable')
+            keys = keys[order]
+            shift += RADIX_BITS
+        result = (keys.astype(np.int64) + low).astype(values.dtype)
+    return _store_sorted(data, result)
+
+def merge_sorted(left, right):
+    """Mezcla vectorizada de dos arrays ordenados: la posición final de cada
+    elemento es la suya más los del otro array que van antes (searchsorted).
+    Estable: a igualdad, primero los de left."""
+    merged = np.empty(left.size + right.size, dtype=np.result_type(left, right))
+    merged[np.arange(left.size) + np.searchsorted(right, left, side='left')] = left
+    merged[np.arange(right.size) + np.searchsorted(left, right, side='right')] = right
+    return merged
+
+def merge_sort_typed(data, run=MERGE_RUN):
+    """Merge sort por tramos en el sitio: ordena tramos de `run` elementos
+    y los mezcla por parejas con merge_sorted hasta que queda uno. Vale para
+    enteros y reales; es también la forma de juntar datos que ya llegan
+    ordenados por partes."""
+    values = as_typed(data)
+    if values.size < 2:
+        return data
+    runs = [np.sort(values[i:i + run], kind='stable') for i in range(0, values.size, run)]
+    while len(runs) > 1:
+        runs = [merge_sorted(runs[i], runs[i + 1]) if i + 1 < len(runs) else runs[i]
+                for i in range(0, len(runs), 2)]
+    return _store_sorted(data, runs[0])
+
+print("\n⚡ Backend tipado (sin .tolist()): millones de elementos")
+typed_benchmark = benchmark(
+    {'Radix Sort': radix_sort, 'Merge Sort (tramos)': merge_sort_typed, 'np.sort': np.sort},
+    sizes=[10_000, 100_000, 1_000_000, 5_000_000],
+    make_input=lambda n: np.random.randint(0, 1_000_000_000, n, dtype=np.int32),
+    repeats=3,
+    budget=1.5,
+)
+print(typed_benchmark.table())
+for name, size in typed_benchmark.skipped.items():
+    print(f"  ⏭️ {name}: sin medir desde n={size:,} (superaría el presupuesto)")
+
+# array('i') también es un buffer: radix_sort lo ordena sin pasar por listas
+n_typed = 1_000_000
+scores = array('i')
+scores.frombytes(np.random.randint(0, 1_000, n_typed, dtype=np.intc).tobytes())
+scores_list = scores.tolist()
+start = time.perf_counter()
+radix_sort(scores)
+typed_time = time.perf_counter() - start
+start = time.perf_counter()
+scores_list.sort()
+list_time = time.perf_counter() - start
+assert scores.tolist() == scores_list
+print(f"\n  array('i') de {n_typed:,} puntuaciones (0-999): radix_sort {typed_time * 1000:.1f} ms"
+      f" · list.sort() {list_time * 1000:.1f} ms")
+
 # 2. Búsqueda Binaria vs Búsqueda Lineal
 def linear_search(arr, target):
     """Búsqueda lineal"""
@@ -119,62 +414,71 @@ print(f"  Búsqueda Binaria: {binary_comps} comparaciones")
 print(f"  Mejora: {linear_comps/binary_comps:.1f}x más rápida")
 
 # 3. Algoritmo de Dijkstra (Camino más corto)
+# pyhub.graph guarda el grafo en arrays CSR y usa un montículo: O((V + E) log V)
+def dijkstra_scan(graph, start):
+    """Dijkstra sin montículo: busca el siguiente nodo recorriendo todos los
+    no visitados, O(V²). Se conserva como referencia para la comparación."""
+    distances = {node: float('inf') for node in graph}
+    distances[start] = 0
+    visited = set()
+
+    while len(visited) < len(graph):
+        # Encontrar nodo no visitado con menor distancia
+        current = None
+        for node in graph:
+            if node not in visited:
+                if current is None or distances[node] < distances[current]:
+                    current = node
+
+        if current is None or distances[current] == float('inf'):
+            break
+
+        visited.add(current)
+
+        # Actualizar distancias de vecinos
+        for neighbor, weight in graph[current].items():
+            distance = distances[current] + weight
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+
+    return distances
+
 def dijkstra_simple():
-    """Implementación simple del algoritmo de Dijkstra"""
+    """Caminos más cortos en un grafo pequeño de ciudades"""
     # Grafo de ejemplo (ciudades y distancias)
-    graph = {
+    cities = {
         'A': {'B': 4, 'C': 2},
         'B': {'A': 4, 'C': 1, 'D': 5},
         'C': {'A': 2, 'B': 1, 'D': 8, 'E': 10},
         'D': {'B': 5, 'C': 8, 'E': 2},
         'E': {'C': 10, 'D': 2}
     }
-    
-    def dijkstra(graph, start):
-        distances = {node: float('inf') for node in graph}
-        distances[start] = 0
-        visited = set()
-        
-        while len(visited) < len(graph):
-            # Encontrar nodo no visitado con menor distancia
-            current = None
-            for node in graph:
-                if node not in visited:
-                    if current is None or distances[node] < distances[current]:
-                        current = node
-            
-            if current is None:
-                break
-            
-            visited.add(current)
-            
-            # Actualizar distancias de vecinos
-            for neighbor, weight in graph[current].items():
-                distance = distances[current] + weight
-                if distance < distances[neighbor]:
-                    distances[neighbor] = distance
-        
-        return distances
-    
+    # Posiciones de los nodos
+    pos = {'A': (0, 2), 'B': (2, 3), 'C': (2, 1), 'D': (4, 2), 'E': (5, 1)}
+    graph = Graph.from_dict(cities, coords=pos)
+
     start = 'A'
-    distances = dijkstra(graph, start)
-    
+    paths = dijkstra(graph, start)
+    distances = paths.distances()
+
     print(f"\n🗺️ Distancias más cortas desde '{start}':")
     for city, dist in sorted(distances.items()):
-        print(f"  {start} → {city}: {dist}")
-    
+        route = ' → '.join(paths.path(city))
+        print(f"  {start} → {city}: {dist:g}  ({route})")
+
     # Visualizar el grafo
     fig, ax = plt.subplots(figsize=(10, 8))
-    
-    # Posiciones de los nodos
-    pos = {'A': (0, 2), 'B': (2, 3), 'C': (2, 1), 'D': (4, 2), 'E': (5, 1)}
-    
-    # Dibujar aristas
-    for node, neighbors in graph.items():
+
+    # Dibujar aristas; las del camino más corto hasta E, resaltadas
+    best = paths.path('E')
+    on_path = set(zip(best, best[1:])) | set(zip(best[1:], best))
+    for node, neighbors in cities.items():
         for neighbor, weight in neighbors.items():
             x1, y1 = pos[node]
             x2, y2 = pos[neighbor]
-            ax.plot([x1, x2], [y1, y2], 'gray', linewidth=2, alpha=0.5)
+            highlight = (node, neighbor) in on_path
+            ax.plot([x1, x2], [y1, y2], '#f6ad55' if highlight else 'gray',
+                    linewidth=4 if highlight else 2, alpha=0.9 if highlight else 0.5)
             # Etiqueta de peso
             mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
             ax.text(mid_x, mid_y, str(weight), fontsize=10, 
@@ -187,7 +491,7 @@ def dijkstra_simple():
         ax.text(x, y, node, fontsize=14, fontweight='bold', 
                ha='center', va='center', color='white')
         # Distancia
-        ax.text(x, y-0.4, f'd={distances[node]}', fontsize=9, 
+        ax.text(x, y-0.4, f'd={distances[node]:g}', fontsize=9, 
                ha='center', va='top', style='italic')
     
     ax.set_xlim(-0.5, 6)
@@ -199,9 +503,124 @@ def dijkstra_simple():
     plt.show()
 
 dijkstra_simple()
+
+# Grafos grandes: random_graph genera un grafo geométrico (nodos en el plano,
+# aristas entre vecinos cercanos) con ~5 aristas por nodo
+def make_graph_input(n):
+    graph = random_graph(n, 5 * n, seed=n)
+    return {'csr': graph, 'dict': graph.to_dict()}
+
+print("\n📊 Dijkstra O(V²) frente a Dijkstra con montículo sobre CSR...")
+graph_benchmark = benchmark(
+    {'Dijkstra O(V²)': lambda g: dijkstra_scan(g['dict'], 0),
+     'Dijkstra heapq': lambda g: dijkstra(g['csr'], 0)},
+    sizes=[500, 2_000, 8_000, 32_000],
+    make_input=make_graph_input,
+    repeats=3,
+    budget=1.5,
+    copy=False,
+)
+print(graph_benchmark.table())
+for name, size in graph_benchmark.skipped.items():
+    print(f"  ⏭️ {name}: sin medir desde n={size:,} (superaría el presupuesto)")
+
+# De un extremo a otro del grafo: A* con la distancia en línea recta y la
+# búsqueda bidireccional cierran muchos menos nodos que Dijkstra
+city_graph = random_graph(40_000, 200_000, seed=7)
+paths = dijkstra(city_graph, 0)
+target = max(paths.distances().items(), key=lambda item: item[1])[0]
+print(f"\n🧭 Del nodo 0 al {target:,} en {city_graph}:")
+searches = {
+    'Dijkstra (con destino)': lambda: dijkstra(city_graph, 0, target),
+    'A* (euclídea)': lambda: astar(city_graph, 0, target, euclidean(city_graph.coords)),
+    'Bidireccional': lambda: bidirectional_dijkstra(city_graph, 0, target),
+}
+for name, search in searches.items():
+    begin = time.perf_counter()
+    found = search()
+    elapsed = time.perf_counter() - begin
+    distance = found.distance(target) if name.startswith('Dijkstra') else found.distance
+    print(f"  {name:24s} distancia {distance:9.1f} · {found.settled:>6,} nodos cerrados · "
+          f"{elapsed * 1000:6.1f} ms")
+
 print("✓ Algoritmo de Dijkstra visualizado")
 
 # 4. Problema de la Mochila (Knapsack)
+# La tabla completa del DP ocupa (n+1)·(W+1) celdas: con 20,000 items y
+# capacidad 25,000 serían casi 4 GB. Aquí solo se guarda una fila, que se
+# actualiza item a item con NumPy, y la solución se reconstruye con bits de
+# decisión o, si tampoco caben, partiendo los items en dos (Hirschberg)
+KNAPSACK_TABLE_BYTES = 16 * 2**20  # bits de decisión que se permite guardar
+
+def _knapsack_best(weights, values, capacity):
+    """Última fila del DP: best[c] es el mejor valor con capacidad c"""
+    best = np.zeros(capacity + 1, dtype=values.dtype)
+    for w, v in zip(weights.tolist(), values.tolist()):
+        if w > capacity:
+            continue
+        # best[c] = max(best[c], best[c - w] + v) para todo c ≥ w a la vez
+        np.maximum(best[w:], best[:capacity + 1 - w] + v, out=best[w:])
+    return best
+
+def _knapsack_table(weights, values, capacity):
+    """DP guardando por item un bit por capacidad (¿se coge?), empaquetado
+    con np.packbits; devuelve los índices elegidos"""
+    best = np.zeros(capacity + 1, dtype=values.dtype)
+    decisions = []
+    for w, v in zip(weights.tolist(), values.tolist()):
+        if w > capacity:
+            decisions.append(None)
+            continue
+        candidate = best[:capacity + 1 - w] + v
+        take = candidate > best[w:]
+        best[w:][take] = candidate[take]
+        decisions.append(np.packbits(take))
+    chosen = []
+    c = capacity
+    for i in range(len(decisions) - 1, -1, -1):
+        offset = c - int(weights[i])
+        row = decisions[i]
+        if row is not None and offset >= 0 and row[offset >> 3] >> (7 - (offset & 7)) & 1:
+            chosen.append(i)
+            c = offset
+    return chosen[::-1]
+
+def _knapsack_select(weights, values, capacity, start, chosen):
+    """Hirschberg: reparte la capacidad entre las dos mitades de los items
+    con sus filas finales y resuelve cada mitad por separado"""
+    if len(weights) * (capacity + 1) <= 8 * KNAPSACK_TABLE_BYTES or len(weights) == 1:
+        chosen.extend(start + i for i in _knapsack_table(weights, values, capacity))
+        return
+    mid = len(weights) // 2
+    left = _knapsack_best(weights[:mid], values[:mid], capacity)
+    right = _knapsack_best(weights[mid:], values[mid:], capacity)
+    split = int(np.argmax(left + right[::-1]))  # left[c] + right[capacity - c]
+    _knapsack_select(weights[:mid], values[:mid], split, start, chosen)
+    _knapsack_select(weights[mid:], values[mid:], capacity - split, start + mid, chosen)
+
+def solve_knapsack(items, capacity, weight=itemgetter('weight'), value=itemgetter('value')):
+    """Mochila 0/1 para cualquier iterable de items (se recorre una vez, así
+    que vale un generador). weight y value extraen de cada item su peso
+    entero y su valor. Memoria O(n + W) salvo los bits de decisión,
+    limitados a KNAPSACK_TABLE_BYTES. Devuelve (valor máximo, items
+    elegidos en el orden de entrada)."""
+    kept, weights, values = [], [], []
+    for item in items:
+        w = weight(item)
+        if w < 0:
+            raise ValueError(f'Peso negativo: {item!r}')
+        if w <= capacity:  # los que no caben ni se guardan
+            kept.append(item)
+            weights.append(w)
+            values.append(value(item))
+    if not kept:
+        return 0, []
+    weights = np.array(weights, dtype=np.int64)
+    values = np.array(values)
+    chosen = []
+    _knapsack_select(weights, values, capacity, 0, chosen)
+    return values[chosen].sum().item(), [kept[i] for i in chosen]
+
 def knapsack():
     """Problema de la mochila - Programación dinámica"""
     items = [
@@ -212,30 +631,9 @@ def knapsack():
         {'name': 'Reloj', 'weight': 1, 'value': 300}
     ]
     max_weight = 5
-    
-    n = len(items)
-    dp = [[0 for _ in range(max_weight + 1)] for _ in range(n + 1)]
-    
-    for i in range(1, n + 1):
-        for w in range(max_weight + 1):
-            if items[i-1]['weight'] <= w:
-                dp[i][w] = max(
-                    dp[i-1][w],
-                    dp[i-1][w - items[i-1]['weight']] + items[i-1]['value']
-                )
-            else:
-                dp[i][w] = dp[i-1][w]
-    
-    max_value = dp[n][max_weight]
-    
-    # Reconstruir solución
-    w = max_weight
-    selected = []
-    for i in range(n, 0, -1):
-        if dp[i][w] != dp[i-1][w]:
-            selected.append(items[i-1])
-            w -= items[i-1]['weight']
-    
+
+    max_value, selected = solve_knapsack(items, max_weight)
+
     print(f"\n🎒 Problema de la Mochila (capacidad: {max_weight}kg):")
     print(f"  Valor máximo: ${max_value}")
     print(f"  Items seleccionados:")
@@ -247,6 +645,21 @@ def knapsack():
 
 knapsack()
 
+# Muchos items y mucha capacidad: los items llegan de un generador y
+# solve_knapsack los recorre una sola vez
+n_items, capacity = 20_000, 25_000
+rng = np.random.default_rng(42)
+stream = ((f'paquete-{i}', int(w), int(v))
+          for i, (w, v) in enumerate(zip(rng.integers(1, 500, n_items), rng.integers(1, 1000, n_items))))
+begin = time.perf_counter()
+max_value, selected = solve_knapsack(stream, capacity, weight=itemgetter(1), value=itemgetter(2))
+elapsed = time.perf_counter() - begin
+full_table = (n_items + 1) * (capacity + 1) * 8
+print(f"\n🚚 {n_items:,} items, capacidad {capacity:,}: valor {max_value:,} con "
+      f"{len(selected):,} items ({sum(item[1] for item in selected):,} de peso) en {elapsed:.2f} s")
+print(f"  Tabla completa: {full_table / 2**30:.1f} GB · aquí: filas de "
+      f"{(capacity + 1) * 8 / 2**10:.0f} KB y hasta {KNAPSACK_TABLE_BYTES / 2**20:.0f} MB de bits")
+
 # 5. Torres de Hanoi
 def hanoi(n, source, target, auxiliary, moves=[]):
     """Torres de Hanoi - Recursión"""
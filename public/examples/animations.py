@@ -188,5 +188,27 @@ def generative_art():
 
 generative_art()
 
-print("\n🎉 ¡5 visualizaciones artísticas creadas!")
+# 6. Onda viajera con matplotlib.animation (se reproduce en vivo)
+def traveling_wave():
+    """Anima una onda que se desplaza usando FuncAnimation"""
+    fig, ax = plt.subplots(figsize=(8, 4))
+    x = np.linspace(0, 4*np.pi, 300)
+    line, = ax.plot(x, np.sin(x), color='#8b5cf6', linewidth=2)
+    ax.set_ylim(-1.5, 1.5)
+    ax.set_title('Onda Viajera', fontsize=16, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+
+    def update(frame):
+        line.set_ydata(np.sin(x - frame / 10) * np.cos(frame / 40))
+        return line,
+
+    # Los frames se dibujan y se muestran a medida que se generan
+    anim = animation.FuncAnimation(fig, update, frames=200, interval=40)
+    plt.show()
+    print("✓ Animación reproducida")
+    return anim
+
+traveling_wave()
+
+print("\n🎉 ¡6 visualizaciones artísticas creadas!")
 print("💡 Tip: Experimenta cambiando los parámetros para crear tu propio arte")
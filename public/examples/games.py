@@ -58,6 +58,19 @@ game = GameOfLife(size=40)
 game.visualize(generations=5)
 print("✓ Juego de la Vida: 5 generaciones simuladas")
 
+# Animación en vivo: cada generación se muestra mientras se calcula
+from pyhub import animate
+
+def live_generations(game, generations, scale=8):
+    """Genera el tablero de cada generación sin guardarlas todas"""
+    for _ in range(generations):
+        # Células vivas en negro, ampliadas para que se vean
+        yield np.kron(1 - game.grid, np.ones((scale, scale)))
+        game.step()
+
+animate(live_generations(GameOfLife(size=40), 60), fps=10)
+print("✓ Juego de la Vida en vivo: 60 generaciones")
+
 # 2. Sudoku Solver
 def print_sudoku(board):
     """Imprime tablero de Sudoku bonito"""
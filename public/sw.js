@@ -0,0 +1,120 @@
+/**
+ * Service Worker de PyHub IDE: caché persistente del runtime de Pyodide
+ *
+ * Se registra como `sw.js?pyodide=<versión>&cdn=<indexURL>`. Todas las
+ * peticiones bajo `indexURL` (pyodide.mjs, WASM, stdlib y wheels) se sirven
+ * desde Cache Storage y se revalidan en segundo plano cuando caducan.
+ */
+
+const params = new URL(self.location.href).searchParams;
+const PYODIDE_VERSION = params.get('pyodide') || 'unknown';
+const CDN_PREFIX = params.get('cdn') || `https://cdn.jsdelivr.net/pyodide/v${PYODIDE_VERSION}/full/`;
+
+const CACHE_PREFIX = 'pyhub-pyodide-';
+const CACHE_NAME = `${CACHE_PREFIX}v${PYODIDE_VERSION}`;
+const CACHED_AT_HEADER = 'x-pyhub-cached-at';
+
+const REVALIDATE_AFTER = 7 * 24 * 60 * 60 * 1000; // 7 días
+const MAX_AGE = 30 * 24 * 60 * 60 * 1000; // 30 días
+const MAX_ENTRIES = 80;
+
+self.addEventListener('install', () => {
+  self.skipWaiting();
+});
+
+// Al activar una versión nueva se eliminan las cachés de versiones anteriores
+self.addEventListener('activate', (event) => {
+  event.waitUntil(
+    (async () => {
+      const names = await caches.keys();
+      await Promise.all(
+        names
+          .filter((name) => name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME)
+          .map((name) => caches.delete(name))
+      );
+      await self.clients.claim();
+    })()
+  );
+});
+
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  if (request.method !== 'GET' || !request.url.startsWith(CDN_PREFIX)) {
+    return;
+  }
+  event.respondWith(handleRuntimeRequest(event));
+});
+
+/**
+ * Momento en que se guardó una respuesta (0 si no se conoce)
+ */
+function cachedAt(response) {
+  return Number(response.headers.get(CACHED_AT_HEADER)) || 0;
+}
+
+/**
+ * Descarga un recurso y lo guarda con su marca de tiempo
+ */
+async function fetchAndCache(request) {
+  const response = await fetch(request);
+
+  // Las respuestas opacas o fallidas no se guardan (COEP las bloquearía)
+  if (!response.ok || response.type === 'opaque') {
+    return response;
+  }
+
+  const headers = new Headers(response.headers);
+  headers.set(CACHED_AT_HEADER, String(Date.now()));
+  const stamped = new Response(await response.clone().blob(), {
+    status: response.status,
+    statusText: response.statusText,
+    headers
+  });
+
+  const cache = await caches.open(CACHE_NAME);
+  await cache.put(request.url, stamped);
+  await evictEntries(cache);
+  return response;
+}
+
+/**
+ * Elimina entradas caducadas y, si se supera el máximo, las más antiguas
+ */
+async function evictEntries(cache) {
+  const requests = await cache.keys();
+  const now = Date.now();
+  const entries = [];
+
+  for (const request of requests) {
+    const response = await cache.match(request);
+    const timestamp = response ? cachedAt(response) : 0;
+    if (now - timestamp > MAX_AGE) {
+      await cache.delete(request);
+    } else {
+      entries.push({ request, timestamp });
+    }
+  }
+
+  entries.sort((a, b) => a.timestamp - b.timestamp);
+  const excess = entries.length - MAX_ENTRIES;
+  for (let i = 0; i < excess; i++) {
+    await cache.delete(entries[i].request);
+  }
+}
+
+/**
+ * Cache-first con revalidación en segundo plano de entradas antiguas
+ */
+async function handleRuntimeRequest(event) {
+  const cache = await caches.open(CACHE_NAME);
+  const cached = await cache.match(event.request.url);
+
+  if (cached) {
+    if (Date.now() - cachedAt(cached) > REVALIDATE_AFTER) {
+      event.waitUntil(fetchAndCache(event.request).catch(() => {}));
+    }
+    return cached;
+  }
+
+  return fetchAndCache(event.request);
+}
@@ -0,0 +1,14 @@
+"""Utilidades de PyHub IDE para el código del usuario.
+
+- benchmark, fit_complexity y BenchmarkResult (pyhub.benchmark): miden
+  funciones sobre entradas crecientes y ajustan su complejidad.
+- pyhub.graph: grafos en CSR con Dijkstra, A* y búsqueda bidireccional.
+
+Dentro del IDE el worker añade animate, que reproduce animaciones en vivo
+por el canal de frames. El resto es Python puro y se puede importar y
+probar con pytest desde la raíz del repositorio.
+"""
+from . import graph
+from .benchmark import BenchmarkResult, benchmark, fit_complexity
+
+__all__ = ['BenchmarkResult', 'benchmark', 'fit_complexity', 'graph']
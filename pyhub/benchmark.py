@@ -0,0 +1,221 @@
+"""Banco de pruebas de rendimiento: pyhub.benchmark y pyhub.fit_complexity.
+
+Mide funciones sobre entradas de tamaño creciente (mediana y cuartiles de
+varias medidas) y ajusta su complejidad. Es Python puro: funciona igual en
+el IDE que en CPython.
+"""
+import copy as copy_module
+import gc
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+
+_MIN_MEASURE_NS = 2000000  # cada medida dura al menos 2 ms: el reloj del navegador es grueso
+_MAX_NUMBER = 100000
+_FIT_MIN_SIZE = 100  # por debajo manda el coste fijo de la llamada
+MODELS = (
+    ('O(1)', lambda n: 1.0),
+    ('O(log n)', lambda n: max(math.log2(n), 1.0)),
+    ('O(n)', lambda n: float(n)),
+    ('O(n log n)', lambda n: n * max(math.log2(n), 1.0)),
+    ('O(n²)', lambda n: float(n) ** 2),
+    ('O(n³)', lambda n: float(n) ** 3),
+)
+_UNITS = ((1e9, 's'), (1e6, 'ms'), (1e3, 'µs'), (1, 'ns'))
+
+def _copy(data):
+    copy = getattr(data, 'copy', None)
+    if copy is not None:
+        return copy()
+    return copy_module.copy(data)
+
+def _time_calls(function, data, copy, number):
+    # Nanosegundos por llamada; las copias se preparan fuera del cronómetro
+    inputs = [_copy(data) for _ in range(number)] if copy else [data] * number
+    clock = time.perf_counter_ns
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = clock()
+        for item in inputs:
+            function(item)
+        elapsed = clock() - start
+    finally:
+        if enabled:
+            gc.enable()
+    return elapsed / number
+
+def _format_ns(ns):
+    for scale, unit in _UNITS:
+        if ns >= scale:
+            return '%.3g %s' % (ns / scale, unit)
+    return '%.3g ns' % ns
+
+def fit_complexity(sizes, times):
+    """Ajusta t = c·f(n) para cada modelo de MODELS y devuelve el mejor.
+
+    El error es relativo (un punto de 1 ms pesa como uno de 1 s). Devuelve
+    {'model', 'coefficient', 'error', 'exponent'}: exponent es la pendiente
+    en escala log-log, útil cuando ningún modelo encaja del todo.
+    """
+    points = [(n, t) for n, t in zip(sizes, times) if n > 0 and t > 0]
+    large = [(n, t) for n, t in points if n >= _FIT_MIN_SIZE]
+    if len(large) >= 3:
+        points = large
+    if len(points) < 2:
+        return None
+    best = None
+    for name, model in MODELS:
+        ratios = [model(n) / t for n, t in points]
+        coefficient = sum(ratios) / sum(r * r for r in ratios)
+        error = math.sqrt(sum((coefficient * r - 1) ** 2 for r in ratios) / len(ratios))
+        if best is None or error < best['error']:
+            best = {'model': name, 'coefficient': coefficient, 'error': error}
+    logs = [(math.log(n), math.log(t)) for n, t in points]
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    spread = sum((x - mean_x) ** 2 for x, _ in logs)
+    best['exponent'] = (sum((x - mean_x) * (y - mean_y) for x, y in logs) / spread
+                        if spread else 0.0)
+    return best
+
+class BenchmarkResult:
+    """Resultado de pyhub.benchmark.
+
+    results: {nombre: [{'size', 'median_ns', 'q1_ns', 'q3_ns', 'iqr_ns',
+    'repeats', 'number'}]} por tamaño medido; skipped: {nombre: tamaño a
+    partir del cual se dejó de medir por superar el presupuesto}.
+    """
+
+    def __init__(self, sizes, results, skipped):
+        self.sizes = list(sizes)
+        self.results = results
+        self.skipped = skipped
+
+    def median(self, name):
+        """(tamaños, medianas en segundos) de una función, listos para plt.plot"""
+        rows = self.results[name]
+        return [row['size'] for row in rows], [row['median_ns'] / 1e9 for row in rows]
+
+    def fits(self):
+        """Complejidad ajustada de cada función (ver pyhub.fit_complexity)"""
+        fits = {}
+        for name, rows in self.results.items():
+            fits[name] = fit_complexity([row['size'] for row in rows],
+                                         [row['median_ns'] for row in rows])
+        return fits
+
+    def table(self):
+        """Tabla de texto: mediana ± IQR por tamaño y la complejidad ajustada"""
+        names = list(self.results)
+        header = ['n'] + names
+        rows = []
+        for size in self.sizes:
+            row = [format(size, ',')]
+            for name in names:
+                found = next((r for r in self.results[name] if r['size'] == size), None)
+                if found is None:
+                    row.append('—')
+                else:
+                    row.append('%s ± %s' % (_format_ns(found['median_ns']),
+                                            _format_ns(found['iqr_ns'])))
+            rows.append(row)
+        fits = self.fits()
+        rows.append(['ajuste'] + [
+            '%s (n^%.2f)' % (fits[name]['model'], fits[name]['exponent']) if fits[name] else '—'
+            for name in names])
+        widths = [max(len(line[i]) for line in [header] + rows) for i in range(len(header))]
+        lines = ['  '.join(cell.rjust(width) for cell, width in zip(line, widths))
+                 for line in [header] + rows]
+        lines.insert(1, '  '.join('-' * width for width in widths))
+        return '\n'.join(lines)
+
+    def to_json(self, indent=None):
+        """Resultados, ajustes y entorno como JSON"""
+        return json.dumps({
+            'sizes': self.sizes,
+            'results': self.results,
+            'skipped': self.skipped,
+            'fits': self.fits(),
+            'environment': {
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+            },
+        }, indent=indent, ensure_ascii=False)
+
+    def __str__(self):
+        return self.table()
+
+    def __repr__(self):
+        return self.table()
+
+def benchmark(functions, sizes, make_input, *, repeats=5, warmup=1, budget=1.0,
+               copy=True, verbose=False):
+    """Mide funciones sobre entradas de tamaño creciente.
+
+    functions: dict {nombre: función} o lista de funciones; cada una recibe
+    la entrada generada por make_input(n), la misma para todas. Con copy
+    (por defecto) cada llamada recibe una copia, así las que ordenan en el
+    sitio no miden entradas ya ordenadas.
+
+    Cada medida repite la llamada las veces necesarias para durar al menos
+    2 ms (perf_counter_ns, sin recolector de basura), tras warmup medidas
+    de calentamiento; de repeats medidas se guardan mediana y cuartiles.
+    budget es el máximo de segundos por función y tamaño: una función deja
+    de medirse en cuanto se prevé que el siguiente tamaño lo supera.
+
+    Devuelve un pyhub.BenchmarkResult (tabla, ajuste de complejidad y JSON).
+    """
+    if not isinstance(functions, dict):
+        functions = {function.__name__: function for function in functions}
+    sizes = sorted(sizes)
+    budget_ns = budget * 1e9
+    results = {name: [] for name in functions}
+    skipped = {}
+
+    for size in sizes:
+        data = make_input(size)
+        for name, function in functions.items():
+            if name in skipped:
+                continue
+            rows = results[name]
+            # Previsión con la pendiente de los dos últimos tamaños (al menos lineal)
+            if rows:
+                last = rows[-1]
+                exponent = 1.0
+                if len(rows) >= 2:
+                    before = rows[-2]
+                    growth = max(last['median_ns'], 1) / max(before['median_ns'], 1)
+                    exponent = max(1.0, math.log(growth) / math.log(last['size'] / before['size']))
+                predicted = last['median_ns'] * (size / last['size']) ** exponent
+                if predicted > budget_ns:
+                    skipped[name] = size
+                    continue
+
+            single = _time_calls(function, data, copy, 1)
+            number = min(_MAX_NUMBER, max(1, math.ceil(_MIN_MEASURE_NS / max(single, 1))))
+            # La llamada de calibración cuenta como primer calentamiento
+            for _ in range(warmup - 1):
+                _time_calls(function, data, copy, number)
+            count = max(1, min(repeats, int(budget_ns // max(single * number, 1))))
+            times = sorted(_time_calls(function, data, copy, number) for _ in range(count))
+            if len(times) >= 2:
+                q1, _, q3 = statistics.quantiles(times, n=4, method='inclusive')
+            else:
+                q1 = q3 = times[0]
+            rows.append({
+                'size': size,
+                'median_ns': statistics.median(times),
+                'q1_ns': q1,
+                'q3_ns': q3,
+                'iqr_ns': q3 - q1,
+                'repeats': count,
+                'number': number,
+            })
+            if verbose:
+                print('  %s n=%s: %s' % (name, format(size, ','), _format_ns(rows[-1]['median_ns'])))
+        del data
+    return BenchmarkResult(sizes, results, skipped)
@@ -0,0 +1,384 @@
+"""Grafos ponderados en formato CSR y caminos mínimos: pyhub.graph.
+
+Dijkstra con heapq, A* con heurística intercambiable y búsqueda
+bidireccional. Es Python puro (solo la librería estándar).
+"""
+import heapq
+import math
+import random
+from array import array
+
+_INF = float('inf')
+_CELL_NODES = 8  # nodos por celda en random_graph: las aristas unen celdas vecinas
+
+class Graph:
+    """Grafo ponderado en formato CSR (compressed sparse row).
+
+    Los vecinos del nodo u son indices[indptr[u]:indptr[u + 1]], con sus
+    pesos en weights; los tres son array de la librería estándar, así que un
+    grafo de millones de aristas ocupa unos pocos MB. Los nodos son enteros
+    0..n-1; si el grafo tiene labels, las funciones aceptan y devuelven
+    etiquetas. coords (opcional) son las posiciones (x, y) de cada nodo.
+    """
+
+    def __init__(self, indptr, indices, weights, directed=True, labels=None, coords=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.directed = directed
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)} if labels else None
+        self.coords = coords
+        self._reverse = None
+
+    @classmethod
+    def from_edges(cls, num_nodes, edges, directed=True, labels=None, coords=None):
+        """Construye el grafo a partir de aristas (u, v, peso) entre enteros;
+        si no es dirigido, cada arista se guarda en los dos sentidos"""
+        sources = array('q')
+        targets = array('q')
+        costs = array('d')
+        for u, v, weight in edges:
+            if weight < 0:
+                raise ValueError('Dijkstra no admite pesos negativos: (%r, %r, %r)' % (u, v, weight))
+            sources.append(u)
+            targets.append(v)
+            costs.append(weight)
+            if not directed:
+                sources.append(v)
+                targets.append(u)
+                costs.append(weight)
+        # Reparto por nodo de origen (counting sort): indptr es el prefijo de los grados
+        indptr = array('q', bytes(8 * (num_nodes + 1)))
+        for u in sources:
+            indptr[u + 1] += 1
+        for u in range(num_nodes):
+            indptr[u + 1] += indptr[u]
+        cursor = indptr[:-1]
+        indices = array('q', bytes(8 * len(sources)))
+        weights = array('d', bytes(8 * len(sources)))
+        for u, v, weight in zip(sources, targets, costs):
+            position = cursor[u]
+            indices[position] = v
+            weights[position] = weight
+            cursor[u] = position + 1
+        return cls(indptr, indices, weights, directed, labels, coords)
+
+    @classmethod
+    def from_dict(cls, adjacency, coords=None):
+        """Construye un grafo dirigido desde {nodo: {vecino: peso}}; los
+        nodos pueden ser de cualquier tipo hashable y coords, {nodo: (x, y)}"""
+        labels = list(adjacency)
+        seen = set(labels)
+        for neighbors in adjacency.values():
+            for neighbor in neighbors:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    labels.append(neighbor)
+        index = {label: i for i, label in enumerate(labels)}
+        edges = ((index[u], index[v], weight)
+                 for u, neighbors in adjacency.items() for v, weight in neighbors.items())
+        points = [coords[label] for label in labels] if coords else None
+        return cls.from_edges(len(labels), edges, True, labels, points)
+
+    @property
+    def num_nodes(self):
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self):
+        """Aristas del grafo (en los no dirigidos, cada una cuenta una vez)"""
+        return len(self.indices) if self.directed else len(self.indices) // 2
+
+    def node_id(self, node):
+        """Índice interno de un nodo (etiqueta o entero)"""
+        if self.index is not None:
+            try:
+                return self.index[node]
+            except KeyError:
+                raise KeyError('Nodo desconocido: %r' % (node,)) from None
+        if not 0 <= node < self.num_nodes:
+            raise KeyError('Nodo desconocido: %r' % (node,))
+        return node
+
+    def label(self, node_id):
+        return self.labels[node_id] if self.labels else node_id
+
+    def neighbors(self, node):
+        """Pares (vecino, peso) de un nodo"""
+        u = self.node_id(node)
+        for k in range(self.indptr[u], self.indptr[u + 1]):
+            yield self.label(self.indices[k]), self.weights[k]
+
+    def reverse(self):
+        """Grafo con las aristas invertidas (el mismo si no es dirigido)"""
+        if not self.directed:
+            return self
+        if self._reverse is None:
+            indptr, indices = self.indptr, self.indices
+            edges = ((indices[k], u, self.weights[k])
+                     for u in range(self.num_nodes) for k in range(indptr[u], indptr[u + 1]))
+            self._reverse = Graph.from_edges(self.num_nodes, edges, True, self.labels, self.coords)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def to_dict(self):
+        """{nodo: {vecino: peso}}; con aristas repetidas se queda la más corta"""
+        adjacency = {self.label(u): {} for u in range(self.num_nodes)}
+        for u in range(self.num_nodes):
+            neighbors = adjacency[self.label(u)]
+            for k in range(self.indptr[u], self.indptr[u + 1]):
+                v = self.label(self.indices[k])
+                neighbors[v] = min(self.weights[k], neighbors.get(v, _INF))
+        return adjacency
+
+    def __repr__(self):
+        kind = 'dirigido' if self.directed else 'no dirigido'
+        return 'Graph(%s nodos, %s aristas, %s)' % (
+            format(self.num_nodes, ','), format(self.num_edges, ','), kind)
+
+class ShortestPaths:
+    """Resultado de pyhub.graph.dijkstra: distancias y predecesores desde source.
+
+    settled es el número de nodos cerrados; si se pasó target, la búsqueda
+    para al cerrarlo y las distancias del resto pueden no ser finales.
+    """
+
+    def __init__(self, graph, source, dist, pred, settled):
+        # source es el índice interno del origen
+        self.graph = graph
+        self.source = source
+        self.dist = dist
+        self.pred = pred
+        self.settled = settled
+
+    def distance(self, node):
+        """Distancia mínima hasta node (inf si no es alcanzable)"""
+        return self.dist[self.graph.node_id(node)]
+
+    def path(self, node):
+        """Camino mínimo [source, ..., node], o None si no es alcanzable"""
+        return _path(self.graph, self.pred, self.source, self.graph.node_id(node))
+
+    def distances(self):
+        """{nodo: distancia} de los nodos alcanzados"""
+        return {self.graph.label(u): d for u, d in enumerate(self.dist) if d < _INF}
+
+class Route:
+    """Camino entre dos nodos: distance, path (None si no hay) y settled,
+    los nodos que cerró la búsqueda para encontrarlo"""
+
+    def __init__(self, distance, path, settled):
+        self.distance = distance
+        self.path = path
+        self.settled = settled
+
+    def __repr__(self):
+        return 'Route(distance=%r, %s nodos en el camino, %s cerrados)' % (
+            self.distance, len(self.path) if self.path else 0, format(self.settled, ','))
+
+def _path(graph, pred, source, target):
+    # Reconstrucción siguiendo predecesores hasta el origen (pred == -1)
+    if pred[target] == -1 and target != source:
+        return None
+    path = []
+    node = target
+    while node != -1:
+        path.append(graph.label(node))
+        node = pred[node]
+    path.reverse()
+    return path
+
+def dijkstra(graph, source, target=None):
+    """Caminos mínimos desde source con un montículo (heapq) y borrado perezoso.
+
+    En vez de actualizar la prioridad de un nodo, se inserta otra entrada y
+    las obsoletas se descartan al salir: O((V + E) log V). Con target, para
+    en cuanto lo cierra. Devuelve un pyhub.graph.ShortestPaths.
+    """
+    start = graph.node_id(source)
+    goal = graph.node_id(target) if target is not None else -1
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    dist = [_INF] * graph.num_nodes
+    pred = [-1] * graph.num_nodes
+    closed = bytearray(graph.num_nodes)
+    dist[start] = 0.0
+    heap = [(0.0, start)]
+    pop, push = heapq.heappop, heapq.heappush
+    settled = 0
+    while heap:
+        d, u = pop(heap)
+        if closed[u]:
+            continue  # entrada obsoleta
+        closed[u] = 1
+        settled += 1
+        if u == goal:
+            break
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            candidate = d + weights[k]
+            if candidate < dist[v]:
+                dist[v] = candidate
+                pred[v] = u
+                push(heap, (candidate, v))
+    return ShortestPaths(graph, start, dist, pred, settled)
+
+class Euclidean:
+    """Heurística de A*: distancia en línea recta entre coords, por scale.
+    Es admisible si ninguna arista pesa menos que scale por su longitud."""
+
+    def __init__(self, coords, scale=1.0):
+        self.coords = coords
+        self.scale = scale
+
+    def __call__(self, u, target):
+        (x1, y1), (x2, y2) = self.coords[u], self.coords[target]
+        return self.scale * math.hypot(x1 - x2, y1 - y2)
+
+class Manhattan(Euclidean):
+    """Heurística de A* para rejillas: |dx| + |dy| entre coords, por scale"""
+
+    def __call__(self, u, target):
+        (x1, y1), (x2, y2) = self.coords[u], self.coords[target]
+        return self.scale * (abs(x1 - x2) + abs(y1 - y2))
+
+def _zero_heuristic(u, target):
+    return 0.0
+
+def astar(graph, source, target, heuristic=None):
+    """Camino mínimo de source a target con A*.
+
+    heuristic(u, target) recibe índices internos (ver Graph.node_id) y debe
+    ser consistente (nunca sobreestimar) para que el camino sea mínimo:
+    pyhub.graph.euclidean(graph.coords) o manhattan(graph.coords) valen para
+    grafos geométricos. Sin heurística es Dijkstra. Devuelve un Route.
+    """
+    start = graph.node_id(source)
+    goal = graph.node_id(target)
+    estimate = heuristic or _zero_heuristic
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    dist = [_INF] * graph.num_nodes
+    pred = [-1] * graph.num_nodes
+    closed = bytearray(graph.num_nodes)
+    dist[start] = 0.0
+    heap = [(estimate(start, goal), start)]
+    pop, push = heapq.heappop, heapq.heappush
+    settled = 0
+    while heap:
+        _, u = pop(heap)
+        if closed[u]:
+            continue
+        closed[u] = 1
+        settled += 1
+        if u == goal:
+            return Route(dist[u], _path(graph, pred, start, goal), settled)
+        d = dist[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            candidate = d + weights[k]
+            if candidate < dist[v]:
+                dist[v] = candidate
+                pred[v] = u
+                push(heap, (candidate + estimate(v, goal), v))
+    return Route(_INF, None, settled)
+
+def bidirectional_dijkstra(graph, source, target):
+    """Camino mínimo de source a target buscando a la vez desde los dos
+    extremos (hacia atrás sobre graph.reverse()). Para cuando la suma de
+    los mínimos de ambos montículos alcanza el mejor camino visto, lo que
+    suele cerrar muchos menos nodos que Dijkstra. Devuelve un Route.
+    """
+    start = graph.node_id(source)
+    goal = graph.node_id(target)
+    if start == goal:
+        return Route(0.0, [graph.label(start)], 1)
+    sides = []
+    for origin, csr in ((start, graph), (goal, graph.reverse())):
+        dist = [_INF] * graph.num_nodes
+        dist[origin] = 0.0
+        sides.append({
+            'csr': csr,
+            'dist': dist,
+            'pred': [-1] * graph.num_nodes,
+            'closed': bytearray(graph.num_nodes),
+            'heap': [(0.0, origin)],
+        })
+    forward, backward = sides
+    pop, push = heapq.heappop, heapq.heappush
+    best = _INF
+    meeting = -1
+    settled = 0
+    while forward['heap'] and backward['heap']:
+        if forward['heap'][0][0] + backward['heap'][0][0] >= best:
+            break
+        # Se avanza por el lado con el montículo más pequeño
+        side, other = ((forward, backward) if len(forward['heap']) <= len(backward['heap'])
+                       else (backward, forward))
+        d, u = pop(side['heap'])
+        if side['closed'][u]:
+            continue
+        side['closed'][u] = 1
+        settled += 1
+        csr, dist, pred = side['csr'], side['dist'], side['pred']
+        other_dist = other['dist']
+        for k in range(csr.indptr[u], csr.indptr[u + 1]):
+            v = csr.indices[k]
+            candidate = d + csr.weights[k]
+            if candidate < dist[v]:
+                dist[v] = candidate
+                pred[v] = u
+                push(side['heap'], (candidate, v))
+            if candidate + other_dist[v] < best:
+                best = candidate + other_dist[v]
+                meeting = v
+    if meeting == -1:
+        return Route(_INF, None, settled)
+    head = _path(graph, forward['pred'], start, meeting)
+    tail = _path(graph, backward['pred'], goal, meeting)
+    return Route(best, head + tail[-2::-1], settled)
+
+def random_graph(num_nodes, num_edges, directed=False, max_stretch=1.5, seed=None):
+    """Grafo geométrico aleatorio para pruebas de rendimiento.
+
+    Los nodos caen al azar en el cuadrado [0, 1000]² (graph.coords) y cada
+    arista une nodos de celdas vecinas, con peso igual a su longitud por un
+    factor aleatorio entre 1 y max_stretch: así euclidean(graph.coords) es
+    una heurística válida para A*. Con aristas de sobra (num_edges ≥ 4 por
+    nodo) casi todo el grafo queda conectado.
+    """
+    if num_nodes < 2 and num_edges > 0:
+        # Sin otro nodo al que unirse, la búsqueda de aristas no acabaría
+        raise ValueError('random_graph necesita al menos 2 nodos para crear aristas')
+    rng = random.Random(seed)
+    rand = rng.random  # más rápido que randrange/choice en bucles de 10^5 aristas
+    side = max(1, int(math.sqrt(num_nodes / _CELL_NODES)))
+    coords = [(rand() * 1000.0, rand() * 1000.0) for _ in range(num_nodes)]
+    cell_of = [(min(int(x * side / 1000.0), side - 1), min(int(y * side / 1000.0), side - 1))
+               for x, y in coords]
+    cells = [[] for _ in range(side * side)]
+    for node, (cx, cy) in enumerate(cell_of):
+        cells[cx * side + cy].append(node)
+
+    def edges():
+        made = 0
+        while made < num_edges:
+            u = int(rand() * num_nodes)
+            cx, cy = cell_of[u]
+            cx += int(rand() * 3) - 1
+            cy += int(rand() * 3) - 1
+            if not (0 <= cx < side and 0 <= cy < side):
+                continue
+            candidates = cells[cx * side + cy]
+            v = candidates[int(rand() * len(candidates))] if candidates else u
+            if v == u:
+                continue
+            x, y = coords[u]
+            x2, y2 = coords[v]
+            made += 1
+            yield u, v, math.hypot(x - x2, y - y2) * (1.0 + rand() * (max_stretch - 1.0))
+
+    return Graph.from_edges(num_nodes, edges(), directed, coords=coords)
+
+# Las heurísticas se usan como funciones: astar(graph, s, t, euclidean(graph.coords))
+euclidean = Euclidean
+manhattan = Manhattan
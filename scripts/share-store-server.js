@@ -0,0 +1,87 @@
+/**
+ * Almacén mínimo para los enlaces largos de "Compartir" en desarrollo.
+ *
+ * Guarda cada código en un archivo con su hash por nombre:
+ *   PUT /<hash>  (cuerpo: el código)   GET /<hash>
+ *
+ * Uso: node scripts/share-store-server.js [puerto] [directorio]
+ * y arrancar Vite con VITE_SHARE_STORE_URL=http://localhost:<puerto>
+ */
+
+import { createServer } from 'node:http';
+import { createHash } from 'node:crypto';
+import { mkdir, readFile, writeFile } from 'node:fs/promises';
+import { join } from 'node:path';
+
+const PORT = Number(process.argv[2]) || 3001;
+const DIRECTORY = process.argv[3] || '.share-store';
+const MAX_BODY = 1 << 20; // 1 MB
+const HASH_RE = /^[A-Za-z0-9_-]{22}$/;
+const HASH_BYTES = 16;
+
+const HEADERS = {
+  'Access-Control-Allow-Origin': '*',
+  'Access-Control-Allow-Methods': 'GET, PUT, OPTIONS',
+  'Access-Control-Allow-Headers': 'Content-Type',
+  // La app se sirve con COEP require-corp
+  'Cross-Origin-Resource-Policy': 'cross-origin'
+};
+
+/**
+ * Mismo hash que src/services/shareLink.js: SHA-256 truncado en base64url
+ */
+function hashCode(code) {
+  return createHash('sha256').update(code, 'utf8').digest().subarray(0, HASH_BYTES).toString('base64url');
+}
+
+/**
+ * Lee el cuerpo de la petición como texto, con un tamaño máximo
+ */
+function readBody(request) {
+  return new Promise((resolve, reject) => {
+    const chunks = [];
+    let size = 0;
+    request.on('data', (chunk) => {
+      size += chunk.length;
+      if (size > MAX_BODY) {
+        reject(new Error('too large'));
+        request.destroy();
+      } else {
+        chunks.push(chunk);
+      }
+    });
+    request.on('end', () => resolve(Buffer.concat(chunks).toString('utf8')));
+    request.on('error', reject);
+  });
+}
+
+await mkdir(DIRECTORY, { recursive: true });
+
+createServer(async (request, response) => {
+  const hash = request.url.slice(1);
+  const reply = (status, body = '') => {
+    response.writeHead(status, { ...HEADERS, 'Content-Type': 'text/plain; charset=utf-8' });
+    response.end(body);
+  };
+
+  if (request.method === 'OPTIONS') return reply(204);
+  if (!HASH_RE.test(hash)) return reply(400, 'hash no válido');
+
+  try {
+    if (request.method === 'GET') {
+      return reply(200, await readFile(join(DIRECTORY, hash), 'utf8'));
+    }
+    if (request.method === 'PUT') {
+      const code = await readBody(request);
+      // Direccionado por contenido: el hash tiene que ser el del código
+      if (hashCode(code) !== hash) return reply(409, 'el hash no coincide');
+      await writeFile(join(DIRECTORY, hash), code, 'utf8');
+      return reply(201);
+    }
+    return reply(405);
+  } catch (error) {
+    return reply(error.code === 'ENOENT' ? 404 : 500, error.message);
+  }
+}).listen(PORT, () => {
+  console.log(`Almacén de enlaces en http://localhost:${PORT} (${DIRECTORY})`);
+});
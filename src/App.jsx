@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useRef } from "react";
+import React, { useState, useEffect, useRef, useMemo } from "react";
 import CodeEditor from "./components/CodeEditor";
 import OutputPanel from "./components/OutputPanel";
 import Toolbar from "./components/Toolbar";
@@ -16,11 +16,20 @@ import KeyboardShortcutsOverlay from "./components/KeyboardShortcutsOverlay";
 import {
   initializePyodide,
   runPythonCode,
+  runReplLine,
   resetPyodide,
   isPyodideReady,
+  stopExecution,
 } from "./services/pyodide";
-import { runTests, validateTestCode } from "./services/testRunner";
-import { validateCode, limitOutput } from "./utils/security";
+import {
+  runTests,
+  validateTestCode,
+  clearTestCache,
+} from "./services/testRunner";
+import { clearCompletionCache } from "./services/completion";
+import { validateCode, getRecommendedTimeout } from "./utils/security";
+import { analyzeSource } from "./services/codeAnalysis";
+import { createLineStore } from "./utils/lineStore";
 
 const DEFAULT_CODE = `# 🎉 Bienvenido a PyHub IDE - Tu Python Playground
 # Editor profesional con ejemplos interactivos increíbles
@@ -69,13 +78,24 @@ function App() {
     const saved = localStorage.getItem("pyhub-code");
     return saved || DEFAULT_CODE;
   });
-  const [output, setOutput] = useState("");
+  // La salida vive en un almacén de líneas (sin límite de tamaño);
+  // outputVersion cambia con cada modificación para refrescar el panel
+  const outputStore = useMemo(() => createLineStore(), []);
+  const [outputVersion, setOutputVersion] = useState(0);
+  // ImageBitmaps transferidos desde el worker; se liberan al sustituirse
+  const [figures, setFigures] = useState([]);
+  const figuresRef = useRef([]);
+  // Último frame de la animación en curso: { frame, shown, dropped }
+  const [animation, setAnimation] = useState(null);
   const [testResults, setTestResults] = useState(null);
+  const [profileResult, setProfileResult] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
   const [loadingMessage, setLoadingMessage] = useState("Iniciando...");
   const [isRunning, setIsRunning] = useState(false);
   const [pyodideReady, setPyodideReady] = useState(false);
   const [executionTime, setExecutionTime] = useState(null);
+  // Heap de WASM del worker de sesión tras la última ejecución (bytes)
+  const [heapSize, setHeapSize] = useState(null);
   const [settings, setSettings] = useState(() => {
     const saved = localStorage.getItem("pyhub-settings");
     return saved
@@ -90,6 +110,22 @@ function App() {
         };
   });
 
+  const setOutput = (text) => {
+    outputStore.reset(text);
+    setOutputVersion((version) => version + 1);
+  };
+
+  const showFigures = (next) => {
+    figuresRef.current.forEach((bitmap) => bitmap.close());
+    figuresRef.current = next;
+    setFigures(next);
+  };
+
+  const appendOutput = (text) => {
+    outputStore.append(text);
+    setOutputVersion((version) => version + 1);
+  };
+
   // Inicializar Pyodide al montar el componente
   useEffect(() => {
     async function init() {
@@ -138,7 +174,12 @@ function App() {
     return () => window.removeEventListener("editor-run", handleEditorRun);
   }, [pyodideReady, isRunning, code]);
 
-  const handleRun = async () => {
+  /**
+   * Ejecuta el código del editor; con `profile` ('sampling',
+   * 'deterministic' o 'memory') además lo perfila y muestra el resultado
+   * en el panel
+   */
+  const handleRun = async ({ profile = null } = {}) => {
     if (!isPyodideReady()) {
       setOutput("⚠️ Pyodide aún no está listo. Por favor espera...\n");
       return;
@@ -146,7 +187,10 @@ function App() {
 
     setIsRunning(true);
     setTestResults(null);
-    setOutput("⏳ Ejecutando...\n");
+    setProfileResult(null);
+    showFigures([]);
+    setAnimation(null);
+    setOutput(profile ? "⏳ Ejecutando con perfilador...\n" : "⏳ Ejecutando...\n");
 
     const startTime = performance.now();
 
@@ -159,32 +203,68 @@ function App() {
         return;
       }
 
-      if (validation.warnings.length > 0) {
-        setOutput(
-          "⚠️ Advertencias:\n" + validation.warnings.join("\n") + "\n\n"
-        );
+      const warningsText =
+        validation.warnings.length > 0
+          ? "⚠️ Advertencias:\n" + validation.warnings.join("\n") + "\n\n"
+          : "";
+      if (warningsText) {
+        setOutput(warningsText);
       }
 
-      // Ejecutar código
-      const result = await runPythonCode(code, 30000);
+      // El análisis estático (casi siempre ya en caché) ajusta el timeout
+      const analysis = await analyzeSource(code).catch(() => null);
+
+      // Ejecutar código añadiendo la salida al panel a medida que se produce
+      let hasStreamed = false;
+      const result = await runPythonCode(code, getRecommendedTimeout(code, analysis), {
+        onProgress: (message) => {
+          if (!hasStreamed) {
+            setOutput(warningsText + `⏳ ${message}\n`);
+          }
+        },
+        onOutput: (text, dropped) => {
+          if (!hasStreamed) {
+            hasStreamed = true;
+            outputStore.reset(warningsText);
+          }
+          if (dropped > 0) {
+            outputStore.append(
+              `[... ${dropped.toLocaleString()} caracteres descartados por el worker ...]\n`
+            );
+          }
+          appendOutput(text);
+        },
+        onFrame: (frame, stats) => {
+          setAnimation({ frame, ...stats });
+        },
+        profile,
+      });
       const endTime = performance.now();
       const execTime = Math.round(endTime - startTime);
       setExecutionTime(execTime);
+      showFigures(result.figures || []);
+      if (result.profile) setProfileResult(result.profile);
+      if (result.heapSize) setHeapSize(result.heapSize);
 
       if (result.success) {
-        let outputText = result.output || "";
-        if (
+        const hasResult =
           result.result !== undefined &&
           result.result !== null &&
-          result.result !== "None"
-        ) {
-          outputText += `\n\n➜ Resultado: ${result.result}`;
+          result.result !== "None";
+        if (hasStreamed) {
+          if (hasResult) appendOutput(`\n\n➜ Resultado: ${result.result}`);
+        } else if (hasResult) {
+          setOutput(`${warningsText}➜ Resultado: ${result.result}`);
+        } else {
+          setOutput(warningsText + "✓ Código ejecutado correctamente (sin salida)");
         }
-        setOutput(
-          outputText || "✓ Código ejecutado correctamente (sin salida)"
-        );
       } else {
-        setOutput(`❌ Error:\n${result.error || result.output}`);
+        const errorText = `❌ Error:\n${result.error || result.output}`;
+        if (hasStreamed) {
+          appendOutput(`\n${errorText}`);
+        } else {
+          setOutput(warningsText + errorText);
+        }
       }
     } catch (error) {
       setOutput(`❌ Error inesperado:\n${error.message}`);
@@ -202,6 +282,7 @@ function App() {
 
     setIsRunning(true);
     setTestResults(null);
+    setProfileResult(null);
     setOutput("🧪 Ejecutando tests...\n");
 
     try {
@@ -214,8 +295,15 @@ function App() {
         return;
       }
 
-      // Ejecutar tests
-      const result = await runTests(code, 30000);
+      // Ejecutar tests en paralelo mostrando cada resultado al terminar
+      const result = await runTests(code, 30000, {
+        onTestResult: (test, partial) => {
+          setTestResults(partial);
+          setOutput(
+            `🧪 Ejecutando tests... ${partial.total} completados (${partial.failed} fallados)\n`
+          );
+        },
+      });
 
       if (result.success) {
         setTestResults(result.results);
@@ -228,7 +316,10 @@ function App() {
             `Total: ${result.results.total}\n` +
             `Pasados: ${result.results.passed}\n` +
             `Fallados: ${result.results.failed}\n` +
-            `Tasa de éxito: ${passRate}%\n`
+            `Tasa de éxito: ${passRate}%\n` +
+            (result.results.reused > 0
+              ? `Reutilizados (sin cambios): ${result.results.reused}\n`
+              : "")
         );
       } else {
         setOutput(
@@ -244,12 +335,21 @@ function App() {
     }
   };
 
+  const handleStop = () => {
+    if (stopExecution()) {
+      appendOutput("⏹ Deteniendo ejecución...\n");
+    }
+  };
+
   const handleReset = async () => {
     setIsRunning(true);
     setOutput("⏳ Reiniciando entorno...\n");
     setTestResults(null);
+    setProfileResult(null);
 
     try {
+      clearTestCache();
+      clearCompletionCache();
       const result = await resetPyodide();
       if (result.success) {
         setOutput("✓ Entorno reiniciado correctamente\n");
@@ -275,6 +375,7 @@ function App() {
           `✓ Ejemplo cargado: ${filename}\n➡ Presiona Ejecutar o Ctrl+Enter para ver el resultado\n`
         );
         setTestResults(null);
+        setProfileResult(null);
       } else {
         setOutput(`❌ No se pudo cargar el ejemplo: ${filename}\n`);
       }
@@ -285,7 +386,10 @@ function App() {
 
   const handleClearOutput = () => {
     setOutput("");
+    showFigures([]);
+    setAnimation(null);
     setTestResults(null);
+    setProfileResult(null);
   };
 
   const handleSettingsChange = (newSettings) => {
@@ -300,9 +404,9 @@ function App() {
     }
   };
 
-  const executeREPLCode = async (replCode) => {
+  const executeREPLCode = async (replLine) => {
     try {
-      const result = await runPythonCode(replCode, 10000);
+      const result = await runReplLine(replLine, 10000);
       return result;
     } catch (error) {
       return { success: false, error: error.message };
@@ -378,7 +482,7 @@ function App() {
             pyodideReady={pyodideReady}
             onExecuteCode={executeREPLCode}
           />
-          <CodeAnalyzer code={code} />
+          <CodeAnalyzer code={code} pyodideReady={pyodideReady} />
           <SharePanel code={code} onLoadCode={handleLoadSharedCode} />
           <SettingsPanel
             settings={settings}
@@ -410,6 +514,8 @@ function App() {
       <Toolbar
         onRun={handleRun}
         onRunTests={handleRunTests}
+        onProfile={(mode) => handleRun({ profile: mode })}
+        onStop={handleStop}
         onReset={handleReset}
         onLoadExample={handleLoadExample}
         isRunning={isRunning}
@@ -457,8 +563,12 @@ function App() {
         </div>
 
         <OutputPanel
-          output={output}
+          outputStore={outputStore}
+          outputVersion={outputVersion}
+          figures={figures}
+          animation={animation}
           testResults={testResults}
+          profile={profileResult}
           onClear={handleClearOutput}
         />
       </div>
@@ -468,6 +578,7 @@ function App() {
         pyodideReady={pyodideReady}
         isRunning={isRunning}
         executionTime={executionTime}
+        heapSize={heapSize}
       />
 
       <KeyboardShortcutsOverlay />
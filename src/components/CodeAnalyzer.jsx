@@ -1,147 +1,36 @@
 import React, { useState, useEffect } from "react";
+import { analyzeSource, formatOrder } from "../services/codeAnalysis";
+
+const ANALYSIS_DELAY = 150; // ms sin teclear antes de reanalizar
 
 /**
  * Componente de análisis de código en tiempo real
- * Muestra estadísticas y métricas del código
+ * Muestra estadísticas y métricas del código. El análisis se hace con el
+ * módulo ast de Python en un worker, bloque a bloque: solo se reanalizan
+ * los bloques de nivel superior que cambian.
  */
-function CodeAnalyzer({ code }) {
+function CodeAnalyzer({ code, pyodideReady }) {
   const [analysis, setAnalysis] = useState(null);
   const [isOpen, setIsOpen] = useState(false);
 
   useEffect(() => {
-    if (code && isOpen) {
-      analyzeCode(code);
-    }
-  }, [code, isOpen]);
-
-  const analyzeCode = (sourceCode) => {
-    // Análisis básico del código
-    const lines = sourceCode.split("\n");
-    const nonEmptyLines = lines.filter((line) => line.trim().length > 0);
-    const codeLines = lines.filter((line) => {
-      const trimmed = line.trim();
-      return trimmed.length > 0 && !trimmed.startsWith("#");
-    });
-    const commentLines = lines.filter((line) => line.trim().startsWith("#"));
-
-    // Detectar funciones
-    const functions = sourceCode.match(/def\s+\w+\s*\([^)]*\):/g) || [];
-
-    // Detectar clases
-    const classes = sourceCode.match(/class\s+\w+.*:/g) || [];
-
-    // Detectar imports
-    const imports = sourceCode.match(/(from\s+\w+\s+)?import\s+.+/g) || [];
-
-    // Detectar bucles
-    const forLoops = (sourceCode.match(/for\s+\w+\s+in\s+/g) || []).length;
-    const whileLoops = (sourceCode.match(/while\s+.+:/g) || []).length;
-
-    // Detectar condicionales
-    const ifStatements = (sourceCode.match(/if\s+.+:/g) || []).length;
-    const elifStatements = (sourceCode.match(/elif\s+.+:/g) || []).length;
-    const elseStatements = (sourceCode.match(/else:/g) || []).length;
+    if (!code || !isOpen || !pyodideReady) return undefined;
 
-    // Detectar try-except
-    const tryBlocks = (sourceCode.match(/try:/g) || []).length;
-    const exceptBlocks = (sourceCode.match(/except.*:/g) || []).length;
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const result = await analyzeSource(code);
+        if (result && !cancelled) setAnalysis(result);
+      } catch (error) {
+        console.error("Error al analizar el código:", error);
+      }
+    }, ANALYSIS_DELAY);
 
-    // Complejidad ciclomática aproximada
-    const complexity =
-      1 +
-      ifStatements +
-      elifStatements +
-      forLoops +
-      whileLoops +
-      tryBlocks +
-      exceptBlocks;
-
-    // Calcular ratios
-    const commentRatio =
-      lines.length > 0
-        ? ((commentLines.length / lines.length) * 100).toFixed(1)
-        : 0;
-
-    // Longitud promedio de línea
-    const avgLineLength =
-      codeLines.length > 0
-        ? (
-            codeLines.reduce((sum, line) => sum + line.length, 0) /
-            codeLines.length
-          ).toFixed(1)
-        : 0;
-
-    // Palabras clave Python
-    const pythonKeywords = [
-      "and",
-      "as",
-      "assert",
-      "async",
-      "await",
-      "break",
-      "class",
-      "continue",
-      "def",
-      "del",
-      "elif",
-      "else",
-      "except",
-      "finally",
-      "for",
-      "from",
-      "global",
-      "if",
-      "import",
-      "in",
-      "is",
-      "lambda",
-      "nonlocal",
-      "not",
-      "or",
-      "pass",
-      "raise",
-      "return",
-      "try",
-      "while",
-      "with",
-      "yield",
-    ];
-
-    const keywordCount = pythonKeywords.reduce((count, keyword) => {
-      const regex = new RegExp(`\\b${keyword}\\b`, "g");
-      return count + (sourceCode.match(regex) || []).length;
-    }, 0);
-
-    setAnalysis({
-      lines: {
-        total: lines.length,
-        code: codeLines.length,
-        comments: commentLines.length,
-        empty: lines.length - nonEmptyLines.length,
-      },
-      structures: {
-        functions: functions.length,
-        classes: classes.length,
-        imports: imports.length,
-      },
-      controlFlow: {
-        forLoops,
-        whileLoops,
-        ifStatements,
-        elifStatements,
-        elseStatements,
-        tryBlocks,
-        exceptBlocks,
-      },
-      metrics: {
-        complexity,
-        commentRatio,
-        avgLineLength,
-        keywordCount,
-        characters: sourceCode.length,
-      },
-    });
-  };
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [code, isOpen, pyodideReady]);
 
   const getComplexityColor = (complexity) => {
     if (complexity <= 10) return "text-green-400";
@@ -207,8 +96,24 @@ function CodeAnalyzer({ code }) {
         </div>
 
         {/* Content */}
+        {!analysis && (
+          <div className="flex-1 p-6 text-center text-gray-400">
+            {pyodideReady ? "Analizando..." : "Esperando a que cargue Python..."}
+          </div>
+        )}
         {analysis && (
           <div className="flex-1 overflow-y-auto p-6 space-y-6">
+            {/* Syntax Errors */}
+            {analysis.errors.length > 0 && (
+              <div className="bg-red-900 bg-opacity-40 border border-red-700 rounded-xl p-4 text-red-200 text-sm">
+                {analysis.errors.map((error) => (
+                  <div key={error.line}>
+                    ✗ Línea {error.line}: {error.message} (bloque sin analizar)
+                  </div>
+                ))}
+              </div>
+            )}
+
             {/* Overview Cards */}
             <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
               <div className="bg-gradient-to-br from-purple-600 to-indigo-600 rounded-xl p-4 text-white">
@@ -237,7 +142,7 @@ function CodeAnalyzer({ code }) {
                 >
                   {analysis.metrics.complexity}
                 </div>
-                <div className="text-sm opacity-90">Complejidad</div>
+                <div className="text-sm opacity-90">Complejidad máx.</div>
               </div>
             </div>
 
@@ -375,6 +280,86 @@ function CodeAnalyzer({ code }) {
               </div>
             </div>
 
+            {/* Hot Loops */}
+            {analysis.warnings.length > 0 && (
+              <div className="bg-gray-800 rounded-xl p-5 border border-orange-700">
+                <h3 className="text-xl font-bold text-white mb-4 flex items-center gap-2">
+                  <span>🔥</span>
+                  <span>Puntos Calientes</span>
+                  <span className="text-sm font-normal text-gray-400">
+                    coste estimado {formatOrder(analysis.estimate.order)}
+                  </span>
+                </h3>
+                <div className="space-y-2">
+                  {analysis.warnings.map((warning, index) => (
+                    <div
+                      key={`${warning.line}:${warning.kind}:${index}`}
+                      className="bg-gray-700 rounded-lg p-3 text-sm"
+                    >
+                      <div className="text-orange-300 font-mono">
+                        Línea {warning.line}
+                        {warning.function && ` · ${warning.function}`}
+                      </div>
+                      <div className="text-white">{warning.message}</div>
+                      {warning.calledFrom !== undefined && (
+                        <div className="text-gray-400 text-xs mt-1">
+                          Se llama dentro de un bucle en{" "}
+                          {warning.calledFrom || "el nivel superior"}
+                        </div>
+                      )}
+                    </div>
+                  ))}
+                </div>
+              </div>
+            )}
+
+            {/* Per-function Complexity */}
+            {analysis.functions.length > 0 && (
+              <div className="bg-gray-800 rounded-xl p-5 border border-gray-700">
+                <h3 className="text-xl font-bold text-white mb-4 flex items-center gap-2">
+                  <span>🧩</span>
+                  <span>Complejidad por Función</span>
+                </h3>
+                <div className="space-y-2">
+                  {analysis.functions.map((fn) => (
+                    <div
+                      key={`${fn.name}:${fn.line}`}
+                      className="flex items-center justify-between bg-gray-700 rounded-lg p-3"
+                    >
+                      <span className="text-white font-mono text-sm">
+                        {fn.name}
+                        <span className="text-gray-400 ml-2">
+                          líneas {fn.line}-{fn.endLine}
+                        </span>
+                      </span>
+                      <span className="flex items-center gap-3">
+                        {fn.recursive && (
+                          <span className="text-xs text-purple-300">
+                            recursiva
+                          </span>
+                        )}
+                        <span
+                          className={`font-mono text-sm ${
+                            fn.order >= 2 ? "text-orange-400" : "text-gray-300"
+                          }`}
+                          title="Coste estimado por los bucles anidados"
+                        >
+                          {formatOrder(fn.order)}
+                        </span>
+                        <span
+                          className={`font-bold ${getComplexityColor(
+                            fn.complexity
+                          )}`}
+                        >
+                          {fn.complexity}
+                        </span>
+                      </span>
+                    </div>
+                  ))}
+                </div>
+              </div>
+            )}
+
             {/* Other Metrics */}
             <div className="bg-gray-800 rounded-xl p-5 border border-gray-700">
               <h3 className="text-xl font-bold text-white mb-4 flex items-center gap-2">
@@ -413,7 +398,7 @@ function CodeAnalyzer({ code }) {
 
         {/* Footer */}
         <div className="bg-gray-800 border-t border-gray-700 px-6 py-4 text-center text-gray-400 text-sm">
-          <p>💡 Análisis basado en métricas estáticas del código</p>
+          <p>💡 Análisis estático con el módulo ast de Python (complejidad ciclomática de McCabe)</p>
         </div>
       </div>
     </div>
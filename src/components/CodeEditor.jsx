@@ -1,5 +1,6 @@
 import React, { useRef, useEffect } from 'react';
 import Editor from '@monaco-editor/react';
+import { getCompletions } from '../services/completion';
 
 /**
  * Componente editor de código con Monaco Editor
@@ -16,12 +17,21 @@ function CodeEditor({
   lineNumbers = 'on'
 }) {
   const editorRef = useRef(null);
+  const providersRef = useRef([]);
+
+  // Los proveedores de Monaco son globales: se liberan al desmontar
+  useEffect(() => {
+    return () => {
+      providersRef.current.forEach((provider) => provider.dispose());
+      providersRef.current = [];
+    };
+  }, []);
 
   function handleEditorDidMount(editor, monaco) {
     editorRef.current = editor;
     
     // Configurar Python para Monaco
-    monaco.languages.registerCompletionItemProvider('python', {
+    const snippetsProvider = monaco.languages.registerCompletionItemProvider('python', {
       provideCompletionItems: (model, position) => {
         const suggestions = [
           {
@@ -64,6 +74,54 @@ function CodeEditor({
       }
     });
 
+    // Sugerencias del intérprete: namespace vivo y lo definido en el código
+    const kinds = {
+      module: monaco.languages.CompletionItemKind.Module,
+      class: monaco.languages.CompletionItemKind.Class,
+      function: monaco.languages.CompletionItemKind.Function,
+      keyword: monaco.languages.CompletionItemKind.Keyword,
+      variable: monaco.languages.CompletionItemKind.Variable
+    };
+    const liveProvider = monaco.languages.registerCompletionItemProvider('python', {
+      triggerCharacters: ['.'],
+      provideCompletionItems: async (model, position, context, token) => {
+        const linePrefix = model
+          .getLineContent(position.lineNumber)
+          .slice(0, position.column - 1);
+        const items = await getCompletions(
+          model.getValue(),
+          position.lineNumber,
+          position.column,
+          linePrefix,
+          () => token.isCancellationRequested
+        );
+        if (!items || token.isCancellationRequested) {
+          return { suggestions: [] };
+        }
+
+        const word = model.getWordUntilPosition(position);
+        const range = {
+          startLineNumber: position.lineNumber,
+          endLineNumber: position.lineNumber,
+          startColumn: word.startColumn,
+          endColumn: word.endColumn
+        };
+        // Los nombres privados van al final de la lista
+        return {
+          suggestions: items.map((item) => ({
+            label: item.label,
+            kind: kinds[item.kind] || kinds.variable,
+            insertText: item.label,
+            sortText: (item.label.startsWith('_') ? 'z' : 'a') + item.label,
+            range
+          }))
+        };
+      }
+    });
+
+    providersRef.current.forEach((provider) => provider.dispose());
+    providersRef.current = [snippetsProvider, liveProvider];
+
     // Atajos de teclado
     editor.addCommand(monaco.KeyMod.CtrlCmd | monaco.KeyCode.Enter, () => {
       // El atajo Ctrl+Enter se manejará en el componente padre
@@ -2,7 +2,9 @@ import React, { useState, useEffect, useRef } from "react";
 
 /**
  * Terminal REPL interactivo para Python
- * Permite ejecutar comandos Python línea por línea
+ * Permite ejecutar comandos Python línea por línea. Las sentencias de
+ * varias líneas (def, for, paréntesis abiertos...) continúan con "..."
+ * hasta que la consola del worker las da por completas.
  */
 function InteractiveREPL({ pyodideReady, onExecuteCode }) {
   const [isOpen, setIsOpen] = useState(false);
@@ -10,6 +12,8 @@ function InteractiveREPL({ pyodideReady, onExecuteCode }) {
   const [currentInput, setCurrentInput] = useState("");
   const [commandHistory, setCommandHistory] = useState([]);
   const [historyIndex, setHistoryIndex] = useState(-1);
+  // true mientras la consola espera más líneas de la sentencia actual
+  const [continuation, setContinuation] = useState(false);
   const inputRef = useRef(null);
   const terminalRef = useRef(null);
 
@@ -25,25 +29,65 @@ function InteractiveREPL({ pyodideReady, onExecuteCode }) {
     }
   }, [history]);
 
+  /**
+   * Envía una línea a la consola y muestra su resultado.
+   * Devuelve false si hubo un error (para cortar un bloque pegado).
+   */
+  const sendLine = async (line, prompt) => {
+    setHistory((prev) => [...prev, { type: "input", content: line, prompt }]);
+
+    const result = await onExecuteCode(line);
+    if (result.status === "incomplete") {
+      setContinuation(true);
+      return true;
+    }
+    setContinuation(false);
+
+    if (result.success) {
+      const output = [
+        result.output,
+        result.result !== undefined && result.result !== null
+          ? result.result
+          : "",
+      ]
+        .filter(Boolean)
+        .join("");
+      if (output) {
+        setHistory((prev) => [...prev, { type: "output", content: output }]);
+      }
+      return true;
+    }
+
+    setHistory((prev) => [
+      ...prev,
+      { type: "error", content: result.error || result.output },
+    ]);
+    return false;
+  };
+
   const executeCommand = async (command) => {
-    if (!command.trim()) return;
+    // Una línea vacía cierra el bloque en curso
+    if (!command.trim() && !continuation) return;
 
-    // Añadir comando al historial
-    setHistory((prev) => [...prev, { type: "input", content: command }]);
-    setCommandHistory((prev) => [...prev, command]);
+    setCommandHistory((prev) =>
+      command.trim() ? [...prev, command] : prev
+    );
     setHistoryIndex(-1);
     setCurrentInput("");
 
     try {
-      // Comandos especiales
-      if (command.trim() === "clear") {
+      // Comandos especiales (no dentro de un bloque)
+      const special = continuation ? null : command.trim();
+
+      if (special === "clear") {
         setHistory([]);
         return;
       }
 
-      if (command.trim() === "help") {
+      if (special === "help") {
         setHistory((prev) => [
           ...prev,
+          { type: "input", content: command },
           {
             type: "output",
             content: `Comandos disponibles:
@@ -54,15 +98,18 @@ function InteractiveREPL({ pyodideReady, onExecuteCode }) {
 Ejecuta cualquier código Python:
   >>> 2 + 2
   >>> import math; math.pi
-  >>> [x**2 for x in range(10)]`,
+  >>> [x**2 for x in range(10)]
+  >>> def doble(x):
+  ...     return x * 2`,
           },
         ]);
         return;
       }
 
-      if (command.trim() === "history") {
+      if (special === "history") {
         setHistory((prev) => [
           ...prev,
+          { type: "input", content: command },
           {
             type: "output",
             content: commandHistory
@@ -73,28 +120,15 @@ Ejecuta cualquier código Python:
         return;
       }
 
-      // Ejecutar código Python
-      const result = await onExecuteCode(command);
-
-      if (result.success) {
-        let output = result.output || "";
-        if (
-          result.result !== undefined &&
-          result.result !== null &&
-          result.result !== "None"
-        ) {
-          output = result.result;
-        }
-        if (output) {
-          setHistory((prev) => [...prev, { type: "output", content: output }]);
-        }
-      } else {
-        setHistory((prev) => [
-          ...prev,
-          { type: "error", content: result.error || result.output },
-        ]);
+      // Ejecutar código Python línea a línea, como en la consola de Python
+      // (un bloque pegado se corta en el primer error)
+      let prompt = continuation ? "..." : ">>>";
+      for (const line of command.split("\n")) {
+        if (!(await sendLine(line, prompt))) return;
+        prompt = "...";
       }
     } catch (error) {
+      setContinuation(false);
       setHistory((prev) => [
         ...prev,
         { type: "error", content: error.message },
@@ -220,7 +254,9 @@ Ejecuta cualquier código Python:
             <div key={index} className="mb-2">
               {entry.type === "input" ? (
                 <div className="flex gap-2">
-                  <span className="text-green-400 font-bold">{">>>"}</span>
+                  <span className="text-green-400 font-bold">
+                    {entry.prompt || ">>>"}
+                  </span>
                   <span className="text-white flex-1 break-all">
                     {entry.content}
                   </span>
@@ -239,7 +275,9 @@ Ejecuta cualquier código Python:
 
           {/* Current Input */}
           <div className="flex gap-2 items-start">
-            <span className="text-green-400 font-bold pt-0.5">{">>>"}</span>
+            <span className="text-green-400 font-bold pt-0.5">
+              {continuation ? "..." : ">>>"}
+            </span>
             <textarea
               ref={inputRef}
               value={currentInput}
@@ -0,0 +1,134 @@
+import React from "react";
+import { formatBytes } from "../utils/format";
+import { HEAP_WARNING_THRESHOLD } from "../services/pyodideConfig";
+
+const LIST_ROWS = 10;
+
+/**
+ * Barras de memoria por línea: [{ file, line, size, count }]
+ */
+function LineBars({ entries, color }) {
+  if (entries.length === 0) {
+    return <p className="text-gray-400 text-sm">Nada que mostrar.</p>;
+  }
+  const max = entries[0].size || 1;
+
+  return (
+    <div className="space-y-1 font-mono text-sm">
+      {entries.slice(0, LIST_ROWS).map((entry) => (
+        <div key={`${entry.file}:${entry.line}`} className="flex items-center gap-3">
+          <span
+            className="w-40 text-gray-400 truncate"
+            title={`${entry.count.toLocaleString()} bloques`}
+          >
+            {entry.file === "main.py" ? `línea ${entry.line}` : `${entry.file}:${entry.line}`}
+          </span>
+          <div className="flex-1 bg-gray-700 rounded h-3">
+            <div
+              className={`${color} h-3 rounded`}
+              style={{ width: `${(entry.size / max) * 100}%` }}
+            ></div>
+          </div>
+          <span className="w-24 text-right text-gray-200">{formatBytes(entry.size)}</span>
+        </div>
+      ))}
+    </div>
+  );
+}
+
+/**
+ * Resultado de una ejecución en modo Memoria: pico de Python y del heap de
+ * WASM, qué líneas reservaban memoria en el pico, cuál sigue reservada al
+ * terminar y qué objetos han sobrevivido a la ejecución
+ */
+function MemoryView({ report }) {
+  const heap = report.heap || { before: 0, peak: 0 };
+  const heapGrowth = heap.peak - heap.before;
+  const overThreshold = heap.peak >= HEAP_WARNING_THRESHOLD;
+
+  return (
+    <div className="p-4 space-y-4">
+      {/* Summary */}
+      <div className="bg-gradient-to-r from-teal-600 to-cyan-600 rounded-xl p-4 text-white">
+        <div className="flex items-center justify-between mb-3">
+          <span className="text-xl font-bold">
+            <i className="fas fa-memory"></i> Memoria de la ejecución
+          </span>
+          <span className="text-sm text-cyan-100">
+            {report.duration.toFixed(0)} ms
+          </span>
+        </div>
+        <div className="grid grid-cols-3 gap-4 text-center">
+          <div>
+            <div className="text-2xl font-bold">{formatBytes(report.peak)}</div>
+            <div className="text-xs text-cyan-100">Pico de Python</div>
+          </div>
+          <div>
+            <div className="text-2xl font-bold">{formatBytes(report.current)}</div>
+            <div className="text-xs text-cyan-100">Retenida al terminar</div>
+          </div>
+          <div>
+            <div className="text-2xl font-bold">{formatBytes(heap.peak)}</div>
+            <div className="text-xs text-cyan-100">
+              Heap WASM{heapGrowth > 0 && ` (+${formatBytes(heapGrowth)})`}
+            </div>
+          </div>
+        </div>
+      </div>
+
+      {overThreshold && (
+        <div className="bg-red-900 bg-opacity-30 border border-red-600 rounded-xl p-4 text-red-200 text-sm">
+          <i className="fas fa-exclamation-triangle"></i> El heap de WASM ya ocupa{" "}
+          {formatBytes(heap.peak)} y no se devuelve al navegador. Reinicia el
+          entorno antes de seguir o reduce las estructuras que viven a la vez.
+        </div>
+      )}
+
+      {/* Allocations at peak */}
+      <div className="bg-gray-800 rounded-xl p-4 border border-gray-700">
+        <h3 className="text-white font-bold mb-3">Asignaciones en el pico</h3>
+        <LineBars entries={report.allocations} color="bg-cyan-500" />
+      </div>
+
+      {/* Retained */}
+      <div className="bg-gray-800 rounded-xl p-4 border border-gray-700">
+        <h3 className="text-white font-bold mb-3">Memoria retenida al terminar</h3>
+        <LineBars entries={report.retained} color="bg-teal-500" />
+      </div>
+
+      {/* Survivors */}
+      <div className="bg-gray-800 rounded-xl p-4 border border-gray-700 overflow-x-auto">
+        <h3 className="text-white font-bold mb-3">Objetos que siguen vivos</h3>
+        {report.survivors.length === 0 ? (
+          <p className="text-gray-400 text-sm">
+            La ejecución no dejó contenedores nuevos en memoria.
+          </p>
+        ) : (
+          <table className="w-full text-sm">
+            <thead>
+              <tr className="text-gray-400 border-b border-gray-700">
+                <th className="py-2 px-2 text-left">Tipo</th>
+                <th className="py-2 px-2 text-right">Nuevos</th>
+              </tr>
+            </thead>
+            <tbody>
+              {report.survivors.map((entry) => (
+                <tr
+                  key={entry.type}
+                  className="border-b border-gray-700 last:border-0 text-gray-200"
+                >
+                  <td className="py-1 px-2 font-mono">{entry.type}</td>
+                  <td className="py-1 px-2 text-right">
+                    {entry.count.toLocaleString()}
+                  </td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        )}
+      </div>
+    </div>
+  );
+}
+
+export default MemoryView;
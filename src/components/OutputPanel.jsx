@@ -1,30 +1,221 @@
-import React, { useState, useRef, useEffect } from "react";
+import React, { useState, useRef, useEffect, useLayoutEffect } from "react";
+import ProfileView from "./ProfileView";
+import MemoryView from "./MemoryView";
+
+// La salida se virtualiza: solo se montan las líneas visibles
+const ROW_HEIGHT = 20; // px, igual al line-height de text-sm
+const OVERSCAN = 20; // líneas extra por encima y por debajo
+// Los navegadores limitan la altura de un elemento; por encima de esto el
+// scroll se escala para que quepan millones de líneas
+const MAX_SCROLL_HEIGHT = 8000000;
+const SEARCH_DEBOUNCE = 200; // ms
+
+/**
+ * Pinta un ImageBitmap o ImageData en el canvas, ajustando su tamaño
+ */
+function paintImage(canvas, image) {
+  if (canvas.width !== image.width || canvas.height !== image.height) {
+    canvas.width = image.width;
+    canvas.height = image.height;
+  }
+  const context = canvas.getContext("2d");
+  if (typeof ImageData !== "undefined" && image instanceof ImageData) {
+    context.putImageData(image, 0, 0);
+  } else {
+    context.drawImage(image, 0, 0);
+  }
+}
+
+/**
+ * Dibuja una figura de matplotlib recibida del worker como ImageBitmap
+ */
+function FigureCanvas({ bitmap, label }) {
+  const canvasRef = useRef(null);
+
+  useEffect(() => {
+    paintImage(canvasRef.current, bitmap);
+  }, [bitmap]);
+
+  return (
+    <canvas
+      ref={canvasRef}
+      role="img"
+      aria-label={label}
+      className="block max-w-full h-auto mx-auto my-2 rounded bg-white"
+    />
+  );
+}
+
+/**
+ * Reproduce los frames de una animación a medida que llegan del worker.
+ * Cada frame se cierra en cuanto el siguiente ya está pintado.
+ */
+function AnimationCanvas({ frame, shown, dropped }) {
+  const canvasRef = useRef(null);
+  const paintedRef = useRef(null);
+
+  useLayoutEffect(() => {
+    if (frame === paintedRef.current) return;
+    paintImage(canvasRef.current, frame);
+    if (paintedRef.current && paintedRef.current.close) {
+      paintedRef.current.close();
+    }
+    paintedRef.current = frame;
+  }, [frame]);
+
+  // El último frame pintado no lo cierra ningún frame siguiente: se libera al desmontar.
+  // La referencia se conserva para que un re-montaje no intente pintar un bitmap cerrado.
+  useEffect(
+    () => () => {
+      if (paintedRef.current && paintedRef.current.close) {
+        paintedRef.current.close();
+      }
+    },
+    []
+  );
+
+  return (
+    <div className="my-2">
+      <canvas
+        ref={canvasRef}
+        role="img"
+        aria-label="Animación"
+        className="block max-w-full h-auto mx-auto rounded bg-white"
+      />
+      <p className="text-center text-xs text-gray-500 mt-1">
+        <i className="fas fa-film"></i> {shown.toLocaleString()} frames
+        mostrados
+        {dropped > 0 && ` · ${dropped.toLocaleString()} descartados`}
+      </p>
+    </div>
+  );
+}
 
 /**
  * Componente para mostrar la salida de ejecución y resultados de tests
  */
-function OutputPanel({ output, testResults, onClear }) {
+function OutputPanel({
+  outputStore,
+  outputVersion,
+  figures = [],
+  animation = null,
+  testResults,
+  profile = null,
+  onClear,
+}) {
   const [activeTab, setActiveTab] = useState("output");
   const [isFullscreen, setIsFullscreen] = useState(false);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [viewportHeight, setViewportHeight] = useState(0);
+  const [searchQuery, setSearchQuery] = useState("");
+  const [matches, setMatches] = useState([]);
+  const [matchIndex, setMatchIndex] = useState(0);
+  const [highlightedLine, setHighlightedLine] = useState(null);
+  const [jumpTarget, setJumpTarget] = useState("");
   const outputRef = useRef(null);
+  const stickToBottom = useRef(true);
 
-  const hasOutput = output && output.length > 0;
+  const lineCount = outputStore.lineCount();
+  const hasOutput = lineCount > 0;
   const hasTests =
     testResults && testResults.tests && testResults.tests.length > 0;
 
-  // Auto-scroll al final cuando hay nuevo output
+  // Geometría de la lista virtual
+  const totalHeight = lineCount * ROW_HEIGHT;
+  const listHeight = Math.min(totalHeight, MAX_SCROLL_HEIGHT);
+  const maxListScroll = Math.max(0, listHeight - viewportHeight);
+  const scale =
+    totalHeight > listHeight && maxListScroll > 0
+      ? (totalHeight - viewportHeight) / maxListScroll
+      : 1;
+  const listScroll = Math.min(scrollTop, maxListScroll);
+  const offset = listScroll * scale; // píxel real de la primera línea visible
+  const firstLine = Math.max(0, Math.floor(offset / ROW_HEIGHT) - OVERSCAN);
+  const lastLine = Math.min(
+    lineCount,
+    Math.ceil((offset + viewportHeight) / ROW_HEIGHT) + OVERSCAN
+  );
+
+  // Altura visible del contenedor
+  useEffect(() => {
+    const container = outputRef.current;
+    if (!container) return;
+    setViewportHeight(container.clientHeight);
+    if (typeof ResizeObserver === "undefined") return;
+    const observer = new ResizeObserver(() =>
+      setViewportHeight(container.clientHeight)
+    );
+    observer.observe(container);
+    return () => observer.disconnect();
+  }, [isFullscreen]);
+
+  // Un perfil nuevo se muestra en su pestaña; sin perfil se vuelve a la salida
+  useEffect(() => {
+    if (profile) {
+      setActiveTab("profile");
+    } else {
+      setActiveTab((tab) => (tab === "profile" ? "output" : tab));
+    }
+  }, [profile]);
+
+  // Auto-scroll al final cuando hay nuevo output, salvo si el usuario subió
   useEffect(() => {
-    if (outputRef.current) {
-      outputRef.current.scrollTop = outputRef.current.scrollHeight;
+    const container = outputRef.current;
+    if (container && stickToBottom.current) {
+      container.scrollTop = container.scrollHeight;
     }
-  }, [output]);
+  }, [outputVersion, figures, animation]);
 
-  // Detectar si hay gráficos matplotlib (canvas)
-  const hasGraphics =
-    output && (output.includes("plt.show()") || output.includes("Gráfico"));
+  // Búsqueda con debounce: la salida puede tener millones de líneas
+  useEffect(() => {
+    if (!searchQuery) {
+      setMatches([]);
+      return;
+    }
+    const timer = setTimeout(() => {
+      setMatches(outputStore.search(searchQuery));
+    }, SEARCH_DEBOUNCE);
+    return () => clearTimeout(timer);
+  }, [searchQuery, outputVersion, outputStore]);
+
+  const handleScroll = (event) => {
+    const container = event.currentTarget;
+    setScrollTop(container.scrollTop);
+    stickToBottom.current =
+      container.scrollTop + container.clientHeight >=
+      container.scrollHeight - ROW_HEIGHT;
+  };
+
+  /**
+   * Centra la línea `index` (base 0) en la vista y la resalta
+   */
+  const scrollToLine = (index) => {
+    const container = outputRef.current;
+    if (!container || index < 0 || index >= lineCount) return;
+    const target = index * ROW_HEIGHT - (viewportHeight - ROW_HEIGHT) / 2;
+    stickToBottom.current = false;
+    container.scrollTop = Math.max(0, target / scale);
+    setHighlightedLine(index);
+  };
+
+  const goToMatch = (step) => {
+    if (matches.length === 0) return;
+    const next = (matchIndex + step + matches.length) % matches.length;
+    setMatchIndex(next);
+    scrollToLine(matches[next]);
+  };
+
+  const handleJump = (event) => {
+    event.preventDefault();
+    const line = parseInt(jumpTarget, 10);
+    if (!Number.isNaN(line)) {
+      scrollToLine(Math.min(Math.max(line, 1), lineCount) - 1);
+    }
+  };
 
   const formatLine = (line, index) => {
-    let className = "py-0.5 px-2 hover:bg-gray-800 transition-colors";
+    let className =
+      "absolute left-0 right-0 px-2 leading-5 whitespace-pre overflow-hidden text-ellipsis hover:bg-gray-800 transition-colors";
     let icon = "";
 
     // Detectar tipo de línea
@@ -56,8 +247,20 @@ function OutputPanel({ output, testResults, onClear }) {
       className += " text-gray-300";
     }
 
+    if (index === highlightedLine) {
+      className += " ring-1 ring-inset ring-yellow-400";
+    }
+
     return (
-      <div key={index} className={className}>
+      <div
+        key={index}
+        className={className}
+        style={{
+          top: listScroll + index * ROW_HEIGHT - offset,
+          height: ROW_HEIGHT,
+        }}
+        title={line.length > 200 ? line : undefined}
+      >
         <span className="font-mono text-sm">
           {icon}
           {line || "\u00A0"}
@@ -99,9 +302,67 @@ function OutputPanel({ output, testResults, onClear }) {
               {testResults.total})
             </button>
           )}
+          {profile && (
+            <button
+              onClick={() => setActiveTab("profile")}
+              className={`px-3 py-1 rounded-lg text-sm font-medium transition-all ${
+                activeTab === "profile"
+                  ? "bg-gradient-to-r from-purple-600 to-indigo-600 text-white"
+                  : "text-gray-400 hover:text-white hover:bg-gray-700"
+              }`}
+            >
+              {profile.mode === "memory" ? (
+                <>
+                  <i className="fas fa-memory"></i> Memoria
+                </>
+              ) : (
+                <>
+                  <i className="fas fa-fire"></i> Perfil
+                </>
+              )}
+            </button>
+          )}
         </div>
 
         <div className="flex items-center gap-2">
+          {activeTab === "output" && hasOutput && (
+            <>
+              <div className="flex items-center gap-1">
+                <input
+                  type="text"
+                  value={searchQuery}
+                  onChange={(e) => {
+                    setSearchQuery(e.target.value);
+                    setMatchIndex(0);
+                  }}
+                  onKeyDown={(e) => {
+                    if (e.key === "Enter") goToMatch(e.shiftKey ? -1 : 1);
+                  }}
+                  placeholder="Buscar..."
+                  className="w-32 bg-gray-900 text-gray-200 text-sm px-2 py-1 rounded border border-gray-700 focus:outline-none focus:border-purple-500"
+                />
+                {searchQuery && (
+                  <span className="text-xs text-gray-400">
+                    {matches.length > 0
+                      ? `${matchIndex + 1}/${matches.length.toLocaleString()}`
+                      : "0/0"}
+                  </span>
+                )}
+              </div>
+              <form onSubmit={handleJump}>
+                <input
+                  type="number"
+                  min="1"
+                  max={lineCount}
+                  value={jumpTarget}
+                  onChange={(e) => setJumpTarget(e.target.value)}
+                  placeholder="Línea"
+                  title={`Ir a línea (1-${lineCount.toLocaleString()})`}
+                  className="w-20 bg-gray-900 text-gray-200 text-sm px-2 py-1 rounded border border-gray-700 focus:outline-none focus:border-purple-500"
+                />
+              </form>
+            </>
+          )}
           <button
             onClick={() => setIsFullscreen(!isFullscreen)}
             className="text-gray-400 hover:text-white p-1 rounded transition-all hover:bg-gray-700"
@@ -153,6 +414,7 @@ function OutputPanel({ output, testResults, onClear }) {
       {/* Content */}
       <div
         ref={outputRef}
+        onScroll={handleScroll}
         className={`flex-1 overflow-y-auto bg-gray-950 ${
           isFullscreen ? "h-[calc(100vh-50px)]" : ""
         }`}
@@ -178,18 +440,42 @@ function OutputPanel({ output, testResults, onClear }) {
                 </p>
               </div>
             ) : (
-              <div className="py-2">
-                {output
-                  .split("\n")
-                  .map((line, index) => formatLine(line, index))}
+              <div className="relative" style={{ height: listHeight }}>
+                {outputStore
+                  .getLines(firstLine, lastLine)
+                  .map((line, i) => formatLine(line, firstLine + i))}
               </div>
             )}
 
-            {/* Canvas container for matplotlib */}
-            <div id="matplotlib-output" className="w-full"></div>
+            {/* Figuras matplotlib renderizadas en el worker */}
+            <div id="matplotlib-output" className="w-full">
+              {animation && (
+                <AnimationCanvas
+                  frame={animation.frame}
+                  shown={animation.shown}
+                  dropped={animation.dropped}
+                />
+              )}
+              {figures.map((bitmap, index) => (
+                <FigureCanvas
+                  key={index}
+                  bitmap={bitmap}
+                  label={`Figura ${index + 1}`}
+                />
+              ))}
+            </div>
           </div>
         )}
 
+        {/* Profile Tab */}
+        {activeTab === "profile" &&
+          profile &&
+          (profile.mode === "memory" ? (
+            <MemoryView report={profile} />
+          ) : (
+            <ProfileView profile={profile} />
+          ))}
+
         {/* Tests Tab */}
         {activeTab === "tests" && hasTests && (
           <div className="p-4 space-y-4">
@@ -247,6 +533,14 @@ function OutputPanel({ output, testResults, onClear }) {
                       {test.passed ? "✓" : "✗"}
                     </span>
                     <span className="text-white font-medium">{test.name}</span>
+                    {test.cached && (
+                      <span
+                        className="text-xs text-gray-400 bg-gray-800 px-2 py-0.5 rounded"
+                        title="Sin cambios en sus dependencias: resultado reutilizado"
+                      >
+                        <i className="fas fa-history"></i> caché
+                      </span>
+                    )}
                   </div>
                   {!test.passed && test.message && (
                     <div className="mt-2 text-red-300 text-sm font-mono bg-red-950 rounded p-2">
@@ -0,0 +1,240 @@
+import React, { useMemo, useState } from "react";
+
+const FLAME_ROW_HEIGHT = 22; // px
+const FLAME_MIN_WIDTH = 0.002; // fracción del ancho por debajo de la cual no se dibuja
+const TABLE_ROWS = 50;
+
+const COLUMNS = [
+  { key: "name", label: "Función", numeric: false },
+  { key: "file", label: "Archivo", numeric: false },
+  { key: "self", label: "Propio (ms)", numeric: true },
+  { key: "total", label: "Total (ms)", numeric: true },
+  { key: "calls", label: "Llamadas", numeric: true },
+];
+
+/**
+ * Color de un marco del flame graph: cálidos para el código del editor,
+ * fríos para librerías y grises para builtins
+ */
+function frameColor(node) {
+  let hash = 0;
+  for (let i = 0; i < node.name.length; i++) {
+    hash = (hash * 31 + node.name.charCodeAt(i)) | 0;
+  }
+  const shade = 45 + (Math.abs(hash) % 15);
+  if (node.file === "main.py") return `hsl(${20 + (Math.abs(hash) % 30)}, 85%, ${shade}%)`;
+  if (node.file === "builtins" || node.file === "pyhub") return `hsl(220, 8%, ${shade}%)`;
+  return `hsl(${195 + (Math.abs(hash) % 40)}, 60%, ${shade}%)`;
+}
+
+/**
+ * Aplana el árbol en rectángulos { node, depth, x, width } (x y width en
+ * fracción del nodo raíz visible)
+ */
+function layoutFlame(root) {
+  const rects = [];
+  const walk = (node, depth, x, width) => {
+    rects.push({ node, depth, x, width });
+    let offset = x;
+    for (const child of node.children) {
+      const childWidth = root.value > 0 ? child.value / root.value : 0;
+      if (childWidth >= FLAME_MIN_WIDTH) {
+        walk(child, depth + 1, offset, childWidth);
+      }
+      offset += childWidth;
+    }
+  };
+  walk(root, 0, 0, 1);
+  return rects;
+}
+
+/**
+ * Formatea milisegundos con una precisión acorde a su tamaño
+ */
+function formatMs(value) {
+  if (value >= 100) return value.toFixed(0);
+  if (value >= 1) return value.toFixed(1);
+  return value.toFixed(2);
+}
+
+/**
+ * Flame graph de la ejecución. Un click en un marco lo amplía; en la raíz
+ * (o "Restablecer") se vuelve a la vista completa.
+ */
+function FlameGraph({ flame }) {
+  const [focus, setFocus] = useState(null);
+  const root = focus || flame;
+  const rects = useMemo(() => (root ? layoutFlame(root) : []), [root]);
+  const depth = rects.reduce((max, rect) => Math.max(max, rect.depth), 0) + 1;
+
+  if (!flame || flame.value <= 0) {
+    return (
+      <p className="text-gray-400 text-sm">
+        La ejecución fue demasiado corta para tomar muestras.
+      </p>
+    );
+  }
+
+  return (
+    <div>
+      {focus && (
+        <button
+          onClick={() => setFocus(null)}
+          className="mb-2 px-2 py-1 text-xs rounded bg-gray-700 hover:bg-gray-600 text-gray-200"
+        >
+          <i className="fas fa-search-minus"></i> Restablecer
+        </button>
+      )}
+      <div
+        className="relative w-full overflow-hidden rounded bg-gray-900"
+        style={{ height: depth * FLAME_ROW_HEIGHT }}
+      >
+        {rects.map(({ node, depth: level, x, width }, index) => (
+          <div
+            key={index}
+            onClick={() => setFocus(level === 0 ? null : node)}
+            title={`${node.name} (${node.file}) · ${formatMs(node.value)} ms · ${(
+              (node.value / flame.value) *
+              100
+            ).toFixed(1)}%`}
+            className="absolute text-xs text-gray-900 px-1 truncate cursor-pointer border-r border-b border-gray-900 hover:brightness-110"
+            style={{
+              left: `${x * 100}%`,
+              width: `${width * 100}%`,
+              top: level * FLAME_ROW_HEIGHT,
+              height: FLAME_ROW_HEIGHT,
+              lineHeight: `${FLAME_ROW_HEIGHT}px`,
+              background: frameColor(node),
+            }}
+          >
+            {node.name}
+          </div>
+        ))}
+      </div>
+    </div>
+  );
+}
+
+/**
+ * Resultado de una ejecución en modo Perfil: tabla de funciones ordenable,
+ * flame graph y (en muestreo) las líneas del editor que más tiempo ocupan
+ */
+function ProfileView({ profile }) {
+  const [sortKey, setSortKey] = useState("total");
+  const [ascending, setAscending] = useState(false);
+
+  const rows = useMemo(() => {
+    const sorted = [...profile.functions].sort((a, b) => {
+      const left = a[sortKey] ?? -1;
+      const right = b[sortKey] ?? -1;
+      const order =
+        typeof left === "string" ? left.localeCompare(right) : left - right;
+      return ascending ? order : -order;
+    });
+    return sorted.slice(0, TABLE_ROWS);
+  }, [profile, sortKey, ascending]);
+
+  const sortBy = (key) => {
+    if (key === sortKey) {
+      setAscending(!ascending);
+    } else {
+      setSortKey(key);
+      setAscending(key === "name" || key === "file");
+    }
+  };
+
+  const sampling = profile.mode === "sampling";
+  const maxLineTime = profile.lines.length > 0 ? profile.lines[0].time : 0;
+
+  return (
+    <div className="p-4 space-y-4">
+      {/* Summary */}
+      <div className="bg-gradient-to-r from-orange-600 to-red-600 rounded-xl p-4 text-white flex items-center justify-between">
+        <span className="text-xl font-bold">
+          <i className="fas fa-fire"></i> Perfil de la ejecución
+        </span>
+        <span className="text-sm text-orange-100">
+          {sampling
+            ? `Muestreo · ${profile.samples} muestras`
+            : "Exacto (cProfile)"}{" "}
+          · {formatMs(profile.duration)} ms
+        </span>
+      </div>
+
+      {/* Flame Graph */}
+      <div className="bg-gray-800 rounded-xl p-4 border border-gray-700">
+        <h3 className="text-white font-bold mb-3">Flame graph</h3>
+        <FlameGraph key={profile.duration} flame={profile.flame} />
+      </div>
+
+      {/* Hot Lines */}
+      {sampling && profile.lines.length > 0 && (
+        <div className="bg-gray-800 rounded-xl p-4 border border-gray-700">
+          <h3 className="text-white font-bold mb-3">Líneas más costosas</h3>
+          <div className="space-y-1 font-mono text-sm">
+            {profile.lines.slice(0, 10).map((entry) => (
+              <div key={entry.line} className="flex items-center gap-3">
+                <span className="w-20 text-gray-400">línea {entry.line}</span>
+                <div className="flex-1 bg-gray-700 rounded h-3">
+                  <div
+                    className="bg-orange-500 h-3 rounded"
+                    style={{ width: `${(entry.time / maxLineTime) * 100}%` }}
+                  ></div>
+                </div>
+                <span className="w-24 text-right text-gray-200">
+                  {formatMs(entry.time)} ms
+                </span>
+              </div>
+            ))}
+          </div>
+        </div>
+      )}
+
+      {/* Hot Functions */}
+      <div className="bg-gray-800 rounded-xl p-4 border border-gray-700 overflow-x-auto">
+        <h3 className="text-white font-bold mb-3">Funciones</h3>
+        <table className="w-full text-sm">
+          <thead>
+            <tr className="text-gray-400 border-b border-gray-700">
+              {COLUMNS.filter((column) => column.key !== "calls" || !sampling).map(
+                (column) => (
+                  <th
+                    key={column.key}
+                    onClick={() => sortBy(column.key)}
+                    className={`py-2 px-2 cursor-pointer select-none hover:text-white ${
+                      column.numeric ? "text-right" : "text-left"
+                    }`}
+                  >
+                    {column.label}
+                    {sortKey === column.key && (ascending ? " ▲" : " ▼")}
+                  </th>
+                )
+              )}
+            </tr>
+          </thead>
+          <tbody>
+            {rows.map((fn) => (
+              <tr
+                key={`${fn.file}:${fn.line}:${fn.name}`}
+                className="border-b border-gray-700 last:border-0 text-gray-200"
+              >
+                <td className="py-1 px-2 font-mono">{fn.name}</td>
+                <td className="py-1 px-2 text-gray-400">
+                  {fn.file}
+                  {fn.file === "main.py" && fn.line > 0 && `:${fn.line}`}
+                </td>
+                <td className="py-1 px-2 text-right">{formatMs(fn.self)}</td>
+                <td className="py-1 px-2 text-right">{formatMs(fn.total)}</td>
+                {!sampling && (
+                  <td className="py-1 px-2 text-right">{fn.calls}</td>
+                )}
+              </tr>
+            ))}
+          </tbody>
+        </table>
+      </div>
+    </div>
+  );
+}
+
+export default ProfileView;
@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from "react";
+import { createShareLink, readShareLink } from "../services/shareLink";
 
 /**
  * Sistema de compartir código con generación de URL
@@ -6,21 +7,12 @@ import React, { useState, useEffect } from "react";
 function SharePanel({ code, onLoadCode }) {
   const [isOpen, setIsOpen] = useState(false);
   const [shareUrl, setShareUrl] = useState("");
+  // { stored, local } del último enlace generado
+  const [shareLink, setShareLink] = useState(null);
+  const [shareError, setShareError] = useState(null);
   const [copied, setCopied] = useState(false);
   const [shareMethod, setShareMethod] = useState("url"); // 'url', 'gist', 'qr'
 
-  const generateShareUrl = () => {
-    try {
-      // Comprimir y codificar el código
-      const compressed = btoa(encodeURIComponent(code));
-      const url = `${window.location.origin}${window.location.pathname}?code=${compressed}`;
-      setShareUrl(url);
-    } catch (error) {
-      console.error("Error generating share URL:", error);
-      setShareUrl("Error: Código demasiado largo");
-    }
-  };
-
   const copyToClipboard = async () => {
     try {
       await navigator.clipboard.writeText(shareUrl);
@@ -43,30 +35,45 @@ function SharePanel({ code, onLoadCode }) {
     URL.revokeObjectURL(url);
   };
 
+  // Comprimir el código en el enlace (o guardarlo si queda demasiado largo)
   useEffect(() => {
-    if (isOpen) {
-      generateShareUrl();
-    }
+    if (!isOpen) return;
+    let cancelled = false;
+    setShareError(null);
+    createShareLink(code, `${window.location.origin}${window.location.pathname}`)
+      .then((link) => {
+        if (cancelled) return;
+        setShareUrl(link.url);
+        setShareLink(link);
+      })
+      .catch((error) => {
+        if (cancelled) return;
+        console.error("Error generating share URL:", error);
+        setShareUrl("");
+        setShareLink(null);
+        setShareError(error.message);
+      });
+    return () => {
+      cancelled = true;
+    };
   }, [isOpen, code]);
 
   // Cargar código desde URL al montar
   useEffect(() => {
-    const params = new URLSearchParams(window.location.search);
-    const codeParam = params.get("code");
-    if (codeParam) {
-      try {
-        const decoded = decodeURIComponent(atob(codeParam));
-        onLoadCode(decoded);
+    readShareLink(window.location.search)
+      .then((shared) => {
+        if (shared === null) return;
+        onLoadCode(shared);
         // Limpiar URL
         window.history.replaceState(
           {},
           document.title,
           window.location.pathname
         );
-      } catch (error) {
+      })
+      .catch((error) => {
         console.error("Error loading shared code:", error);
-      }
-    }
+      });
   }, []);
 
   if (!isOpen) {
@@ -165,8 +172,10 @@ function SharePanel({ code, onLoadCode }) {
                   <span>Enlace para Compartir</span>
                 </h3>
                 <p className="text-gray-400 text-sm mb-3">
-                  Copia este enlace para compartir tu código. El código está
-                  codificado en la URL.
+                  Copia este enlace para compartir tu código.{" "}
+                  {shareLink && shareLink.stored
+                    ? "El código es largo: el enlace solo lleva su huella y el código queda guardado aparte."
+                    : "El código va comprimido dentro de la URL."}
                 </p>
                 <div className="flex gap-2">
                   <input
@@ -189,11 +198,28 @@ function SharePanel({ code, onLoadCode }) {
                 </div>
               </div>
 
-              {shareUrl.includes("Error") && (
+              {shareUrl && (
+                <p className="text-gray-500 text-xs">
+                  {shareUrl.length.toLocaleString()} caracteres ·{" "}
+                  {code.length.toLocaleString()} de código
+                </p>
+              )}
+
+              {shareError && (
                 <div className="bg-red-500 bg-opacity-10 border border-red-500 rounded-lg p-3">
                   <p className="text-red-400 text-sm">
-                    ⚠️ El código es demasiado largo para compartir por URL.
-                    Prueba descargarlo o usar otro método.
+                    ⚠️ No se pudo crear el enlace ({shareError}). Prueba
+                    descargarlo o usar otro método.
+                  </p>
+                </div>
+              )}
+
+              {shareLink && shareLink.local && (
+                <div className="bg-yellow-500 bg-opacity-10 border border-yellow-500 rounded-lg p-3">
+                  <p className="text-yellow-300 text-sm">
+                    ⚠️ El código está guardado en este navegador: el enlace
+                    solo se abre aquí. Para otras personas, descárgalo o
+                    configura un almacén compartido.
                   </p>
                 </div>
               )}
@@ -344,7 +370,7 @@ function SharePanel({ code, onLoadCode }) {
 
         {/* Footer */}
         <div className="bg-gray-800 border-t border-gray-700 px-6 py-4 text-center text-gray-400 text-sm">
-          <p>💡 Tip: Los enlaces compartidos contienen el código completo</p>
+          <p>💡 Tip: Los enlaces compartidos llevan el código comprimido</p>
         </div>
       </div>
     </div>
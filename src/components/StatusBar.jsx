@@ -1,10 +1,13 @@
 import { useState, useEffect } from "react";
+import { formatBytes } from "../utils/format";
+import { HEAP_WARNING_THRESHOLD } from "../services/pyodideConfig";
 
 export default function StatusBar({
   code,
   pyodideReady,
   isRunning,
   executionTime,
+  heapSize,
 }) {
   const [stats, setStats] = useState({
     lines: 0,
@@ -59,6 +62,25 @@ export default function StatusBar({
             <span>{executionTime}ms</span>
           </div>
         )}
+
+        {heapSize > 0 &&
+          (heapSize >= HEAP_WARNING_THRESHOLD ? (
+            <div
+              className="flex items-center gap-1 text-red-400 font-semibold cursor-help"
+              title="El heap de WASM no se devuelve al navegador: reinicia el entorno si sigue creciendo"
+            >
+              <i className="fas fa-exclamation-triangle"></i>
+              <span>Memoria: {formatBytes(heapSize)}</span>
+            </div>
+          ) : (
+            <div
+              className="flex items-center gap-1 text-gray-400 cursor-help"
+              title="Heap de WASM del intérprete"
+            >
+              <i className="fas fa-memory"></i>
+              <span>{formatBytes(heapSize)}</span>
+            </div>
+          ))}
       </div>
 
       {/* Estadísticas del código */}
@@ -6,6 +6,8 @@ import React, { useState } from "react";
 function Toolbar({
   onRun,
   onRunTests,
+  onProfile,
+  onStop,
   onReset,
   onLoadExample,
   isRunning,
@@ -14,6 +16,7 @@ function Toolbar({
 }) {
   const [showKeyboardHelp, setShowKeyboardHelp] = useState(false);
   const [runTime, setRunTime] = useState(null);
+  const [profileMode, setProfileMode] = useState("sampling");
 
   const handleRun = async () => {
     const startTime = performance.now();
@@ -85,6 +88,51 @@ function Toolbar({
           <span>Tests</span>
         </button>
 
+        {/* Perfilar */}
+        {onProfile && (
+          <div className="flex items-center">
+            <button
+              onClick={() => onProfile(profileMode)}
+              disabled={isRunning || !isPyodideReady}
+              title="Ejecutar midiendo dónde se va el tiempo o la memoria"
+              className={`flex items-center gap-2 px-4 py-2 rounded-l-lg font-medium transition-all
+                     ${
+                       isRunning || !isPyodideReady
+                         ? "bg-gray-700 text-gray-400 cursor-not-allowed"
+                         : "bg-gradient-to-r from-orange-600 to-amber-600 hover:from-orange-500 hover:to-amber-500 text-white shadow-lg hover:shadow-orange-500/30"
+                     }`}
+            >
+              <i className="fas fa-fire text-lg"></i>
+              <span className="hidden sm:inline">Perfilar</span>
+            </button>
+            <select
+              value={profileMode}
+              onChange={(e) => setProfileMode(e.target.value)}
+              disabled={isRunning}
+              title="Muestreo: casi sin coste, con líneas. Exacto: cuenta todas las llamadas (más lento). Memoria: asignaciones por línea y objetos que sobreviven (mucho más lento)"
+              className="bg-gray-700 hover:bg-gray-600 text-white text-sm px-2 py-2 rounded-r-lg border-l border-gray-600
+                        cursor-pointer focus:outline-none disabled:opacity-50"
+            >
+              <option value="sampling">Muestreo</option>
+              <option value="deterministic">Exacto</option>
+              <option value="memory">Memoria</option>
+            </select>
+          </div>
+        )}
+
+        {/* Detener */}
+        {isRunning && (
+          <button
+            onClick={onStop}
+            title="Detener ejecución (lanza KeyboardInterrupt)"
+            className="flex items-center gap-2 px-4 py-2 rounded-lg font-medium transition-all
+                     bg-gradient-to-r from-rose-600 to-red-700 hover:from-rose-500 hover:to-red-600 text-white shadow-lg hover:shadow-red-500/30"
+          >
+            <i className="fas fa-stop text-lg"></i>
+            <span>Detener</span>
+          </button>
+        )}
+
         {/* Reiniciar */}
         <button
           onClick={onReset}
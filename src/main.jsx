@@ -1,8 +1,12 @@
 import React from 'react';
 import ReactDOM from 'react-dom/client';
 import App from './App.jsx';
+import { registerPyodideCache } from './services/serviceWorker.js';
 import './App.css';
 
+// Cachear Pyodide antes de que el worker empiece a descargarlo
+registerPyodideCache();
+
 ReactDOM.createRoot(document.getElementById('root')).render(
   <React.StrictMode>
     <App />
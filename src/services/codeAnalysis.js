@@ -0,0 +1,262 @@
+/**
+ * Servicio de análisis estático del código del editor.
+ *
+ * El análisis lo hace Python (módulo ast) en un worker del pool. El código
+ * se parte en bloques de nivel superior (una función, una clase, un grupo
+ * de sentencias...) y cada bloque se analiza por separado: al editar solo
+ * se vuelven a enviar los bloques que han cambiado, el resto sale de la
+ * caché.
+ *
+ * Además de las métricas, el análisis busca patrones cuadráticos (bucles
+ * anidados sobre la misma colección, 'in' sobre listas y copias de listas
+ * dentro de bucles) y estima el coste del código, que se usa para elegir
+ * el timeout de ejecución.
+ */
+
+import { analyzeBlocks, isPyodideReady } from './pyodide.js';
+
+const BLOCK_CACHE_SIZE = 512;
+const CONTINUATION_RE = /^(?:else|elif|except|finally)\b/;
+
+// Texto del bloque -> resultado (con líneas relativas al bloque); orden = uso
+const blockCache = new Map();
+const ORDER_EXPONENTS = { 2: '²', 3: '³' };
+
+/**
+ * Parte el código en bloques de nivel superior.
+ *
+ * Un bloque empieza en cada línea sin sangría que no esté dentro de un
+ * string de varias líneas o de un paréntesis abierto, salvo else/elif/
+ * except/finally y la definición que sigue a un decorador. Los comentarios
+ * y líneas vacías se quedan en el bloque anterior.
+ *
+ * @returns {{ source: string, line: number }[]} line en base 1
+ */
+export function splitBlocks(code) {
+  const lines = code.split('\n');
+  const blocks = [];
+  let start = 0;
+  let depth = 0;
+  let quote = null; // delimitador del string abierto: ', ", ''' o """
+  let continued = false; // la línea anterior acaba en \
+  let decorated = false; // el bloque actual solo tiene decoradores
+
+  for (let n = 0; n < lines.length; n++) {
+    const text = lines[n];
+    const first = text[0];
+    const opensBlock =
+      quote === null &&
+      depth === 0 &&
+      !continued &&
+      first !== undefined &&
+      first !== '#' &&
+      !/\s/.test(first);
+
+    if (opensBlock) {
+      if (!decorated && !CONTINUATION_RE.test(text) && n > start) {
+        blocks.push({ source: lines.slice(start, n).join('\n'), line: start + 1 });
+        start = n;
+      }
+      decorated = first === '@';
+    }
+
+    // Sigue strings, comentarios y paréntesis hasta el final de la línea
+    continued = false;
+    for (let i = 0; i < text.length; i++) {
+      const char = text[i];
+      if (quote !== null) {
+        if (char === '\\') {
+          i++;
+        } else if (text.startsWith(quote, i)) {
+          i += quote.length - 1;
+          quote = null;
+        }
+      } else if (char === '#') {
+        break;
+      } else if (char === '"' || char === "'") {
+        const triple = char.repeat(3);
+        quote = text.startsWith(triple, i) ? triple : char;
+        i += quote.length - 1;
+      } else if (char === '(' || char === '[' || char === '{') {
+        depth++;
+      } else if (char === ')' || char === ']' || char === '}') {
+        depth = Math.max(0, depth - 1);
+      } else if (char === '\\' && i === text.length - 1) {
+        continued = true;
+      }
+    }
+    // Un string de una comilla no cruza líneas (salvo con \ al final)
+    if (quote !== null && quote.length === 1 && !text.endsWith('\\')) {
+      quote = null;
+    }
+  }
+
+  blocks.push({ source: lines.slice(start).join('\n'), line: start + 1 });
+  return blocks;
+}
+
+/**
+ * Lee de la caché marcando el bloque como usado recientemente
+ */
+function readCache(source) {
+  const result = blockCache.get(source);
+  if (result) {
+    blockCache.delete(source);
+    blockCache.set(source, result);
+  }
+  return result || null;
+}
+
+/**
+ * Guarda el análisis de un bloque, desalojando el menos usado
+ */
+function writeCache(source, result) {
+  blockCache.set(source, result);
+  if (blockCache.size > BLOCK_CACHE_SIZE) {
+    blockCache.delete(blockCache.keys().next().value);
+  }
+}
+
+/**
+ * Pasa un aviso de líneas del bloque a líneas del archivo. El del bucle
+ * anidado cita la línea del bucle exterior, así que su mensaje se compone
+ * aquí y no en el worker.
+ */
+function shiftWarning(warning, offset) {
+  const shifted = { ...warning, line: warning.line + offset };
+  if (warning.kind === 'nested-loop') {
+    shifted.outerLine = warning.outerLine + offset;
+    shifted.message =
+      `Bucle anidado sobre ${warning.names.join(', ')}, que ya recorre el bucle ` +
+      `de la línea ${shifted.outerLine}: O(n²)`;
+  }
+  return shifted;
+}
+
+/**
+ * Junta los resultados por bloque en el análisis del archivo completo
+ */
+function mergeBlocks(code, blocks, results) {
+  const lines = code.split('\n');
+  const analysis = {
+    lines: { total: lines.length, code: 0, comments: 0, empty: 0 },
+    structures: { functions: 0, classes: 0, imports: 0 },
+    controlFlow: {
+      forLoops: 0,
+      whileLoops: 0,
+      ifStatements: 0,
+      elifStatements: 0,
+      elseStatements: 0,
+      tryBlocks: 0,
+      exceptBlocks: 0
+    },
+    metrics: { complexity: 1, commentRatio: 0, avgLineLength: 0, keywordCount: 0, characters: code.length },
+    functions: [],
+    warnings: [],
+    estimate: { order: 0, recursive: false, hotspots: 0 },
+    errors: []
+  };
+  let codeChars = 0;
+  // Función (o '' para el nivel superior) -> funciones a las que llama dentro de un bucle
+  const loopCalls = new Map();
+  let moduleOrder = 0;
+
+  blocks.forEach((block, index) => {
+    const result = results[index];
+    const offset = block.line - 1;
+
+    analysis.lines.code += result.code;
+    analysis.lines.comments += result.comments;
+    analysis.metrics.keywordCount += result.keywords;
+    codeChars += result.codeChars;
+
+    if (result.error) {
+      analysis.errors.push({ line: result.error.line + offset, message: result.error.message });
+      return;
+    }
+
+    analysis.structures.classes += result.classes.length;
+    analysis.structures.imports += result.imports;
+    for (const [key, count] of Object.entries(result.controlFlow)) {
+      analysis.controlFlow[key] += count;
+    }
+    // Las sentencias sueltas de todos los bloques forman un único ámbito
+    analysis.metrics.complexity += result.moduleComplexity;
+    for (const fn of result.functions) {
+      analysis.functions.push({ ...fn, line: fn.line + offset, endLine: fn.endLine + offset });
+      loopCalls.set(fn.name, fn.loopCalls);
+    }
+    for (const warning of result.warnings) {
+      analysis.warnings.push(shiftWarning(warning, offset));
+    }
+    moduleOrder = Math.max(moduleOrder, result.moduleOrder);
+    loopCalls.set('', [...(loopCalls.get('') || []), ...result.moduleLoopCalls]);
+  });
+
+  // Un aviso fuera de bucles pesa igual si la función se llama desde uno
+  for (const warning of analysis.warnings) {
+    if (warning.inLoop || !warning.function) continue;
+    const name = warning.function.split('.').pop();
+    for (const [caller, calls] of loopCalls) {
+      if (caller !== warning.function && calls.includes(name)) {
+        warning.calledFrom = caller;
+        break;
+      }
+    }
+  }
+
+  analysis.lines.empty = analysis.lines.total - analysis.lines.code - analysis.lines.comments;
+  analysis.structures.functions = analysis.functions.length;
+  analysis.functions.sort((a, b) => b.complexity - a.complexity || a.line - b.line);
+  // La complejidad que importa es la del ámbito más complejo
+  analysis.metrics.complexity = Math.max(
+    analysis.metrics.complexity,
+    ...analysis.functions.map((fn) => fn.complexity)
+  );
+  analysis.estimate = {
+    order: Math.max(moduleOrder, ...analysis.functions.map((fn) => fn.order)),
+    recursive: analysis.functions.some((fn) => fn.recursive),
+    hotspots: analysis.warnings.length
+  };
+  analysis.metrics.commentRatio = ((analysis.lines.comments / analysis.lines.total) * 100).toFixed(1);
+  analysis.metrics.avgLineLength =
+    analysis.lines.code > 0 ? (codeChars / analysis.lines.code).toFixed(1) : 0;
+  return analysis;
+}
+
+/**
+ * Coste estimado en notación O a partir del número de bucles anidados
+ */
+export function formatOrder(order) {
+  if (order === 0) return 'O(1)';
+  if (order === 1) return 'O(n)';
+  return `O(n${ORDER_EXPONENTS[order] || `^${order}`})`;
+}
+
+/**
+ * Analiza el código completo reutilizando los bloques ya analizados.
+ * Devuelve null si no hay intérprete.
+ */
+export async function analyzeSource(code) {
+  if (!isPyodideReady()) return null;
+
+  const blocks = splitBlocks(code);
+  const results = blocks.map((block) => readCache(block.source));
+
+  // Solo viajan al worker los bloques nuevos (sin repetir)
+  const missing = [...new Set(blocks.filter((_, i) => !results[i]).map((block) => block.source))];
+  if (missing.length > 0) {
+    const reply = await analyzeBlocks(missing);
+    if (!reply || !Array.isArray(reply.blocks)) return null;
+    const fresh = new Map();
+    missing.forEach((source, i) => {
+      fresh.set(source, reply.blocks[i]);
+      writeCache(source, reply.blocks[i]);
+    });
+    blocks.forEach((block, i) => {
+      results[i] = results[i] || fresh.get(block.source);
+    });
+  }
+
+  return mergeBlocks(code, blocks, results);
+}
@@ -0,0 +1,82 @@
+import { describe, it, expect, vi } from 'vitest';
+
+// Analizador falso: como el del worker, devuelve líneas relativas al bloque
+// y avisa de un for anidado sobre la misma colección que el exterior
+vi.mock('./pyodide.js', () => ({
+  isPyodideReady: () => true,
+  async analyzeBlocks(sources) {
+    return { blocks: sources.map(fakeBlockResult) };
+  }
+}));
+
+function fakeBlockResult(source) {
+  const warnings = [];
+  const loops = [];
+  source.split('\n').forEach((text, index) => {
+    const match = text.match(/^(\s*)for \w+ in (\w+)/);
+    if (!match) return;
+    const indent = match[1].length;
+    while (loops.length && loops[loops.length - 1].indent >= indent) loops.pop();
+    const outer = loops.find((loop) => loop.names === match[2]);
+    if (outer) {
+      warnings.push({
+        line: index + 1,
+        kind: 'nested-loop',
+        message: null,
+        function: '',
+        inLoop: true,
+        names: [match[2]],
+        outerLine: outer.line
+      });
+    }
+    loops.push({ indent, names: match[2], line: index + 1 });
+  });
+  return {
+    code: source.split('\n').filter((line) => line.trim()).length,
+    comments: 0,
+    keywords: 0,
+    codeChars: source.length,
+    error: null,
+    functions: [],
+    classes: [],
+    imports: 0,
+    controlFlow: {},
+    moduleComplexity: 0,
+    moduleOrder: 0,
+    moduleLoopCalls: [],
+    warnings
+  };
+}
+
+const { analyzeSource } = await import('./codeAnalysis.js');
+
+describe('analyzeSource', () => {
+  it('cita en el aviso de bucle anidado la línea del archivo, no la del bloque', async () => {
+    const code = [
+      'import random',
+      '',
+      'def pairs(items):',
+      '    for a in items:',
+      '        for b in items:',
+      '            print(a, b)',
+      '',
+      'def grid(rows):',
+      '    total = 0',
+      '    for r in rows:',
+      '        for c in rows:',
+      '            total += r * c',
+      '    return total',
+      ''
+    ].join('\n');
+
+    const analysis = await analyzeSource(code);
+
+    expect(analysis.warnings.map(({ line, outerLine }) => [line, outerLine])).toEqual([
+      [5, 4],
+      [11, 10]
+    ]);
+    expect(analysis.warnings[1].message).toBe(
+      'Bucle anidado sobre rows, que ya recorre el bucle de la línea 10: O(n²)'
+    );
+  });
+});
@@ -0,0 +1,96 @@
+/**
+ * Servicio de autocompletado para el editor.
+ *
+ * Las sugerencias salen del intérprete (namespace de sesión + lo que
+ * define el código del editor). Las peticiones se agrupan con un pequeño
+ * debounce, una nueva cancela la anterior si aún no ha empezado, y los
+ * miembros de módulos (np., math.) se guardan en una caché LRU para no
+ * volver a pedirlos.
+ */
+
+import { completeCode, isPyodideReady } from './pyodide.js';
+
+const DEBOUNCE_DELAY = 30; // ms
+const MODULE_CACHE_SIZE = 32;
+
+// Expresión base ("np", "os.path") -> miembros del módulo; el orden es el de uso
+const moduleCache = new Map();
+let latestRequest = 0;
+let inFlight = null;
+
+/**
+ * Expresión con punto justo antes del cursor ("np.li" -> "np"), o null
+ */
+function dottedBase(linePrefix) {
+  const match = /([A-Za-z_][\w]*(?:\.[A-Za-z_]\w*)*)\.\w*$/.exec(linePrefix);
+  return match ? match[1] : null;
+}
+
+/**
+ * Lee de la caché marcando la entrada como usada recientemente
+ */
+function readCache(key) {
+  const items = moduleCache.get(key);
+  if (items) {
+    moduleCache.delete(key);
+    moduleCache.set(key, items);
+  }
+  return items || null;
+}
+
+/**
+ * Guarda los miembros de un módulo, desalojando el menos usado
+ */
+function writeCache(key, items) {
+  moduleCache.set(key, items);
+  if (moduleCache.size > MODULE_CACHE_SIZE) {
+    moduleCache.delete(moduleCache.keys().next().value);
+  }
+}
+
+/**
+ * Devuelve las sugerencias [{ label, kind }] para la posición indicada
+ * (base 1), o null si la petición quedó obsoleta o no hay intérprete.
+ *
+ * @param {string} source - Código completo del editor
+ * @param {number} line
+ * @param {number} column
+ * @param {string} linePrefix - Texto de la línea hasta el cursor
+ * @param {() => boolean} [isCancelled] - Cancelación del editor
+ */
+export async function getCompletions(source, line, column, linePrefix, isCancelled = () => false) {
+  if (!isPyodideReady()) return null;
+
+  const base = dottedBase(linePrefix);
+  const cached = base ? readCache(base) : null;
+  if (cached) return cached;
+
+  const request = ++latestRequest;
+  await new Promise((resolve) => setTimeout(resolve, DEBOUNCE_DELAY));
+  if (request !== latestRequest || isCancelled()) return null;
+
+  // La anterior ya no interesa: si sigue en cola, no llega a ejecutarse
+  if (inFlight) inFlight.abort();
+  const controller = new AbortController();
+  inFlight = controller;
+
+  try {
+    const result = await completeCode(source, line, column, { signal: controller.signal });
+    if (!result || !Array.isArray(result.items)) return null;
+    if (base && result.module) {
+      writeCache(base, result.items);
+    }
+    return request === latestRequest ? result.items : null;
+  } catch (error) {
+    return null;
+  } finally {
+    if (inFlight === controller) inFlight = null;
+  }
+}
+
+/**
+ * Olvida los miembros cacheados (p. ej. tras reiniciar el entorno)
+ */
+export function clearCompletionCache() {
+  moduleCache.clear();
+}
@@ -0,0 +1,85 @@
+/**
+ * Reproductor de frames de animación para el hilo principal.
+ *
+ * Recibe los mensajes FRAME del worker y muestra como mucho un frame por
+ * refresco de pantalla: si llegan varios entre dos refrescos, solo se
+ * muestra el último y el resto se descarta. Cada frame mostrado se
+ * confirma al worker, que así sabe cuándo debe dejar de enviar.
+ */
+
+/**
+ * Crea un reproductor de frames.
+ *
+ * @param {Object} options
+ * @param {(frame: ImageBitmap|ImageData, stats: {shown: number, dropped: number}) => void} options.onFrame
+ *   Se llama con cada frame mostrado; quien lo recibe pasa a ser su dueño (y debe cerrarlo)
+ * @param {Int32Array|null} [options.ackBuffer] - Buffer compartido para confirmar frames al worker
+ */
+export function createFramePlayer({ onFrame, ackBuffer = null }) {
+  let pending = null;
+  let shown = 0;
+  let dropped = 0;
+  let frame = null;
+
+  const scheduleFrame =
+    typeof requestAnimationFrame === 'function'
+      ? requestAnimationFrame
+      : (callback) => setTimeout(callback, 16);
+  const cancelFrame =
+    typeof cancelAnimationFrame === 'function' ? cancelAnimationFrame : clearTimeout;
+
+  /**
+   * Libera un frame que ya no se va a dibujar
+   */
+  function release(image) {
+    if (image && typeof image.close === 'function') {
+      image.close();
+    }
+  }
+
+  /**
+   * Muestra el frame más reciente y lo confirma al worker
+   */
+  function show() {
+    frame = null;
+    if (!pending) return;
+
+    const { seq, image } = pending;
+    pending = null;
+    shown++;
+    onFrame(image, { shown, dropped });
+
+    if (ackBuffer) {
+      Atomics.store(ackBuffer, 0, seq);
+      Atomics.notify(ackBuffer, 0);
+    }
+  }
+
+  /**
+   * Añade un mensaje FRAME recibido del worker
+   */
+  function push({ seq, frame: image, dropped: droppedInWorker = 0 }) {
+    dropped += droppedInWorker;
+    if (pending) {
+      release(pending.image);
+      dropped++;
+    }
+    pending = { seq, image };
+
+    if (frame === null) {
+      frame = scheduleFrame(show);
+    }
+  }
+
+  /**
+   * Muestra el último frame pendiente al terminar la ejecución
+   */
+  function close() {
+    if (frame !== null) {
+      cancelFrame(frame);
+    }
+    show();
+  }
+
+  return { push, close };
+}
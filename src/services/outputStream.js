@@ -0,0 +1,75 @@
+/**
+ * Acumulador de salida en streaming para el hilo principal.
+ *
+ * Recibe los lotes STREAM del worker y entrega a la interfaz, como mucho
+ * una vez por frame, el texto nuevo desde la entrega anterior. Quien lo
+ * recibe lo añade a un almacén de líneas, así que aquí no se descarta nada.
+ */
+
+/**
+ * Crea un stream de salida.
+ *
+ * @param {Object} options
+ * @param {(text: string, dropped: number) => void} options.onUpdate - Se llama una vez
+ *   por frame con el texto nuevo y los caracteres que el worker tuvo que descartar
+ * @param {Int32Array|null} [options.ackBuffer] - Buffer compartido para confirmar lotes al worker
+ */
+export function createOutputStream({ onUpdate, ackBuffer = null }) {
+  let chunks = [];
+  let dropped = 0;
+  let lastSeq = 0;
+  let frame = null;
+
+  const scheduleFrame =
+    typeof requestAnimationFrame === 'function'
+      ? requestAnimationFrame
+      : (callback) => setTimeout(callback, 16);
+  const cancelFrame =
+    typeof cancelAnimationFrame === 'function' ? cancelAnimationFrame : clearTimeout;
+
+  /**
+   * Entrega el texto pendiente a la interfaz y confirma el lote al worker
+   */
+  function flush() {
+    frame = null;
+    const text = chunks.join('');
+    const droppedSinceLast = dropped;
+    chunks = [];
+    dropped = 0;
+    if (text || droppedSinceLast) {
+      onUpdate(text, droppedSinceLast);
+    }
+
+    if (ackBuffer) {
+      Atomics.store(ackBuffer, 0, lastSeq);
+      Atomics.notify(ackBuffer, 0);
+    }
+  }
+
+  /**
+   * Añade un lote STREAM recibido del worker
+   */
+  function push({ seq, segments, dropped: droppedInWorker = 0 }) {
+    dropped += droppedInWorker;
+    for (const segment of segments) {
+      chunks.push(segment.text);
+    }
+    lastSeq = seq;
+
+    if (frame === null) {
+      frame = scheduleFrame(flush);
+    }
+  }
+
+  /**
+   * Fuerza el último flush al terminar la ejecución
+   */
+  function close() {
+    if (frame !== null) {
+      cancelFrame(frame);
+    }
+    flush();
+  }
+
+  return { push, close };
+}
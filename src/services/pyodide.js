@@ -1,56 +1,29 @@
 /**
  * Servicio para gestionar la carga e inicialización de Pyodide
- * con lazy loading y manejo de errores
+ * con lazy loading y manejo de errores.
+ *
+ * Los intérpretes viven en un pool de Web Workers (workerPool.js); este
+ * módulo mantiene la misma API de siempre y traduce cada llamada a una
+ * tarea del pool.
  */
 
-let pyodideInstance = null;
+import { createWorkerPool, getDefaultPoolSize, AFFINITY } from './workerPool.js';
+import { REQUEST_TYPES } from './workerProtocol.js';
+
+let pool = null;
+let isReady = false;
 let isLoading = false;
 let loadPromise = null;
 
-const PYODIDE_VERSION = '0.26.2';
-const PYODIDE_CDN = `https://cdn.jsdelivr.net/pyodide/v${PYODIDE_VERSION}/full/pyodide.js`;
-const LOAD_TIMEOUT = 60000; // 60 segundos
-
 /**
- * Carga Pyodide desde CDN con timeout
+ * Inicializa Pyodide (lazy loading).
+ *
+ * `poolSize` fija el número de workers; por defecto depende de
+ * navigator.hardwareConcurrency.
  */
-async function loadPyodideFromCDN() {
-  return new Promise((resolve, reject) => {
-    const timeout = setTimeout(() => {
-      reject(new Error('Timeout al cargar Pyodide. Verifica tu conexión a internet.'));
-    }, LOAD_TIMEOUT);
-
-    const script = document.createElement('script');
-    script.src = PYODIDE_CDN;
-    script.async = true;
-    
-    script.onload = async () => {
-      clearTimeout(timeout);
-      try {
-        const pyodide = await window.loadPyodide({
-          indexURL: `https://cdn.jsdelivr.net/pyodide/v${PYODIDE_VERSION}/full/`
-        });
-        resolve(pyodide);
-      } catch (error) {
-        reject(new Error(`Error al inicializar Pyodide: ${error.message}`));
-      }
-    };
-    
-    script.onerror = () => {
-      clearTimeout(timeout);
-      reject(new Error('Error al cargar el script de Pyodide desde CDN'));
-    };
-    
-    document.head.appendChild(script);
-  });
-}
-
-/**
- * Inicializa Pyodide (lazy loading)
- */
-export async function initializePyodide(onProgress) {
-  if (pyodideInstance) {
-    return pyodideInstance;
+export async function initializePyodide(onProgress, { poolSize = getDefaultPoolSize() } = {}) {
+  if (isReady) {
+    return pool;
   }
 
   if (isLoading) {
@@ -58,70 +31,19 @@ export async function initializePyodide(onProgress) {
   }
 
   isLoading = true;
-  
+
   loadPromise = (async () => {
     try {
-      if (onProgress) onProgress('Descargando Pyodide...');
-      
-      pyodideInstance = await loadPyodideFromCDN();
-      
-      if (onProgress) onProgress('Inicializando entorno Python...');
-      
-      // Configurar stdout/stderr personalizados
-      await pyodideInstance.runPythonAsync(`
-import sys
-from io import StringIO
-
-class OutputCapture:
-    def __init__(self):
-        self.output = []
-    
-    def write(self, text):
-        if text.strip():
-            self.output.append(text)
-    
-    def flush(self):
-        pass
-    
-    def getvalue(self):
-        return ''.join(self.output)
-
-_stdout_capture = OutputCapture()
-_stderr_capture = OutputCapture()
-sys.stdout = _stdout_capture
-sys.stderr = _stderr_capture
-      `);
-
-      // Cargar matplotlib si está disponible
-      if (onProgress) onProgress('Cargando librerías de visualización...');
-      try {
-        await pyodideInstance.loadPackage(['matplotlib', 'numpy']);
-        
-        // Configurar matplotlib para mostrar gráficos en el navegador
-        await pyodideInstance.runPythonAsync(`
-import matplotlib
-import matplotlib.pyplot as plt
-import numpy as np
-
-# Configurar backend para navegador
-matplotlib.use('module://matplotlib_pyodide.html5_canvas_backend')
-
-# Configurar para mostrar múltiples gráficos
-plt.ioff()  # Desactivar modo interactivo
-
-print("✅ Matplotlib y NumPy cargados correctamente")
-        `);
-      } catch (error) {
-        console.warn('matplotlib no disponible:', error);
-      }
-      
-      if (onProgress) onProgress('¡Pyodide listo!');
-      
+      pool = createWorkerPool({ size: poolSize, onProgress });
+      await pool.ready;
+
+      isReady = true;
       isLoading = false;
-      return pyodideInstance;
+      return pool;
     } catch (error) {
+      if (pool) pool.terminate();
+      pool = null;
       isLoading = false;
-      pyodideInstance = null;
       loadPromise = null;
       throw error;
     }
@@ -131,112 +53,146 @@ print("✅ Matplotlib y NumPy cargados correctamente")
 }
 
 /**
- * Ejecuta código Python con timeout y sandboxing
+ * Comprueba que el pool esté listo antes de encolar una tarea
  */
-export async function runPythonCode(code, timeout = 30000) {
-  if (!pyodideInstance) {
+function ensureReady() {
+  if (!isReady) {
     throw new Error('Pyodide no está inicializado. Llama a initializePyodide() primero.');
   }
+}
 
-  try {
-    // Limpiar salidas anteriores
-    await pyodideInstance.runPythonAsync(`
-_stdout_capture.output = []
-_stderr_capture.output = []
-    `);
-
-    // Ejecutar con timeout
-    const result = await Promise.race([
-      pyodideInstance.runPythonAsync(code),
-      new Promise((_, reject) => 
-        setTimeout(() => reject(new Error('Timeout: El código tardó más de ' + (timeout/1000) + ' segundos')), timeout)
-      )
-    ]);
-
-    // Capturar salidas
-    const stdout = await pyodideInstance.runPythonAsync('_stdout_capture.getvalue()');
-    const stderr = await pyodideInstance.runPythonAsync('_stderr_capture.getvalue()');
-
-    return {
-      success: true,
-      result: result,
-      stdout: stdout || '',
-      stderr: stderr || '',
-      output: (stdout || '') + (stderr || '')
-    };
-  } catch (error) {
-    // Capturar stderr incluso en error
-    let stderr = '';
-    try {
-      stderr = await pyodideInstance.runPythonAsync('_stderr_capture.getvalue()');
-    } catch (e) {
-      // Ignorar errores al capturar stderr
-    }
+/**
+ * Detiene la ejecución en curso (botón Detener)
+ */
+export function stopExecution() {
+  if (!isReady) return false;
+  return pool.stop('⏹ Ejecución detenida por el usuario');
+}
 
-    return {
-      success: false,
-      error: error.message || String(error),
-      stderr: stderr,
-      output: stderr || error.message || String(error)
-    };
-  }
+/**
+ * Ejecuta código Python con timeout y sandboxing en el namespace de sesión.
+ *
+ * Si se pasa `onOutput`, stdout/stderr llegan en streaming (un lote por
+ * frame) y el resultado final no repite la salida ya entregada.
+ * `onProgress` informa de la descarga de paquetes previa a la ejecución.
+ * Con `onFrame(frame, stats)` las animaciones (pyhub.animate o
+ * matplotlib.animation + plt.show()) se reproducen en vivo.
+ * Con `profile` ('sampling', 'deterministic' o 'memory') el resultado trae
+ * el perfil de la ejecución en `profile`. `heapSize` es el tamaño del heap
+ * de WASM del worker de sesión al terminar.
+ */
+export async function runPythonCode(
+  code,
+  timeout = 30000,
+  { onOutput, onProgress, onFrame, profile = null } = {}
+) {
+  ensureReady();
+  return pool.run({
+    type: REQUEST_TYPES.RUN,
+    payload: profile ? { code, profile } : { code },
+    timeout,
+    affinity: AFFINITY.SESSION,
+    onOutput,
+    onProgress,
+    onFrame
+  });
 }
 
 /**
- * Instala paquetes de PyPI
+ * Envía una línea a la consola interactiva del namespace de sesión.
+ *
+ * Devuelve `status`: 'incomplete' si la sentencia continúa en la línea
+ * siguiente (bloques, paréntesis abiertos...), 'syntax-error' o 'complete'
+ * junto con `result` (repr de cada expresión mostrada, una por línea)
+ * y la salida producida.
+ */
+export async function runReplLine(line, timeout = 10000) {
+  ensureReady();
+  return pool.run({
+    type: REQUEST_TYPES.REPL,
+    payload: { line },
+    timeout,
+    affinity: AFFINITY.SESSION
+  });
+}
+
+/**
+ * Pide sugerencias de autocompletado para la posición (line, column) del
+ * código, ambas en base 1. Usa el namespace de sesión si está libre.
+ */
+export async function completeCode(source, line, column, { signal } = {}) {
+  ensureReady();
+  return pool.run({
+    type: REQUEST_TYPES.COMPLETE,
+    payload: { source, line, column },
+    timeout: 2000,
+    affinity: AFFINITY.PREFER_SESSION,
+    signal
+  });
+}
+
+/**
+ * Analiza bloques de código con el módulo ast en cualquier worker libre
+ * (el análisis no depende del namespace de sesión)
+ */
+export async function analyzeBlocks(sources) {
+  ensureReady();
+  return pool.run({
+    type: REQUEST_TYPES.ANALYZE,
+    payload: { sources },
+    timeout: 5000,
+    affinity: AFFINITY.ANY
+  });
+}
+
+/**
+ * Ejecuta un harness de tests en un módulo aislado, en cualquier worker libre.
+ * `packagesFrom` es el código del usuario que envuelve el harness: de él
+ * salen los paquetes que hay que cargar antes de ejecutarlo.
+ */
+export async function runTestCode(code, timeout = 30000, { packagesFrom } = {}) {
+  ensureReady();
+  return pool.run({
+    type: REQUEST_TYPES.TEST,
+    payload: packagesFrom === undefined ? { code } : { code, packagesFrom },
+    timeout,
+    affinity: AFFINITY.ANY
+  });
+}
+
+/**
+ * Instala paquetes de PyPI en todos los workers del pool
  */
 export async function installPackage(packageName) {
-  if (!pyodideInstance) {
+  if (!isReady) {
     throw new Error('Pyodide no está inicializado');
   }
 
-  try {
-    await pyodideInstance.loadPackage('micropip');
-    await pyodideInstance.runPythonAsync(`
-import micropip
-await micropip.install('${packageName}')
-    `);
-    return { success: true, message: `Paquete '${packageName}' instalado correctamente` };
-  } catch (error) {
-    return { success: false, error: `Error al instalar '${packageName}': ${error.message}` };
-  }
+  return pool.install(packageName);
 }
 
 /**
- * Obtiene la instancia de Pyodide
+ * Obtiene el pool de workers que aloja Pyodide
  */
 export function getPyodideInstance() {
-  return pyodideInstance;
+  return pool;
 }
 
 /**
  * Verifica si Pyodide está listo
  */
 export function isPyodideReady() {
-  return pyodideInstance !== null;
+  return isReady;
 }
 
 /**
- * Limpia el entorno de Pyodide
+ * Limpia el entorno de Pyodide restaurando el snapshot del intérprete.
+ * Si la restauración falla se reemplaza el worker de sesión (que arranca
+ * desde el snapshot de memoria guardado).
  */
 export async function resetPyodide() {
-  if (pyodideInstance) {
-    try {
-      await pyodideInstance.runPythonAsync(`
-import sys
-# Limpiar variables del namespace
-for name in list(globals().keys()):
-    if not name.startswith('_') and name not in ['sys', 'StringIO', 'OutputCapture']:
-        del globals()[name]
-
-# Limpiar salidas
-_stdout_capture.output = []
-_stderr_capture.output = []
-      `);
-      return { success: true, message: 'Entorno reiniciado' };
-    } catch (error) {
-      return { success: false, error: error.message };
-    }
+  if (isReady) {
+    return pool.resetSession();
   }
   return { success: false, error: 'Pyodide no está inicializado' };
 }
@@ -0,0 +1,2039 @@
+/**
+ * Worker que aloja el intérprete de Pyodide fuera del hilo principal
+ * para que el editor y la interfaz sigan respondiendo mientras Python trabaja
+ */
+
+import {
+  PYODIDE_VERSION,
+  PYODIDE_INDEX_URL,
+  PYODIDE_MODULE_URL,
+  LOAD_TIMEOUT
+} from './pyodideConfig.js';
+import { REQUEST_TYPES, RESPONSE_TYPES, PROFILE_SIGNAL, createResponse } from './workerProtocol.js';
+import { loadSnapshot, saveSnapshot, clearSnapshots } from './snapshotStore.js';
+import pyhubInitSource from '../../pyhub/__init__.py?raw';
+import pyhubBenchmarkSource from '../../pyhub/benchmark.py?raw';
+import pyhubGraphSource from '../../pyhub/graph.py?raw';
+
+let pyodide = null;
+let initPromise = null;
+let interruptBuffer = null;
+let streamAckBuffer = null;
+
+// Streaming de salida: se envía como mucho un lote por frame
+const STREAM_FLUSH_INTERVAL = 16; // ms
+const STREAM_MAX_PENDING = 1 << 20; // caracteres retenidos en el worker entre lotes
+const STREAM_MAX_IN_FLIGHT = 8; // lotes sin confirmar antes de frenar a Python
+let activeStream = null;
+
+// Animaciones: Python envía frames RGBA a un ritmo objetivo. Si el hilo
+// principal no ha mostrado los anteriores, el frame se descarta antes de
+// rasterizarse para que la simulación no se quede atrás.
+const FRAME_MAX_IN_FLIGHT = 2; // frames enviados sin confirmar
+let frameAckBuffer = null;
+let activeFrames = null;
+
+// Proxies de los helpers de Python, obtenidos una vez tras el arranque
+let runHooks = null;
+
+// Carga perezosa de paquetes: solo se descargan los que importa el código
+let findImports = null;
+const checkedImports = new Set();
+let matplotlibConfigured = false;
+// Cargas en curso: se encadenan para que dos peticiones no configuren matplotlib a la vez
+let packagesInFlight = Promise.resolve();
+
+// Figuras ya rasterizadas, por hash del código + hash del contenido de la figura.
+// Una re-ejecución que produce la misma figura no vuelve a dibujarla.
+const FIGURE_CACHE_SIZE = 32;
+const figureCache = new Map(); // clave -> ImageBitmap (orden = uso reciente)
+let currentCodeHash = '';
+
+// Paquete pyhub (pyhub/ en la raíz del repo): se escribe en site-packages
+// en cada arranque, también al restaurar un snapshot, que no guarda el FS
+const PYHUB_FILES = {
+  '__init__.py': pyhubInitSource,
+  'benchmark.py': pyhubBenchmarkSource,
+  'graph.py': pyhubGraphSource
+};
+
+const STDIO_SETUP = `
+import os
+import sys
+import types
+from io import StringIO
+
+# El worker no tiene DOM: matplotlib debe usar Agg desde el primer import
+os.environ['MPLBACKEND'] = 'Agg'
+
+class OutputCapture:
+    def __init__(self, name):
+        self.name = name
+        self.output = []
+        self.sink = None
+
+    def write(self, text):
+        # En modo streaming el texto va directo al worker sin acumularse
+        if self.sink is not None:
+            self.sink(self.name, text)
+        elif text:
+            self.output.append(text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        return ''.join(self.output)
+
+_stdout_capture = OutputCapture('stdout')
+_stderr_capture = OutputCapture('stderr')
+sys.stdout = _stdout_capture
+sys.stderr = _stderr_capture
+
+def _set_stream_sink(sink):
+    _stdout_capture.sink = sink
+    _stderr_capture.sink = sink
+
+# Figuras generadas con plt.show(): {'key': hash o None, 'png': bytes o None si está en caché}
+_figures = []
+
+# Animaciones de matplotlib creadas en la ejecución actual, pendientes de plt.show()
+_pending_animations = []
+
+def _begin_run():
+    _stdout_capture.output = []
+    _stderr_capture.output = []
+    _figures.clear()
+    _pending_animations.clear()
+
+def _end_run():
+    # Todo lo producido por la ejecución en un único dict (una sola llamada desde JS)
+    result = {
+        'stdout': _stdout_capture.getvalue(),
+        'stderr': _stderr_capture.getvalue(),
+        'figures': list(_figures),
+    }
+    _begin_run()
+    return result
+
+def _new_test_namespace():
+    module = types.ModuleType('_pyhub_tests')
+    sys.modules['_pyhub_tests'] = module
+    return module.__dict__
+
+def _drop_test_namespace():
+    sys.modules.pop('_pyhub_tests', None)
+
+# Destino de los frames de animación: objeto JS con ready(fps) y send(width, height, rgba)
+_frame_sink = None
+
+def _set_frame_sink(sink):
+    global _frame_sink
+    _frame_sink = sink
+
+def _frame_to_rgba(frame):
+    # Figura de matplotlib: se rasteriza aquí, solo si el frame se va a mostrar
+    canvas = getattr(frame, 'canvas', None)
+    if canvas is not None and hasattr(canvas, 'buffer_rgba'):
+        canvas.draw()
+        buffer = memoryview(canvas.buffer_rgba())
+        height, width = buffer.shape[:2]
+        return width, height, buffer.tobytes()
+
+    import numpy as np
+    array = np.asarray(frame)
+    if array.ndim == 2:
+        # Escala de grises normalizada a su rango, como imshow
+        low, high = float(array.min()), float(array.max())
+        scaled = (array - low) * (255.0 / (high - low)) if high > low else np.zeros(array.shape)
+        gray = scaled.astype(np.uint8)
+        alpha = np.full(array.shape, 255, np.uint8)
+        array = np.stack([gray, gray, gray, alpha], axis=-1)
+    else:
+        if array.dtype.kind == 'f':
+            array = np.clip(array, 0.0, 1.0) * 255
+        array = np.clip(array, 0, 255).astype(np.uint8)
+        if array.shape[2] == 3:
+            alpha = np.full(array.shape[:2] + (1,), 255, np.uint8)
+            array = np.concatenate([array, alpha], axis=-1)
+    height, width = array.shape[:2]
+    return width, height, np.ascontiguousarray(array).tobytes()
+
+def _animate(frames, fps=24):
+    """Muestra en vivo los frames de un iterable a fps frames por segundo.
+
+    Cada frame puede ser un array de numpy (HxW, HxWx3 o HxWx4) o una
+    figura de matplotlib. El iterable se consume a medida que se muestra:
+    si produce más rápido que la pantalla, se espera; si la pantalla va
+    por detrás, los frames sobrantes se descartan sin rasterizarse. Sin
+    pantalla (p. ej. en tests) los frames se consumen sin mostrarse.
+    """
+    for frame in frames:
+        sink = _frame_sink
+        if sink is None or not sink.ready(fps):
+            continue
+        width, height, data = _frame_to_rgba(frame)
+        sink.send(width, height, data)
+
+# pyhub (benchmark, graph...) viene de site-packages; animate
+# depende del canal de frames del worker y se añade aquí
+import pyhub as _pyhub_module
+_pyhub_module.animate = _animate
+
+class _Repl:
+    """Consola interactiva sobre el namespace de sesión.
+
+    Compila de forma incremental (codeop conserva los __future__ entre
+    líneas) y ejecuta cada línea completa con una sola llamada desde JS.
+    Solo el código con await de nivel superior pasa por el event loop.
+    """
+
+    REPR_LIMIT = 10000
+
+    def __init__(self, namespace):
+        import ast
+        import codeop
+        self.namespace = namespace
+        self.buffer = []
+        self.compile = codeop.CommandCompiler()
+        self.compile.compiler.flags |= ast.PyCF_ALLOW_TOP_LEVEL_AWAIT
+
+    def reset(self):
+        self.buffer = []
+
+    def push(self, line):
+        self.buffer.append(line)
+        source = '\\n'.join(self.buffer)
+        try:
+            code = self.compile(source, '<consola>', 'single')
+        except (OverflowError, SyntaxError, ValueError) as error:
+            self.buffer = []
+            return self._reply('syntax-error', error=self._format_syntax_error(error))
+        if code is None:
+            return self._reply('incomplete')
+        self.buffer = []
+        _begin_run()
+
+        if code.co_flags & 0x80:  # CO_COROUTINE: hay await de nivel superior
+            import asyncio
+            return asyncio.ensure_future(self._run_async(code))
+        return self._run(lambda: exec(code, self.namespace))
+
+    async def _run_async(self, code):
+        result = eval(code, self.namespace)
+        shown = []
+        try:
+            with self._display(shown):
+                await result
+        except BaseException as error:
+            return self._reply('complete', error=self._format_error(error))
+        return self._reply('complete', value=shown)
+
+    def _run(self, execute):
+        shown = []
+        try:
+            with self._display(shown):
+                execute()
+        except BaseException as error:
+            return self._reply('complete', error=self._format_error(error))
+        return self._reply('complete', value=shown)
+
+    def _display(self, shown):
+        # En modo 'single' las expresiones pasan por sys.displayhook
+        import builtins
+        import contextlib
+
+        # Como code.InteractiveConsole: se muestran todas las expresiones
+        # (1; 2 muestra las dos), no solo la última. Se guardan sus repr y no
+        # los objetos, con un límite conjunto para bucles que muestran mucho.
+        used = 0
+
+        def hook(value):
+            nonlocal used
+            if value is None:
+                return
+            builtins._ = value
+            if used >= self.REPR_LIMIT:
+                return
+            text = repr(value)
+            if used + len(text) > self.REPR_LIMIT:
+                text = text[:self.REPR_LIMIT - used] + '...'
+            used += len(text)
+            shown.append(text)
+
+        @contextlib.contextmanager
+        def installed():
+            previous = sys.displayhook
+            sys.displayhook = hook
+            try:
+                yield
+            finally:
+                sys.displayhook = previous
+
+        return installed()
+
+    def _reply(self, status, value=None, error=None):
+        result = '\\n'.join(value) if value else None
+        reply = _end_run() if status == 'complete' else {'stdout': '', 'stderr': '', 'figures': []}
+        reply.update({'status': status, 'result': result, 'error': error})
+        return reply
+
+    def _format_syntax_error(self, error):
+        import traceback
+        return ''.join(traceback.format_exception_only(type(error), error))
+
+    def _format_error(self, error):
+        import traceback
+        # Se omite el frame de la consola: el traceback empieza en <consola>
+        tb = error.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != '<consola>':
+            tb = tb.tb_next
+        return ''.join(traceback.format_exception(type(error), error, tb))
+
+_repl = _Repl(globals())
+
+def _repl_push(line):
+    return _repl.push(line)
+`;
+
+// Autocompletado: combina el namespace vivo con lo que define el código del editor
+const COMPLETION_SETUP = `
+import re
+import functools
+
+_COMPLETION_LIMIT = 1000
+_MISSING = object()
+_DOTTED_RE = re.compile(r'([A-Za-z_][\\w]*(?:\\.[A-Za-z_]\\w*)*)\\.(\\w*)$')
+
+def _member_kind(value):
+    import inspect
+    if inspect.ismodule(value):
+        return 'module'
+    if inspect.isclass(value):
+        return 'class'
+    if callable(value):
+        return 'function'
+    return 'variable'
+
+def _members(obj):
+    items = []
+    for name in dir(obj):
+        try:
+            kind = _member_kind(getattr(obj, name))
+        except Exception:
+            kind = 'variable'
+        items.append({'label': name, 'kind': kind})
+    return items
+
+@functools.lru_cache(maxsize=64)
+def _module_members(name):
+    # Listar un módulo grande (numpy) cuesta milisegundos: se hace una vez
+    import sys
+    return tuple(_members(sys.modules[name]))
+
+def _import_if_available(name):
+    # Solo módulos ya cargados o instalados: nunca descargar al completar
+    import sys
+    import importlib
+    import importlib.util
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        if importlib.util.find_spec(name.split('.')[0]) is None:
+            return None
+        return importlib.import_module(name)
+    except Exception:
+        return None
+
+class _SourceIndex:
+    """Nombres que define el código del editor, aunque aún no se haya ejecutado"""
+
+    def __init__(self, source, line):
+        import ast
+        self.aliases = {}    # alias -> módulo importado
+        self.classes = {}    # clase -> miembros (métodos y atributos self.x)
+        self.instances = {}  # variable -> clase, para x = Clase(...)
+        self.names = {}      # nombre de nivel superior -> tipo
+        self.enclosing_class = None
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            return
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    self.aliases[alias.asname or alias.name.split('.')[0]] = (
+                        alias.name if alias.asname else alias.name.split('.')[0]
+                    )
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                for alias in node.names:
+                    self.aliases[alias.asname or alias.name] = f'{node.module}.{alias.name}'
+            elif isinstance(node, ast.ClassDef):
+                self.classes[node.name] = self._class_members(node)
+                end = getattr(node, 'end_lineno', node.lineno)
+                if node.lineno <= line <= end:
+                    self.enclosing_class = node.name
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.names[node.name] = 'function'
+            elif isinstance(node, ast.ClassDef):
+                self.names[node.name] = 'class'
+            elif isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        self.names[target.id] = 'variable'
+                        call = node.value
+                        if isinstance(call, ast.Call) and isinstance(call.func, ast.Name):
+                            self.instances[target.id] = call.func.id
+        for alias in self.aliases:
+            self.names.setdefault(alias, 'module')
+
+    def _class_members(self, node):
+        import ast
+        members = {}
+        for item in node.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                members[item.name] = 'function'
+                for child in ast.walk(item):
+                    if (isinstance(child, ast.Attribute) and isinstance(child.ctx, ast.Store)
+                            and isinstance(child.value, ast.Name) and child.value.id == 'self'):
+                        members.setdefault(child.attr, 'variable')
+            elif isinstance(item, ast.Assign):
+                for target in item.targets:
+                    if isinstance(target, ast.Name):
+                        members[target.id] = 'variable'
+        return members
+
+_last_source_index = [None, None]  # (clave, índice) del último código analizado
+
+def _source_index(lines, line):
+    # Mientras se escribe, la línea actual suele estar incompleta: se sustituye
+    # por un pass con su sangría. Así el índice solo cambia cuando cambian
+    # las demás líneas y se reutiliza en cada pulsación.
+    current = lines[line - 1] if 0 < line <= len(lines) else ''
+    indent = current[:len(current) - len(current.lstrip())]
+    key = (line, '\\n'.join(lines[:line - 1] + [indent + 'pass'] + lines[line:]))
+    if _last_source_index[0] != key:
+        _last_source_index[:] = [key, _SourceIndex(key[1], line)]
+    return _last_source_index[1]
+
+@functools.lru_cache(maxsize=1)
+def _global_names():
+    import keyword
+    import builtins
+    names = {name: 'keyword' for name in keyword.kwlist}
+    names.update({name: _member_kind(getattr(builtins, name)) for name in dir(builtins)
+                  if not name.startswith('_')})
+    return names
+
+def _resolve_live(namespace, expression):
+    parts = expression.split('.')
+    if parts[0] not in namespace:
+        return None
+    value = namespace[parts[0]]
+    for part in parts[1:]:
+        try:
+            value = getattr(value, part)
+        except Exception:
+            return None
+    return value
+
+def _complete(source, line, column, namespace):
+    """Sugerencias para la posición (line, column), ambas en base 1.
+
+    Devuelve {'items': [{'label', 'kind'}], 'module': nombre o None};
+    'module' indica que las sugerencias son los miembros de ese módulo y
+    se pueden cachear en el hilo principal.
+    """
+    lines = source.split('\\n')
+    prefix = lines[line - 1][:column - 1] if 0 < line <= len(lines) else ''
+    index = _source_index(lines, line)
+
+    match = _DOTTED_RE.search(prefix)
+    if match is None:
+        # Lo que dejó el setup del intérprete (os, sys...) no es del usuario
+        setup = _restore_interpreter.snapshot['globals']
+        items = dict(_global_names())
+        items.update({name: _member_kind(value) for name, value in namespace.items()
+                      if not name.startswith('_') and setup.get(name, _MISSING) is not value})
+        items.update(index.names)
+        return {'items': [{'label': k, 'kind': v} for k, v in items.items()], 'module': None}
+
+    import sys
+    import inspect
+    expression = match.group(1)
+
+    # 1. Valor real en el namespace de sesión (lo ya ejecutado)
+    value = _resolve_live(namespace, expression)
+
+    # 2. Módulo importado en el código del editor
+    if value is None and expression.split('.')[0] in index.aliases:
+        root, *rest = expression.split('.')
+        value = _import_if_available(index.aliases[root])
+        for part in rest:
+            value = getattr(value, part, None) if value is not None else None
+
+    if value is not None:
+        if inspect.ismodule(value) and value.__name__ in sys.modules:
+            items = list(_module_members(value.__name__))
+            return {'items': items[:_COMPLETION_LIMIT], 'module': value.__name__}
+        return {'items': _members(value)[:_COMPLETION_LIMIT], 'module': None}
+
+    # 3. Clases definidas en el código: Clase., instancia. y self.
+    class_name = None
+    if expression == 'self':
+        class_name = index.enclosing_class
+    elif expression in index.classes:
+        class_name = expression
+    elif expression in index.instances:
+        class_name = index.instances[expression]
+    members = index.classes.get(class_name, {})
+    return {'items': [{'label': k, 'kind': v} for k, v in members.items()], 'module': None}
+`;
+
+// Análisis estático por bloques de nivel superior (CodeAnalyzer): cada
+// bloque se parsea por separado para poder reutilizar los que no cambian.
+const ANALYSIS_SETUP = `
+import ast
+import io
+import keyword
+import tokenize
+
+_ANALYSIS_KEYWORDS = frozenset(k for k in keyword.kwlist if k.islower())
+_NON_CODE_TOKENS = frozenset((
+    tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.INDENT,
+    tokenize.DEDENT, tokenize.ENCODING, tokenize.ENDMARKER,
+))
+# Envoltorios que no cambian qué colección recorre un bucle
+_ITER_WRAPPERS = frozenset(('range', 'len', 'enumerate', 'zip', 'reversed', 'sorted', 'list'))
+_LIST_FACTORIES = frozenset(('list', 'sorted'))
+
+def _decisions(node):
+    # Puntos de decisión de McCabe que aporta el propio nodo
+    if isinstance(node, (ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While,
+                         ast.ExceptHandler, ast.match_case)):
+        return 1
+    if isinstance(node, ast.BoolOp):
+        return len(node.values) - 1
+    if isinstance(node, ast.comprehension):
+        return 1 + len(node.ifs)
+    return 0
+
+def _dotted(node):
+    # 'self.rows' para self.rows; None si no es un nombre con puntos
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+def _iter_names(node):
+    # Nombres de los que depende el tamaño de lo que se recorre
+    # (graph[node] es otra colección; arr[i:] sigue siendo arr)
+    names = set()
+    stack = [node]
+    while stack:
+        child = stack.pop()
+        if isinstance(child, ast.Subscript) and not isinstance(child.slice, ast.Slice):
+            continue
+        name = _dotted(child)
+        if name is not None:
+            if name not in _ITER_WRAPPERS:
+                names.add(name)
+            continue
+        stack.extend(ast.iter_child_nodes(child))
+    return names
+
+def _is_range(node):
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id == 'range' and bool(node.args))
+
+def _is_constant(node):
+    # range(9), [(0, 1), (1, 0)]...: recorridos de tamaño fijo
+    if _is_range(node):
+        args = node.args
+        if all(isinstance(arg, (ast.Constant, ast.UnaryOp)) for arg in args):
+            return True
+        # range(x, x + 3)
+        stop = args[1] if len(args) > 1 else None
+        return (isinstance(stop, ast.BinOp) and isinstance(stop.op, ast.Add)
+                and isinstance(stop.right, ast.Constant)
+                and ast.dump(stop.left) == ast.dump(args[0]))
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return all(isinstance(elt, (ast.Constant, ast.Tuple, ast.UnaryOp)) for elt in node.elts)
+    return isinstance(node, ast.Constant)
+
+def _builds_list(node):
+    return isinstance(node, (ast.List, ast.ListComp)) or (
+        isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+        and node.func.id in _LIST_FACTORIES)
+
+class _Scope:
+    # Estado de una función (o del módulo) mientras se recorre
+    def __init__(self, name, method=False):
+        self.name = name
+        self.method = method
+        self.decisions = 0
+        self.loops = []  # (línea, nombres recorridos o None si es fijo, variables)
+        self.degree = 0  # bucles de tamaño variable anidados (n^degree)
+        self.lists = set()
+        self.loop_calls = set()
+        self.recursive = False
+
+    def sized_loops(self):
+        return sum(1 for _, names, _ in self.loops if names is not None)
+
+class _BlockAnalyzer(ast.NodeVisitor):
+    def __init__(self):
+        self.functions = []
+        self.classes = []
+        self.imports = 0
+        self.flow = dict.fromkeys((
+            'forLoops', 'whileLoops', 'ifStatements', 'elifStatements',
+            'elseStatements', 'tryBlocks', 'exceptBlocks'), 0)
+        self.warnings = []
+        self.path = []
+        self.in_class = False
+        self.scopes = [_Scope('')]
+
+    @property
+    def scope(self):
+        return self.scopes[-1]
+
+    def visit(self, node):
+        self.scope.decisions += _decisions(node)
+        return super().visit(node)
+
+    def warn(self, node, kind, message=None, **details):
+        # Las operaciones O(n) cuentan como un bucle más. Los avisos con
+        # líneas en details llevan el mensaje vacío: lo compone codeAnalysis.js
+        # una vez pasadas las líneas del bloque a líneas del archivo
+        scope = self.scope
+        scope.degree = max(scope.degree, scope.sized_loops() + 1)
+        self.warnings.append(dict(details, **{
+            'line': node.lineno,
+            'kind': kind,
+            'message': message,
+            'function': scope.name,
+            'inLoop': bool(scope.loops),
+        }))
+
+    def _visit_function(self, node):
+        name = '.'.join(self.path + [node.name])
+        self.scopes.append(_Scope(name, method=self.in_class))
+        self._visit_scope(node, in_class=False)
+        scope = self.scopes.pop()
+        self.functions.append({
+            'name': name,
+            'line': node.lineno,
+            'endLine': node.end_lineno,
+            'method': scope.method,
+            'complexity': 1 + scope.decisions,
+            'order': scope.degree,
+            'recursive': scope.recursive,
+            'loopCalls': sorted(scope.loop_calls),
+        })
+
+    visit_FunctionDef = visit_AsyncFunctionDef = _visit_function
+
+    def visit_ClassDef(self, node):
+        self.classes.append(node.name)
+        self._visit_scope(node, in_class=True)
+
+    def _visit_scope(self, node, in_class):
+        outer = self.in_class
+        self.path.append(node.name)
+        self.in_class = in_class
+        self.generic_visit(node)
+        self.path.pop()
+        self.in_class = outer
+
+    def visit_Import(self, node):
+        self.imports += 1
+
+    visit_ImportFrom = visit_Import
+
+    def _enter_loop(self, node, names, iterable=None, target=None):
+        scope = self.scope
+        if names:
+            for line, outer_names, outer_targets in scope.loops:
+                shared = (names & (outer_names or set())) - outer_targets
+                # Un range() que no depende del bucle exterior es una cuadrícula, no pares
+                if shared and (names & outer_targets or not _is_range(iterable)):
+                    self.warn(node, 'nested-loop', names=sorted(shared), outerLine=line)
+                    break
+        targets = _iter_names(target) if target is not None else set()
+        scope.loops.append((node.lineno, names, targets))
+        scope.degree = max(scope.degree, scope.sized_loops())
+
+    def _visit_loop(self, node, counter):
+        self.flow[counter] += 1
+        if isinstance(node, ast.While):
+            # Sin colección que recorrer: se da por de tamaño variable
+            self._enter_loop(node, _iter_names(node.test))
+            self.visit(node.test)
+        else:
+            self.visit(node.iter)
+            names = None if _is_constant(node.iter) else _iter_names(node.iter)
+            self._enter_loop(node, names, node.iter, node.target)
+            self.visit(node.target)
+        for child in node.body:
+            self.visit(child)
+        self.scope.loops.pop()
+        if node.orelse:
+            self.flow['elseStatements'] += 1
+        for child in node.orelse:
+            self.visit(child)
+
+    def visit_For(self, node):
+        self._visit_loop(node, 'forLoops')
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node):
+        self._visit_loop(node, 'whileLoops')
+
+    def _visit_comprehension(self, node):
+        # Cada for de la comprensión es un bucle; el elemento se evalúa dentro
+        for generator in node.generators:
+            self.scope.decisions += _decisions(generator)
+            self.visit(generator.iter)
+            names = None if _is_constant(generator.iter) else _iter_names(generator.iter)
+            self._enter_loop(generator.iter, names, generator.iter, generator.target)
+            self.visit(generator.target)
+            for condition in generator.ifs:
+                self.visit(condition)
+        for field in ('elt', 'key', 'value'):
+            child = getattr(node, field, None)
+            if child is not None:
+                self.visit(child)
+        del self.scope.loops[-len(node.generators):]
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _visit_comprehension
+
+    def visit_Assign(self, node):
+        self.generic_visit(node)
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                if _builds_list(node.value):
+                    self.scope.lists.add(target.id)
+                else:
+                    self.scope.lists.discard(target.id)
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        scope = self.scope
+        for op, comparator in zip(node.ops, node.comparators):
+            if not isinstance(op, (ast.In, ast.NotIn)):
+                continue
+            if isinstance(comparator, ast.ListComp):
+                self.warn(node, 'list-membership',
+                          "'in' sobre una lista por comprensión la construye entera en cada "
+                          "comprobación: usa any(...) o un set")
+            elif isinstance(comparator, ast.Name) and comparator.id in scope.lists and scope.loops:
+                self.warn(node, 'list-membership',
+                          "'%s' es una lista: cada 'in' dentro del bucle la recorre entera; "
+                          "usa un set" % comparator.id)
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if not isinstance(node.op, ast.Add) or not self.scope.loops:
+            return
+        for copied, added in ((node.left, node.right), (node.right, node.left)):
+            name = _dotted(copied)
+            if name is not None and isinstance(added, (ast.List, ast.ListComp)):
+                self.warn(node, 'list-copy',
+                          '%s + [...] copia la lista entera en cada iteración' % name)
+                break
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        scope = self.scope
+        func = node.func
+        if isinstance(func, ast.Name):
+            called = func.id
+        elif isinstance(func, ast.Attribute) and _dotted(func.value) == 'self':
+            called = func.attr
+        else:
+            return
+        if (called == scope.name.rpartition('.')[2]
+                and scope.method == isinstance(func, ast.Attribute)):
+            scope.recursive = True
+        if scope.loops:
+            scope.loop_calls.add(called)
+
+    def visit_If(self, node, elif_=False):
+        self.flow['elifStatements' if elif_ else 'ifStatements'] += 1
+        self.visit(node.test)
+        for child in node.body:
+            self.visit(child)
+        orelse = node.orelse
+        # elif es un If solo en el orelse y a la misma altura que el if
+        if (len(orelse) == 1 and isinstance(orelse[0], ast.If)
+                and orelse[0].col_offset == node.col_offset):
+            self.scope.decisions += 1
+            self.visit_If(orelse[0], elif_=True)
+            return
+        if orelse:
+            self.flow['elseStatements'] += 1
+        for child in orelse:
+            self.visit(child)
+
+    def visit_Try(self, node):
+        self.flow['tryBlocks'] += 1
+        self.flow['exceptBlocks'] += len(node.handlers)
+        if node.orelse:
+            self.flow['elseStatements'] += 1
+        self.generic_visit(node)
+
+    visit_TryStar = visit_Try
+
+def _line_stats(source):
+    code_lines = set()
+    comment_lines = set()
+    keywords = 0
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            if token.type == tokenize.COMMENT:
+                comment_lines.add(token.start[0])
+            elif token.type not in _NON_CODE_TOKENS:
+                code_lines.update(range(token.start[0], token.end[0] + 1))
+                if token.type == tokenize.NAME and token.string in _ANALYSIS_KEYWORDS:
+                    keywords += 1
+    except (tokenize.TokenError, SyntaxError):
+        pass
+    lines = source.split('\\n')
+    return {
+        'code': len(code_lines),
+        'comments': len(comment_lines - code_lines),
+        'codeChars': sum(len(lines[n - 1]) for n in code_lines if n <= len(lines)),
+        'keywords': keywords,
+    }
+
+def _analyze_block(source):
+    result = _line_stats(source)
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as error:
+        result['error'] = {'line': error.lineno or 1, 'message': error.msg}
+        return result
+    analyzer = _BlockAnalyzer()
+    analyzer.visit(tree)
+    module = analyzer.scope
+    result.update(
+        error=None,
+        functions=analyzer.functions,
+        classes=analyzer.classes,
+        imports=analyzer.imports,
+        controlFlow=analyzer.flow,
+        moduleComplexity=module.decisions,
+        moduleOrder=module.degree,
+        moduleLoopCalls=sorted(module.loop_calls),
+        warnings=analyzer.warnings,
+    )
+    return result
+
+def _analyze_blocks(sources):
+    return [_analyze_block(source) for source in sources]
+`;
+
+// Perfilador de las ejecuciones en modo Perfil (muestreo, cProfile o memoria)
+const PROFILE_SETUP = `
+import collections
+import functools
+import signal
+import time
+
+_PROFILE_SOURCE = '<exec>'  # nombre de archivo del código del editor
+_PYHUB_DIR = _pyhub_module.__path__[0] + '/'
+_PROFILE_TOP = 200
+_PROFILE_MAX_DEPTH = 64
+_PROFILE_MAX_NODES = 2000
+_MEMORY_FRAMES = 10  # marcos por asignación: casi siempre llegan al código del editor
+_MEMORY_TOP = 20
+_MEMORY_MIN_SNAPSHOT = 1 << 20  # bytes a partir de los que se fotografía el pico
+_MEMORY_STEP = 1.25  # crecimiento sobre la última foto que justifica otra
+_MEMORY_SOURCE = '<pyhub>'  # archivo del vigilante, para no contar sus asignaciones
+
+class _Profiler:
+    # Perfil de una ejecución. 'sampling': el hilo principal escribe una señal
+    # en el buffer de interrupción cada pocos ms y el manejador anota la pila;
+    # 'deterministic': cProfile cuenta todas las llamadas; 'memory': tracemalloc
+    # sigue las asignaciones y la misma señal vigila el pico.
+
+    def __init__(self):
+        self.mode = None
+        self._setup_codes = None
+
+    def start(self, mode, signum):
+        self.mode = mode
+        self.stacks = {}
+        self.started = time.perf_counter()
+        if mode == 'memory':
+            self._start_memory(signum)
+        elif mode == 'deterministic':
+            import cProfile
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self.signum = signum
+            self.previous = signal.signal(signum, self._sample)
+
+    def stop(self):
+        elapsed = (time.perf_counter() - self.started) * 1000
+        mode, self.mode = self.mode, None
+        if mode == 'memory':
+            signal.signal(self.signum, self.previous or signal.SIG_DFL)
+            report = self._memory_report()
+        elif mode == 'deterministic':
+            self.profile.disable()
+            report = self._deterministic_report()
+            self.profile = None
+        else:
+            signal.signal(self.signum, self.previous or signal.SIG_DFL)
+            report = self._sampling_report(elapsed)
+        self.stacks = {}
+        report.update(mode=mode, duration=elapsed)
+        return report
+
+    def _start_memory(self, signum):
+        import gc
+        import tracemalloc
+        gc.collect()
+        self.objects = collections.Counter(map(type, gc.get_objects()))
+        self.peak_snapshot = None
+        self.peak_size = 0  # memoria trazada cuando se tomó peak_snapshot
+        self.watching = False
+        self.signum = signum
+        self.previous = signal.signal(signum, self._watch_memory)
+        tracemalloc.start(_MEMORY_FRAMES)
+
+    def _watch_memory(self, signum, frame):
+        # Se fotografía la memoria cada vez que crece un 25 % sobre la foto
+        # anterior: la última queda cerca del pico aunque luego se libere.
+        # Las fotos no se trazan, así que no inflan las medidas siguientes.
+        import tracemalloc
+        if self.watching:
+            return  # la señal llegó mientras se tomaba la foto
+        current = tracemalloc.get_traced_memory()[0]
+        if current < _MEMORY_MIN_SNAPSHOT or current < self.peak_size * _MEMORY_STEP:
+            return
+        self.watching = True
+        try:
+            self.peak_snapshot = tracemalloc.take_snapshot()
+            self.peak_size = current
+        finally:
+            self.watching = False
+
+    def _memory_report(self):
+        import gc
+        import tracemalloc
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        retained = _memory_by_line(snapshot)
+        if self.peak_snapshot is not None and self.peak_size > current:
+            at_peak = _memory_by_line(self.peak_snapshot)
+        else:
+            at_peak = retained
+        self.peak_snapshot = snapshot = None
+
+        # Contenedores (listas, dicts, instancias...) creados y no liberados
+        after = collections.Counter(map(type, gc.get_objects()))
+        after[collections.Counter] -= 1  # self.objects
+        survivors = [
+            {'type': _type_name(kind), 'count': count - self.objects.get(kind, 0)}
+            for kind, count in after.items() if count > self.objects.get(kind, 0)
+        ]
+        survivors.sort(key=lambda entry: -entry['count'])
+        self.objects = None
+        return {
+            'peak': peak,
+            'current': current,
+            'allocations': at_peak,
+            'retained': retained,
+            'survivors': survivors[:_MEMORY_TOP],
+        }
+
+    def _sample(self, signum, frame):
+        # Solo se guarda la pila en crudo: el trabajo se hace en el informe
+        stack = []
+        while frame is not None:
+            stack.append((frame.f_code, frame.f_lasti))
+            frame = frame.f_back
+        key = tuple(stack)
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def _is_setup(self, code):
+        # Funciones del propio entorno (captura de stdout, etc.)
+        if self._setup_codes is None:
+            self._setup_codes = set()
+            for value in _restore_interpreter.snapshot['globals'].values():
+                members = vars(value).values() if isinstance(value, type) else (value,)
+                for member in members:
+                    code_object = getattr(member, '__code__', None)
+                    if code_object is not None:
+                        self._setup_codes.add(code_object)
+        return code in self._setup_codes
+
+    def _label(self, code):
+        if code.co_filename == _PROFILE_SOURCE:
+            where = 'pyhub' if self._is_setup(code) else 'main.py'
+        elif code.co_filename.startswith(_PYHUB_DIR):
+            where = 'pyhub'
+        else:
+            where = code.co_filename.rsplit('/', 1)[-1]
+        return code.co_qualname, where
+
+    def _user_stack(self, raw):
+        # De la raíz a la hoja, empezando en el módulo del usuario
+        for index in range(len(raw) - 1, -1, -1):
+            code = raw[index][0]
+            if code.co_filename == _PROFILE_SOURCE and code.co_name == '<module>':
+                return [(code, _instruction_line(code, lasti))
+                        for code, lasti in raw[index::-1][:_PROFILE_MAX_DEPTH]]
+        return None
+
+    def _sampling_report(self, elapsed):
+        total = sum(self.stacks.values())
+        per_sample = elapsed / total if total else 0
+        functions = {}
+        lines = {}
+        root = {'name': '<programa>', 'file': 'main.py', 'value': 0, 'children': {}}
+        for raw, count in self.stacks.items():
+            stack = self._user_stack(raw)
+            if not stack:
+                continue
+            ms = count * per_sample
+            root['value'] += ms
+            node = root
+            seen = set()
+            user_line = None
+            for depth, (code, line) in enumerate(stack):
+                label = self._label(code)
+                entry = functions.setdefault(label, {
+                    'name': label[0], 'file': label[1], 'line': code.co_firstlineno,
+                    'self': 0.0, 'total': 0.0, 'calls': None,
+                })
+                if label not in seen:
+                    seen.add(label)
+                    entry['total'] += ms
+                if label[1] == 'main.py':
+                    user_line = line
+                if depth == 0:
+                    continue  # el módulo es la raíz del flame graph
+                child = node['children'].get(label)
+                if child is None:
+                    child = node['children'][label] = {
+                        'name': label[0], 'file': label[1], 'value': 0, 'children': {}}
+                child['value'] += ms
+                node = child
+            functions[self._label(stack[-1][0])]['self'] += ms
+            lines[user_line] = lines.get(user_line, 0) + ms
+        return {
+            'samples': total,
+            'functions': _profile_top(functions.values()),
+            'lines': sorted(({'line': line, 'time': ms} for line, ms in lines.items()),
+                            key=lambda item: -item['time'])[:_PROFILE_TOP],
+            'flame': _flame_lists(root, root['value'] / 1000),
+        }
+
+    def _deterministic_report(self):
+        import pstats
+        stats = pstats.Stats(self.profile).stats
+        labels = {}
+        for key in stats:
+            filename, line, name = key
+            if '/_pyodide/' in filename or '/pyodide/' in filename or '_lsprof' in name:
+                continue
+            if filename == _PROFILE_SOURCE:
+                where = 'main.py'
+            elif filename == '~':
+                where = 'builtins'
+            else:
+                where = filename.rsplit('/', 1)[-1]
+            labels[key] = (name, where)
+
+        # Lo que hay por encima del módulo del usuario (el exec de Pyodide) sobra
+        root_key = next((key for key, label in labels.items()
+                         if label == ('<module>', 'main.py')), None)
+        pending = [root_key] if root_key is not None else []
+        while pending:
+            for caller in stats[pending.pop()][4]:
+                if caller in labels:
+                    del labels[caller]
+                    pending.append(caller)
+
+        functions = []
+        children = {}
+        for key, (cc, nc, tt, ct, callers) in stats.items():
+            if key not in labels:
+                continue
+            name, where = labels[key]
+            functions.append({
+                'name': name, 'file': where, 'line': key[1],
+                'self': tt * 1000, 'total': ct * 1000, 'calls': nc,
+            })
+            for caller, edge in callers.items():
+                if caller in labels:
+                    children.setdefault(caller, []).append((key, edge[3]))
+
+        flame = {'name': '<programa>', 'file': 'main.py', 'value': 0, 'children': []}
+        if root_key is not None:
+            budget = [_PROFILE_MAX_NODES]
+            minimum = stats[root_key][3] / 500
+
+            def build(key, value, path):
+                # value: segundos de key en esta rama; se reparte entre sus hijos
+                # en proporción al tiempo que cada llamada suya aportó al total
+                budget[0] -= 1
+                name, where = labels[key]
+                node = {'name': name, 'file': where, 'value': value * 1000, 'children': []}
+                total = stats[key][3]
+                if len(path) >= _PROFILE_MAX_DEPTH or not total:
+                    return node
+                for child, edge in sorted(children.get(key, ()), key=lambda item: -item[1]):
+                    share = value * edge / total
+                    if child in path or share < minimum or budget[0] <= 0:
+                        continue
+                    node['children'].append(build(child, share, path | {child}))
+                return node
+
+            flame = build(root_key, stats[root_key][3], {root_key})
+            flame['name'] = '<programa>'
+        return {
+            'samples': None,
+            'functions': _profile_top(functions),
+            'lines': [],
+            'flame': flame,
+        }
+
+@functools.lru_cache(maxsize=4096)
+def _instruction_line(code, lasti):
+    # El manejador suele correr en el salto al inicio del bucle, que no tiene
+    # línea propia: se usa la de la última instrucción con línea
+    line = code.co_firstlineno
+    for start, end, number in code.co_lines():
+        if start > lasti:
+            break
+        if number is not None:
+            line = number
+    return line
+
+def _memory_by_line(snapshot):
+    # Bytes y bloques vivos agrupados por la línea más interna del editor
+    # (o, si la pila no llega a él, por la librería que reservó)
+    import tracemalloc
+    lines = {}
+    for trace in snapshot.traces:
+        frames = trace.traceback
+        if any(entry.filename in (_MEMORY_SOURCE, tracemalloc.__file__) for entry in frames):
+            continue
+        where = next((entry for entry in reversed(frames)
+                      if entry.filename == _PROFILE_SOURCE), None)
+        if where is not None:
+            key = ('main.py', where.lineno)
+        else:
+            key = (frames[-1].filename.rsplit('/', 1)[-1], frames[-1].lineno)
+        entry = lines.get(key)
+        if entry is None:
+            entry = lines[key] = {'file': key[0], 'line': key[1], 'size': 0, 'count': 0}
+        entry['size'] += trace.size
+        entry['count'] += 1
+    return sorted(lines.values(), key=lambda entry: -entry['size'])[:_MEMORY_TOP]
+
+def _type_name(kind):
+    module = kind.__module__
+    if module in ('builtins', '__main__'):
+        return kind.__qualname__
+    return '%s.%s' % (module, kind.__qualname__)
+
+def _profile_top(functions):
+    return sorted(functions, key=lambda entry: -entry['total'])[:_PROFILE_TOP]
+
+def _flame_lists(node, minimum):
+    # Hijos como listas ordenadas, sin las ramas de menos de un 0,1 %
+    children = [_flame_lists(child, minimum) for child in node['children'].values()
+                if child['value'] >= minimum]
+    children.sort(key=lambda child: -child['value'])
+    return {'name': node['name'], 'file': node['file'], 'value': node['value'], 'children': children}
+
+# Las asignaciones del vigilante no son del código del editor
+_Profiler._watch_memory.__code__ = _Profiler._watch_memory.__code__.replace(
+    co_filename=_MEMORY_SOURCE)
+
+_profiler = _Profiler()
+`;
+
+// Se ejecuta la primera vez que el código del usuario necesita matplotlib.
+// Todo queda dentro de una función para que un reset no borre sus dependencias.
+const MATPLOTLIB_SETUP = `
+def _install_show_hook(is_cached):
+    import io
+    import pickle
+    import hashlib
+    import matplotlib
+
+    # Se renderiza con Agg en el worker; el PNG se decodifica también aquí
+    matplotlib.use('Agg')
+
+    import matplotlib.pyplot as plt
+    import matplotlib.animation as animation
+
+    # Las animaciones se registran al crearse y se reproducen en show()
+    original_init = animation.Animation.__init__
+
+    def tracking_init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        _pending_animations.append(self)
+
+    animation.Animation.__init__ = tracking_init
+
+    def play(anim):
+        # Sin temporizador de GUI: los frames se generan aquí y se envían a
+        # medida que se muestran. La figura solo se rasteriza si el frame
+        # no se descarta.
+        figure = anim._fig
+        figure.canvas.mpl_disconnect(anim._first_draw_id)
+        anim._init_draw()
+        interval = getattr(anim, '_interval', 0) or 1000 / 24
+
+        def frames():
+            for framedata in anim.new_frame_seq():
+                anim._draw_frame(framedata)
+                yield figure
+
+        _animate(frames(), fps=1000 / interval)
+
+    from matplotlib.transforms import TransformNode
+
+    class FigurePickler(pickle.Pickler):
+        # Las transformaciones guardan a sus padres indexados por id():
+        # se omiten para que la misma figura dé siempre el mismo hash
+        def reducer_override(self, obj):
+            if isinstance(obj, TransformNode):
+                state = dict(obj.__dict__)
+                state.pop('_parents', None)
+                return (type(obj), (), state)
+            return NotImplemented
+
+    def figure_key(figure):
+        # El pickle recoge datos y estilo de todos los artistas, y es mucho
+        # más barato que rasterizar
+        buffer = io.BytesIO()
+        try:
+            FigurePickler(buffer).dump(figure)
+        except Exception:
+            return None  # Objetos no serializables: la figura no se cachea
+        return hashlib.sha1(buffer.getvalue()).hexdigest()
+
+    def show(*args, **kwargs):
+        animations = list(_pending_animations)
+        _pending_animations.clear()
+        # Sin destino de frames (tests, REPL) la figura se muestra estática
+        if _frame_sink is not None:
+            for anim in animations:
+                play(anim)
+                plt.close(anim._fig)
+
+        for num in plt.get_fignums():
+            figure = plt.figure(num)
+            key = figure_key(figure)
+            if key is not None and is_cached(key):
+                _figures.append({'key': key, 'png': None})
+                continue
+            buffer = io.BytesIO()
+            figure.savefig(buffer, format='png', bbox_inches='tight')
+            _figures.append({'key': key, 'png': buffer.getvalue()})
+        plt.close('all')
+
+    plt.show = show
+    plt.ioff()  # Desactivar modo interactivo
+`;
+
+// Foto del estado limpio del intérprete; se toma al final del setup
+const SNAPSHOT_SETUP = `
+import importlib
+
+_USER_MODULE_ROOTS = ('/home/', '/tmp/')
+
+def _is_user_module(module):
+    spec = getattr(module, '__spec__', None)
+    if spec is None:
+        return True
+    origin = spec.origin or ''
+    return origin.startswith(_USER_MODULE_ROOTS)
+
+def _restore_interpreter():
+    snapshot = _restore_interpreter.snapshot
+    namespace = globals()
+
+    # Namespace: fuera todo lo que no existía, y los nombres originales vuelven a su valor
+    for name in list(namespace):
+        if name not in snapshot['globals']:
+            del namespace[name]
+    namespace.update(snapshot['globals'])
+
+    # Módulos creados por el usuario (las librerías instaladas se conservan como caché)
+    for name, module in list(sys.modules.items()):
+        if name not in snapshot['modules'] and _is_user_module(module):
+            del sys.modules[name]
+    importlib.invalidate_caches()
+
+    sys.path[:] = snapshot['path']
+    sys.stdout = _stdout_capture
+    sys.stderr = _stderr_capture
+    sys.setrecursionlimit(snapshot['recursionlimit'])
+    os.chdir(snapshot['cwd'])
+
+    if 'matplotlib.pyplot' in sys.modules:
+        sys.modules['matplotlib.pyplot'].close('all')
+
+    _stdout_capture.output = []
+    _stderr_capture.output = []
+    _figures.clear()
+    _pending_animations.clear()
+    _repl.reset()
+
+_restore_interpreter.snapshot = {
+    'globals': dict(globals()),
+    'modules': set(sys.modules),
+    'path': list(sys.path),
+    'recursionlimit': sys.getrecursionlimit(),
+    'cwd': os.getcwd(),
+}
+`;
+
+/**
+ * Envía un mensaje de progreso al hilo principal
+ */
+function reportProgress(id, message) {
+  self.postMessage(createResponse(id, RESPONSE_TYPES.PROGRESS, { message }));
+}
+
+/**
+ * Convierte el valor devuelto por Python en algo clonable por postMessage
+ */
+function serializeResult(value) {
+  if (value && typeof value.toJs === 'function') {
+    const text = value.toString();
+    value.destroy();
+    return text;
+  }
+  return value;
+}
+
+/**
+ * Convierte dicts, listas y escalares de Python en objetos JS nativos
+ * (sin pasar por JSON); si no es posible, devuelve su repr
+ */
+function toStructured(value) {
+  if (!value || typeof value.toJs !== 'function') {
+    return value;
+  }
+  try {
+    return value.toJs({ dict_converter: Object.fromEntries, create_pyproxies: false });
+  } catch (error) {
+    return value.toString();
+  } finally {
+    value.destroy();
+  }
+}
+
+/**
+ * Objetos que pueden transferirse al hilo principal sin copiarse
+ */
+function collectTransferables(result) {
+  if (!result || !Array.isArray(result.figures) || typeof ImageBitmap === 'undefined') {
+    return [];
+  }
+  return result.figures.filter((figure) => figure instanceof ImageBitmap);
+}
+
+/**
+ * ¿Hay en caché una figura con este hash para el código en ejecución?
+ * (Python lo consulta antes de rasterizar)
+ */
+function isFigureCached(digest) {
+  return figureCache.has(`${currentCodeHash}:${digest}`);
+}
+
+/**
+ * Guarda un bitmap en la caché, desalojando el menos usado si está llena
+ */
+function cacheFigure(key, bitmap) {
+  figureCache.set(key, bitmap);
+  if (figureCache.size > FIGURE_CACHE_SIZE) {
+    const [oldestKey, oldest] = figureCache.entries().next().value;
+    figureCache.delete(oldestKey);
+    oldest.close();
+  }
+}
+
+/**
+ * Convierte las figuras de Python en ImageBitmaps listos para transferir.
+ * Las cacheadas se clonan sin decodificar; las nuevas se decodifican aquí,
+ * fuera del hilo principal. La caché conserva su propia copia porque
+ * transferir un bitmap lo deja inutilizable en el worker.
+ */
+async function renderFigures(figures) {
+  const bitmaps = new Array(figures.length).fill(null);
+
+  // Primero los aciertos: guardar las figuras nuevas podría desalojarlos
+  for (let i = 0; i < figures.length; i++) {
+    const { key, png } = figures[i];
+    if (png) continue;
+    const cacheKey = `${currentCodeHash}:${key}`;
+    const cached = figureCache.get(cacheKey);
+    if (!cached) continue;
+    figureCache.delete(cacheKey);
+    figureCache.set(cacheKey, cached);
+    bitmaps[i] = await createImageBitmap(cached);
+  }
+
+  for (let i = 0; i < figures.length; i++) {
+    const { key, png } = figures[i];
+    if (!png) continue;
+    const bitmap = await createImageBitmap(new Blob([png], { type: 'image/png' }));
+    if (key) {
+      cacheFigure(`${currentCodeHash}:${key}`, bitmap);
+      bitmaps[i] = await createImageBitmap(bitmap);
+    } else {
+      bitmaps[i] = bitmap;
+    }
+  }
+
+  return bitmaps.filter(Boolean);
+}
+
+/**
+ * Envía al hilo principal el texto pendiente del stream activo
+ */
+function flushStream() {
+  const stream = activeStream;
+  if (!stream || stream.segments.length === 0) return;
+
+  stream.seq += 1;
+  self.postMessage(
+    createResponse(stream.id, RESPONSE_TYPES.STREAM, {
+      seq: stream.seq,
+      segments: stream.segments,
+      dropped: stream.dropped
+    })
+  );
+  stream.segments = [];
+  stream.size = 0;
+  stream.dropped = 0;
+  stream.lastFlush = performance.now();
+
+  // Backpressure: si el hilo principal va atrasado, Python espera aquí
+  if (!streamAckBuffer) return;
+  while (stream.seq - Atomics.load(streamAckBuffer, 0) > STREAM_MAX_IN_FLIGHT) {
+    // Solo una interrupción corta la espera: al perfilar, el buffer lleva
+    // PROFILE_SIGNAL casi siempre (y el SIGINT de Detener lo sobrescribe)
+    const signal = interruptBuffer ? Atomics.load(interruptBuffer, 0) : 0;
+    if (signal !== 0 && signal !== PROFILE_SIGNAL) return;
+    Atomics.wait(streamAckBuffer, 0, Atomics.load(streamAckBuffer, 0), 50);
+  }
+}
+
+/**
+ * Recibe cada write() de sys.stdout/sys.stderr en modo streaming
+ */
+function streamWrite(name, text) {
+  const stream = activeStream;
+  if (!stream || !text) return;
+
+  const last = stream.segments[stream.segments.length - 1];
+  if (last && last.stream === name) {
+    last.text += text;
+  } else {
+    stream.segments.push({ stream: name, text });
+  }
+  stream.size += text.length;
+
+  // Buffer circular: se descarta lo más antiguo si el lote crece demasiado
+  while (stream.size > STREAM_MAX_PENDING) {
+    const first = stream.segments[0];
+    const excess = stream.size - STREAM_MAX_PENDING;
+    if (first.text.length <= excess) {
+      stream.segments.shift();
+      stream.size -= first.text.length;
+      stream.dropped += first.text.length;
+    } else {
+      first.text = first.text.slice(excess);
+      stream.size -= excess;
+      stream.dropped += excess;
+    }
+  }
+
+  if (performance.now() - stream.lastFlush >= STREAM_FLUSH_INTERVAL) {
+    flushStream();
+  }
+}
+
+/**
+ * Destino de los frames de animación que envía Python (ver _animate)
+ */
+const frameSink = {
+  /**
+   * Espera hasta que toque el siguiente frame según `fps` y dice si debe
+   * enviarse (false: el hilo principal va atrasado y se descarta)
+   */
+  ready(fps) {
+    const frames = activeFrames;
+    if (!frames) return false;
+
+    const interval = 1000 / Math.max(1, Math.min(fps, 120));
+    if (frameAckBuffer) {
+      // Python va más rápido que la pantalla: esperar (sin bloquear el
+      // interrupt más de un intervalo)
+      let wait = frames.lastSent + interval - performance.now();
+      while (wait > 0) {
+        Atomics.wait(frameAckBuffer, 0, Atomics.load(frameAckBuffer, 0), wait);
+        wait = frames.lastSent + interval - performance.now();
+      }
+      if (frames.seq - Atomics.load(frameAckBuffer, 0) >= FRAME_MAX_IN_FLIGHT) {
+        frames.dropped++;
+        return false;
+      }
+    }
+    return true;
+  },
+
+  /**
+   * Convierte los píxeles RGBA en un ImageBitmap y lo transfiere
+   */
+  send(width, height, data) {
+    const frames = activeFrames;
+    if (!frames) return;
+
+    const bytes = data.toJs();
+    const pixels = new ImageData(
+      new Uint8ClampedArray(bytes.buffer, bytes.byteOffset, bytes.byteLength),
+      width,
+      height
+    );
+
+    let frame = pixels;
+    if (typeof OffscreenCanvas !== 'undefined') {
+      if (!frames.canvas || frames.canvas.width !== width || frames.canvas.height !== height) {
+        frames.canvas = new OffscreenCanvas(width, height);
+      }
+      frames.canvas.getContext('2d').putImageData(pixels, 0, 0);
+      frame = frames.canvas.transferToImageBitmap();
+    }
+
+    frames.seq += 1;
+    frames.lastSent = performance.now();
+    self.postMessage(
+      createResponse(frames.id, RESPONSE_TYPES.FRAME, {
+        seq: frames.seq,
+        frame,
+        dropped: frames.dropped
+      }),
+      [frame instanceof ImageData ? frame.data.buffer : frame]
+    );
+    frames.dropped = 0;
+  }
+};
+
+/**
+ * Lee (y limpia) stdout, stderr y figuras de la última ejecución
+ */
+async function collectOutput() {
+  const output = runHooks.endRun();
+  let collected;
+  try {
+    collected = output.toJs({ dict_converter: Object.fromEntries });
+  } finally {
+    output.destroy();
+  }
+  return { ...collected, figures: await renderFigures(collected.figures) };
+}
+
+// El snapshot de memoria depende de la versión y del código de setup
+const SNAPSHOT_KEY = `${PYODIDE_VERSION}:${hashString(
+  Object.values(PYHUB_FILES).join('') + STDIO_SETUP + COMPLETION_SETUP + ANALYSIS_SETUP +
+    PROFILE_SETUP + SNAPSHOT_SETUP
+)}`;
+
+/**
+ * Hash djb2 de una cadena, suficiente para invalidar snapshots
+ */
+function hashString(text) {
+  let hash = 5381;
+  for (let i = 0; i < text.length; i++) {
+    hash = ((hash << 5) + hash + text.charCodeAt(i)) | 0;
+  }
+  return (hash >>> 0).toString(36);
+}
+
+/**
+ * Arranca Pyodide desde el snapshot guardado si existe; si no, en frío.
+ * Devuelve la instancia y si viene ya configurada.
+ */
+async function bootInterpreter(loadPyodide) {
+  let snapshot = null;
+  try {
+    snapshot = await loadSnapshot(SNAPSHOT_KEY);
+  } catch (error) {
+    console.warn('No se pudo leer el snapshot de Pyodide:', error);
+  }
+
+  if (snapshot) {
+    try {
+      const instance = await loadPyodide({
+        indexURL: PYODIDE_INDEX_URL,
+        _loadSnapshot: snapshot
+      });
+      return { instance, restored: true };
+    } catch (error) {
+      console.warn('Snapshot de Pyodide inválido, arrancando en frío:', error);
+      await clearSnapshots().catch(() => {});
+    }
+  }
+
+  const instance = await loadPyodide({
+    indexURL: PYODIDE_INDEX_URL,
+    _makeSnapshot: true
+  });
+  return { instance, restored: false };
+}
+
+/**
+ * Guarda un snapshot de memoria del intérprete recién configurado
+ */
+async function persistSnapshot(instance) {
+  if (typeof instance.makeMemorySnapshot !== 'function') return;
+  try {
+    await saveSnapshot(SNAPSHOT_KEY, instance.makeMemorySnapshot());
+  } catch (error) {
+    console.warn('No se pudo guardar el snapshot de Pyodide:', error);
+  }
+}
+
+/**
+ * Escribe el paquete pyhub en site-packages del intérprete
+ */
+function installPyhub(instance) {
+  const sitePackages = instance.runPython("__import__('sysconfig').get_path('purelib')");
+  const root = `${sitePackages}/pyhub`;
+  instance.FS.mkdirTree(root);
+  for (const [name, source] of Object.entries(PYHUB_FILES)) {
+    instance.FS.writeFile(`${root}/${name}`, source);
+  }
+}
+
+/**
+ * Descarga Pyodide y prepara el entorno
+ */
+async function initialize(id, payload) {
+  if (pyodide) {
+    return;
+  }
+
+  if (!initPromise) {
+    initPromise = (async () => {
+      reportProgress(id, 'Descargando Pyodide...');
+
+      const timeout = new Promise((_, reject) => {
+        setTimeout(() => {
+          reject(new Error('Timeout al cargar Pyodide. Verifica tu conexión a internet.'));
+        }, LOAD_TIMEOUT);
+      });
+
+      let instance;
+      let restored;
+      try {
+        const { loadPyodide } = await Promise.race([
+          import(/* @vite-ignore */ PYODIDE_MODULE_URL),
+          timeout
+        ]);
+        ({ instance, restored } = await Promise.race([bootInterpreter(loadPyodide), timeout]));
+      } catch (error) {
+        throw new Error(`Error al inicializar Pyodide: ${error.message}`);
+      }
+
+      // Interrupción preventiva: el hilo principal escribe SIGINT en el buffer
+      if (payload.interruptBuffer) {
+        interruptBuffer = payload.interruptBuffer;
+        instance.setInterruptBuffer(interruptBuffer);
+      }
+      streamAckBuffer = payload.streamAckBuffer || null;
+      frameAckBuffer = payload.frameAckBuffer || null;
+
+      installPyhub(instance);
+      if (!restored) {
+        reportProgress(id, 'Inicializando entorno Python...');
+        await instance.runPythonAsync(STDIO_SETUP);
+        await instance.runPythonAsync(COMPLETION_SETUP);
+        await instance.runPythonAsync(ANALYSIS_SETUP);
+        await instance.runPythonAsync(PROFILE_SETUP);
+        await instance.runPythonAsync(SNAPSHOT_SETUP);
+        // Debe tomarse antes de que Python guarde referencias a objetos JS
+        await persistSnapshot(instance);
+      }
+
+      // Solo el intérprete base: numpy, matplotlib, etc. se cargan al importarse
+      const codeModule = instance.pyimport('pyodide.code');
+      findImports = codeModule.find_imports;
+      codeModule.destroy();
+
+      runHooks = {
+        beginRun: instance.globals.get('_begin_run'),
+        endRun: instance.globals.get('_end_run'),
+        setStreamSink: instance.globals.get('_set_stream_sink'),
+        setFrameSink: instance.globals.get('_set_frame_sink'),
+        replPush: instance.globals.get('_repl_push'),
+        complete: instance.globals.get('_complete'),
+        analyze: instance.globals.get('_analyze_blocks'),
+        profiler: instance.globals.get('_profiler')
+      };
+
+      pyodide = instance;
+    })();
+  }
+
+  try {
+    await initPromise;
+  } catch (error) {
+    initPromise = null;
+    throw error;
+  }
+
+  reportProgress(id, '¡Pyodide listo!');
+}
+
+/**
+ * Descarga en paralelo los paquetes que importa `code` y que aún no se
+ * han comprobado, y configura matplotlib la primera vez que aparece.
+ * Cada llamada espera a que termine la anterior.
+ */
+function ensurePackages(id, code) {
+  const loading = packagesInFlight.then(() => loadPackages(id, code));
+  packagesInFlight = loading.catch(() => {});
+  return loading;
+}
+
+/**
+ * Carga los paquetes de `code` (ver ensurePackages)
+ */
+async function loadPackages(id, code) {
+  let imports = [];
+  try {
+    const found = findImports(code);
+    imports = found.toJs();
+    found.destroy();
+  } catch (error) {
+    // Código con errores de sintaxis: el propio intérprete los reportará
+    return;
+  }
+
+  const unchecked = imports.filter((name) => !checkedImports.has(name));
+  if (unchecked.length > 0) {
+    const known = unchecked.filter((name) => !pyodide.loadedPackages[name]);
+    if (known.length > 0) {
+      reportProgress(id, `Cargando paquetes: ${known.join(', ')}...`);
+    }
+    await pyodide.loadPackagesFromImports(code);
+    unchecked.forEach((name) => checkedImports.add(name));
+  }
+
+  if (!matplotlibConfigured && pyodide.loadedPackages.matplotlib) {
+    // Se marca antes del primer await: el hook de plt.show() y el envoltorio de
+    // Animation.__init__ no deben instalarse dos veces
+    matplotlibConfigured = true;
+    try {
+      await pyodide.runPythonAsync(MATPLOTLIB_SETUP);
+      const installShowHook = pyodide.globals.get('_install_show_hook');
+      installShowHook(isFigureCached);
+      installShowHook.destroy();
+    } catch (error) {
+      matplotlibConfigured = false;
+      throw error;
+    }
+  }
+}
+
+/**
+ * Bytes reservados por el heap de WASM. Nunca baja: es también el pico.
+ */
+function heapSize() {
+  return pyodide._module.HEAP8.length;
+}
+
+/**
+ * Ejecuta código en el namespace global del intérprete.
+ * Con `stream` la salida se envía en lotes STREAM en lugar de acumularse;
+ * con `frames` las animaciones se envían como mensajes FRAME;
+ * con `structured` el valor devuelto llega como objeto JS en vez de repr.
+ */
+async function runCode(
+  code,
+  { globals, stream = null, frames = null, profile = null, structured = false } = {}
+) {
+  runHooks.beginRun();
+  currentCodeHash = hashString(code);
+
+  if (stream) {
+    if (streamAckBuffer) Atomics.store(streamAckBuffer, 0, 0);
+    activeStream = { id: stream.id, seq: 0, segments: [], size: 0, dropped: 0, lastFlush: 0 };
+    runHooks.setStreamSink(streamWrite);
+  }
+
+  if (frames) {
+    if (frameAckBuffer) Atomics.store(frameAckBuffer, 0, 0);
+    activeFrames = { id: frames.id, seq: 0, dropped: 0, lastSent: 0, canvas: null };
+    runHooks.setFrameSink(frameSink);
+  }
+
+  // El informe se recoge justo al acabar el código, antes de leer la salida
+  let profiling = false;
+  const heapBefore = heapSize();
+  const finishProfile = () => {
+    if (!profiling) return undefined;
+    profiling = false;
+    const report = runHooks.profiler.stop();
+    let profileReport;
+    try {
+      profileReport = report.toJs({ dict_converter: Object.fromEntries });
+    } finally {
+      report.destroy();
+    }
+    if (profile === 'memory') {
+      profileReport.heap = { before: heapBefore, peak: heapSize() };
+    }
+    return profileReport;
+  };
+  if (profile) {
+    runHooks.profiler.start(profile, PROFILE_SIGNAL);
+    profiling = true;
+  }
+
+  try {
+    const value = await pyodide.runPythonAsync(code, globals ? { globals } : {});
+    const profileReport = finishProfile();
+    const { stdout, stderr, figures } = await collectOutput();
+
+    return {
+      success: true,
+      result: structured ? toStructured(value) : serializeResult(value),
+      stdout,
+      stderr,
+      output: stdout + stderr,
+      figures,
+      profile: profileReport,
+      heapSize: heapSize()
+    };
+  } catch (error) {
+    const profileReport = finishProfile();
+    // Capturar stderr incluso en error
+    let stderr = '';
+    let figures = [];
+    try {
+      ({ stderr, figures } = await collectOutput());
+    } catch (e) {
+      // Ignorar errores al capturar stderr
+    }
+
+    return {
+      success: false,
+      error: error.message || String(error),
+      stderr,
+      output: stderr || error.message || String(error),
+      figures,
+      profile: profileReport,
+      heapSize: heapSize()
+    };
+  } finally {
+    finishProfile();
+    if (stream) {
+      runHooks.setStreamSink(null);
+      flushStream();
+      activeStream = null;
+    }
+    if (frames) {
+      runHooks.setFrameSink(null);
+      activeFrames = null;
+    }
+  }
+}
+
+/**
+ * Ejecuta un harness de tests en un módulo aislado del namespace del usuario.
+ * El harness devuelve sus resultados como objetos Python nativos.
+ */
+async function runTestCode(code) {
+  const namespace = pyodide.globals.get('_new_test_namespace')();
+  try {
+    return await runCode(code, { globals: namespace, structured: true });
+  } finally {
+    pyodide.runPython('_drop_test_namespace()');
+    namespace.destroy();
+  }
+}
+
+/**
+ * Envía una línea a la consola interactiva de sesión.
+ * Una sola llamada a Python por línea; solo el código con await de nivel
+ * superior espera al event loop.
+ */
+async function runReplLine(id, line) {
+  if (/\bimport\b/.test(line)) {
+    await ensurePackages(id, line);
+  }
+  // El buffer de interrupción no se limpia aquí (lo hace el pool al empezar
+  // la tarea): un Stop durante la carga interrumpe la línea
+  currentCodeHash = hashString(line);
+
+  let reply = runHooks.replPush(line);
+  if (typeof reply.then === 'function') {
+    const pending = reply;
+    try {
+      reply = await pending;
+    } finally {
+      pending.destroy();
+    }
+  }
+
+  let data;
+  try {
+    data = reply.toJs({ dict_converter: Object.fromEntries });
+  } finally {
+    reply.destroy();
+  }
+
+  return {
+    success: !data.error,
+    status: data.status,
+    result: data.result,
+    error: data.error,
+    stderr: data.stderr,
+    output: data.stdout + data.stderr,
+    figures: data.figures.length > 0 ? await renderFigures(data.figures) : []
+  };
+}
+
+/**
+ * Sugerencias de autocompletado para una posición del código.
+ * Nunca descarga paquetes: solo lista los que ya cargó una ejecución.
+ */
+function completeCode({ source, line, column }) {
+  const reply = runHooks.complete(source, line, column, pyodide.globals);
+  try {
+    return reply.toJs({ dict_converter: Object.fromEntries });
+  } finally {
+    reply.destroy();
+  }
+}
+
+/**
+ * Analiza bloques de código de nivel superior; devuelve un resultado por
+ * bloque, en el mismo orden
+ */
+function analyzeBlocks({ sources }) {
+  const reply = runHooks.analyze(sources);
+  try {
+    return { blocks: reply.toJs({ dict_converter: Object.fromEntries }) };
+  } finally {
+    reply.destroy();
+  }
+}
+
+/**
+ * Instala paquetes de PyPI con micropip
+ */
+async function installPackage(packageName) {
+  try {
+    await pyodide.loadPackage('micropip');
+    const micropip = pyodide.pyimport('micropip');
+    try {
+      await micropip.install(packageName);
+    } finally {
+      micropip.destroy();
+    }
+    return { success: true, message: `Paquete '${packageName}' instalado correctamente` };
+  } catch (error) {
+    return { success: false, error: `Error al instalar '${packageName}': ${error.message}` };
+  }
+}
+
+/**
+ * Devuelve el intérprete al estado del snapshot tomado tras el setup
+ */
+async function resetEnvironment() {
+  try {
+    pyodide.runPython('_restore_interpreter()');
+    return { success: true, message: 'Entorno reiniciado' };
+  } catch (error) {
+    return { success: false, error: error.message };
+  }
+}
+
+/**
+ * Despacha una petición según su tipo
+ */
+async function handleRequest({ id, type, payload }) {
+  if (type === REQUEST_TYPES.INIT) {
+    await initialize(id, payload);
+    return { ready: true };
+  }
+
+  if (!pyodide) {
+    throw new Error('Pyodide no está inicializado. Llama a initializePyodide() primero.');
+  }
+
+  switch (type) {
+    case REQUEST_TYPES.LOAD_PACKAGES:
+      await ensurePackages(id, payload.code);
+      return { success: true };
+    case REQUEST_TYPES.RUN:
+      return runCode(payload.code, {
+        stream: payload.stream ? { id } : null,
+        frames: payload.frames ? { id } : null,
+        profile: payload.profile || null
+      });
+    case REQUEST_TYPES.TEST:
+      return runTestCode(payload.code);
+    case REQUEST_TYPES.REPL:
+      return runReplLine(id, payload.line);
+    case REQUEST_TYPES.COMPLETE:
+      return completeCode(payload);
+    case REQUEST_TYPES.ANALYZE:
+      return analyzeBlocks(payload);
+    case REQUEST_TYPES.INSTALL:
+      return installPackage(payload.packageName);
+    case REQUEST_TYPES.RESET:
+      return resetEnvironment();
+    default:
+      throw new Error(`Tipo de petición desconocido: ${type}`);
+  }
+}
+
+// Las peticiones se encadenan: el intérprete solo ejecuta una cosa a la vez
+let queue = Promise.resolve();
+
+self.onmessage = (event) => {
+  const request = event.data;
+  queue = queue.then(async () => {
+    try {
+      const result = await handleRequest(request);
+      self.postMessage(
+        createResponse(request.id, RESPONSE_TYPES.RESULT, result),
+        collectTransferables(result)
+      );
+    } catch (error) {
+      self.postMessage(
+        createResponse(request.id, RESPONSE_TYPES.ERROR, {
+          message: error.message || String(error)
+        })
+      );
+    }
+  });
+};
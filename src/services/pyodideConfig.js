@@ -0,0 +1,15 @@
+/**
+ * Configuración compartida de Pyodide entre el hilo principal y los workers
+ */
+
+export const PYODIDE_VERSION = '0.26.2';
+
+// VITE_PYODIDE_INDEX_URL permite apuntar a un servidor estático local en lugar del CDN
+export const PYODIDE_INDEX_URL =
+  import.meta.env.VITE_PYODIDE_INDEX_URL ||
+  `https://cdn.jsdelivr.net/pyodide/v${PYODIDE_VERSION}/full/`;
+export const PYODIDE_MODULE_URL = `${PYODIDE_INDEX_URL}pyodide.mjs`;
+export const LOAD_TIMEOUT = 60000; // 60 segundos
+
+// El heap de WASM solo crece; por encima de esto el navegador puede matar la pestaña
+export const HEAP_WARNING_THRESHOLD = 1024 * 1024 * 1024; // bytes (1 GiB)
@@ -0,0 +1,30 @@
+/**
+ * Registro del Service Worker que cachea el runtime de Pyodide
+ */
+
+import { PYODIDE_VERSION, PYODIDE_INDEX_URL } from './pyodideConfig.js';
+
+/**
+ * Registra public/sw.js con la versión de Pyodide como clave de caché.
+ * Si el navegador no soporta Service Workers la app funciona igual,
+ * solo que descargando Pyodide en cada carga.
+ */
+export async function registerPyodideCache() {
+  if (!('serviceWorker' in navigator)) {
+    return null;
+  }
+
+  const params = new URLSearchParams({
+    pyodide: PYODIDE_VERSION,
+    cdn: PYODIDE_INDEX_URL
+  });
+
+  try {
+    return await navigator.serviceWorker.register(
+      `${import.meta.env.BASE_URL}sw.js?${params}`
+    );
+  } catch (error) {
+    console.warn('No se pudo registrar el Service Worker:', error);
+    return null;
+  }
+}
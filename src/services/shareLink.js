@@ -0,0 +1,186 @@
+/**
+ * Enlaces para compartir código.
+ *
+ * El código viaja comprimido con deflate (CompressionStream) y codificado
+ * en base64url dentro del propio enlace (?z=). Si aun así el enlace queda
+ * demasiado largo, el código se guarda en un almacén direccionado por su
+ * contenido y el enlace solo lleva el hash (?h=).
+ *
+ * El almacén es intercambiable: por defecto IndexedDB (el enlace solo
+ * funciona en este navegador) o, con VITE_SHARE_STORE_URL, un servidor que
+ * acepte PUT/GET en `<url>/<hash>` (ver scripts/share-store-server.js).
+ */
+
+import { createIdbStore } from '../utils/idb.js';
+
+// Por encima de esto algunos navegadores, servidores y chats recortan la URL
+const MAX_INLINE_PAYLOAD = 8000; // caracteres
+const HASH_BYTES = 16; // 128 bits del SHA-256: 22 caracteres en base64url
+const BASE64_CHUNK = 0x8000; // bytes por llamada a String.fromCharCode
+
+// Primer carácter del parámetro z: cómo va codificado el resto
+const ENCODING_DEFLATE = 'd';
+const ENCODING_PLAIN = 'u';
+
+const DB_NAME = 'pyhub-shares';
+const STORE_NAME = 'shares';
+const withStore = createIdbStore(DB_NAME, STORE_NAME);
+
+/**
+ * Convierte bytes a base64url sin relleno
+ */
+function toBase64Url(bytes) {
+  let binary = '';
+  for (let i = 0; i < bytes.length; i += BASE64_CHUNK) {
+    binary += String.fromCharCode(...bytes.subarray(i, i + BASE64_CHUNK));
+  }
+  return btoa(binary).replace(/\+/g, '-').replace(/\//g, '_').replace(/=+$/, '');
+}
+
+/**
+ * Convierte base64url (con o sin relleno) a bytes
+ */
+function fromBase64Url(text) {
+  const binary = atob(text.replace(/-/g, '+').replace(/_/g, '/'));
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i);
+  }
+  return bytes;
+}
+
+/**
+ * Pasa los bytes por un CompressionStream o DecompressionStream
+ */
+async function transform(bytes, stream) {
+  const response = new Response(new Blob([bytes]).stream().pipeThrough(stream));
+  return new Uint8Array(await response.arrayBuffer());
+}
+
+/**
+ * Hash del contenido en base64url: identifica el código en el almacén
+ */
+export async function hashCode(code) {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(code));
+  return toBase64Url(new Uint8Array(digest).subarray(0, HASH_BYTES));
+}
+
+/**
+ * Codifica el código para el parámetro z del enlace
+ */
+export async function encodeCode(code) {
+  const bytes = new TextEncoder().encode(code);
+  if (typeof CompressionStream === 'undefined') {
+    return ENCODING_PLAIN + toBase64Url(bytes);
+  }
+  return ENCODING_DEFLATE + toBase64Url(await transform(bytes, new CompressionStream('deflate-raw')));
+}
+
+/**
+ * Decodifica el parámetro z de un enlace
+ */
+export async function decodeCode(payload) {
+  const bytes = fromBase64Url(payload.slice(1));
+  if (payload[0] === ENCODING_DEFLATE) {
+    return new TextDecoder().decode(await transform(bytes, new DecompressionStream('deflate-raw')));
+  }
+  if (payload[0] === ENCODING_PLAIN) {
+    return new TextDecoder().decode(bytes);
+  }
+  throw new Error('Formato de enlace desconocido');
+}
+
+/**
+ * Almacén en IndexedDB: los enlaces solo se abren en este navegador
+ */
+export const indexedDbStore = {
+  name: 'indexeddb',
+  local: true,
+  async put(hash, code) {
+    await withStore('readwrite', (store) => store.put(code, hash));
+  },
+  async get(hash) {
+    const code = await withStore('readonly', (store) => store.get(hash));
+    return code || null;
+  }
+};
+
+/**
+ * Almacén en un servidor HTTP: PUT y GET del texto en `<baseUrl>/<hash>`
+ */
+export function createHttpStore(baseUrl) {
+  const url = (hash) => `${baseUrl.replace(/\/+$/, '')}/${hash}`;
+  return {
+    name: 'http',
+    local: false,
+    async put(hash, code) {
+      const response = await fetch(url(hash), {
+        method: 'PUT',
+        headers: { 'Content-Type': 'text/plain; charset=utf-8' },
+        body: code
+      });
+      if (!response.ok) throw new Error(`El almacén respondió ${response.status}`);
+    },
+    async get(hash) {
+      const response = await fetch(url(hash));
+      if (response.status === 404) return null;
+      if (!response.ok) throw new Error(`El almacén respondió ${response.status}`);
+      return response.text();
+    }
+  };
+}
+
+let shareStore = import.meta.env.VITE_SHARE_STORE_URL
+  ? createHttpStore(import.meta.env.VITE_SHARE_STORE_URL)
+  : indexedDbStore;
+
+/**
+ * Cambia el almacén de los enlaces largos ({ name, local, put, get })
+ */
+export function setShareStore(store) {
+  shareStore = store;
+}
+
+/**
+ * Crea el enlace para compartir el código.
+ *
+ * @returns {Promise<{ url: string, stored: boolean, local: boolean }>}
+ *   stored indica que el código está en el almacén; local, que el enlace
+ *   solo funciona en este navegador
+ */
+export async function createShareLink(code, baseUrl) {
+  const payload = await encodeCode(code);
+  if (payload.length <= MAX_INLINE_PAYLOAD) {
+    return { url: `${baseUrl}?z=${payload}`, stored: false, local: false };
+  }
+  const hash = await hashCode(code);
+  await shareStore.put(hash, code);
+  return { url: `${baseUrl}?h=${hash}`, stored: true, local: shareStore.local };
+}
+
+/**
+ * Lee el código de los parámetros de un enlace (z, h o el antiguo code).
+ * Devuelve null si el enlace no trae código.
+ */
+export async function readShareLink(search) {
+  const params = new URLSearchParams(search);
+  if (params.has('z')) {
+    return decodeCode(params.get('z'));
+  }
+  if (params.has('h')) {
+    const hash = params.get('h');
+    const code = await shareStore.get(hash);
+    if (code === null) {
+      throw new Error('El código del enlace no está en el almacén');
+    }
+    // El hash también sirve para comprobar que el contenido no ha cambiado
+    if ((await hashCode(code)) !== hash) {
+      throw new Error('El código del almacén no coincide con el enlace');
+    }
+    return code;
+  }
+  if (params.has('code')) {
+    return decodeURIComponent(atob(params.get('code')));
+  }
+  return null;
+}
@@ -0,0 +1,40 @@
+/**
+ * Almacén en IndexedDB de snapshots de memoria del intérprete.
+ *
+ * Se usa desde el worker de Pyodide: un snapshot guardado permite arrancar
+ * un intérprete ya configurado sin volver a ejecutar el setup.
+ */
+
+import { createIdbStore } from '../utils/idb.js';
+
+const DB_NAME = 'pyhub-snapshots';
+const STORE_NAME = 'snapshots';
+const withStore = createIdbStore(DB_NAME, STORE_NAME);
+
+/**
+ * Obtiene el snapshot guardado con la clave indicada (o null)
+ */
+export async function loadSnapshot(key) {
+  if (typeof indexedDB === 'undefined') return null;
+  const snapshot = await withStore('readonly', (store) => store.get(key));
+  return snapshot || null;
+}
+
+/**
+ * Guarda un snapshot y elimina los de otras claves (versiones anteriores)
+ */
+export async function saveSnapshot(key, snapshot) {
+  if (typeof indexedDB === 'undefined') return;
+  await withStore('readwrite', (store) => {
+    store.clear();
+    return store.put(snapshot, key);
+  });
+}
+
+/**
+ * Elimina todos los snapshots (p. ej. si uno no se pudo restaurar)
+ */
+export async function clearSnapshots() {
+  if (typeof indexedDB === 'undefined') return;
+  await withStore('readwrite', (store) => store.clear());
+}
@@ -1,185 +1,279 @@
 /**
  * Servicio para ejecutar tests unitarios en Pyodide
+ *
+ * Los tests se descubren una vez con el módulo `ast` (sin ejecutar el
+ * código) y cada uno se lanza como una tarea independiente del pool de
+ * workers: se reparten entre los intérpretes libres, cada test ejecuta el
+ * módulo del usuario en un namespace propio y tiene su propio timeout.
+ *
+ * En modo incremental solo se ejecutan los tests cuya huella de
+ * dependencias cambió desde la última ejecución; el resto reutiliza el
+ * resultado guardado.
  */
 
-import { runPythonCode } from './pyodide.js';
+import { runTestCode } from './pyodide.js';
+
+// Último resultado de cada test junto a la huella de sus dependencias
+const resultCache = new Map();
 
 /**
- * Ejecuta tests definidos en el código Python
- * Busca funciones que empiecen con "test_" y las ejecuta
+ * Convierte un string JS en un literal de string Python válido
  */
-export async function runTests(code, timeout = 30000) {
-  const testRunnerCode = `
-import sys
-import traceback
-from io import StringIO
+function toPythonString(text) {
+  return JSON.stringify(text);
+}
 
-# Código del usuario
-${code}
+/**
+ * Harness que descubre funciones test_* y métodos test* de TestCase.
+ *
+ * Para cada test calcula también el cierre de definiciones de nivel
+ * superior de las que depende (funciones, clases, asignaciones e imports
+ * que referencia, directa o indirectamente) y una huella de ese cierre.
+ * Las sentencias sin nombre (prints, bucles...) se ejecutan con cada test,
+ * así que forman parte de todas las huellas.
+ */
+function buildDiscoveryHarness(code) {
+  return `
+import ast
+import hashlib
+
+def _bound_names(node):
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return [node.name]
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return [(alias.asname or alias.name).split('.')[0] for alias in node.names]
+    if isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        return [n.id for target in targets for n in ast.walk(target) if isinstance(n, ast.Name)]
+    return []
 
-# Descubrir funciones de test
-test_functions = [name for name in dir() if name.startswith('test_') and callable(globals()[name])]
+def _is_main_guard(node):
+    return (
+        isinstance(node, ast.If)
+        and isinstance(node.test, ast.Compare)
+        and isinstance(node.test.left, ast.Name)
+        and node.test.left.id == '__name__'
+    )
 
-results = []
+def _referenced_names(node):
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
 
-for test_name in test_functions:
-    test_func = globals()[test_name]
-    result = {
-        'name': test_name,
-        'passed': False,
-        'message': '',
-        'error': None
-    }
-    
+def _discover(source):
     try:
-        # Ejecutar el test
-        test_func()
-        result['passed'] = True
-        result['message'] = 'Test pasado exitosamente'
-    except AssertionError as e:
-        result['passed'] = False
-        result['message'] = f'Assertion falló: {str(e)}'
-        result['error'] = traceback.format_exc()
-    except Exception as e:
-        result['passed'] = False
-        result['message'] = f'Error: {str(e)}'
-        result['error'] = traceback.format_exc()
-    
-    results.append(result)
-
-# Convertir a formato serializable
-import json
-
-output = {
-    'total': len(results),
-    'passed': sum(1 for r in results if r['passed']),
-    'failed': sum(1 for r in results if not r['passed']),
-    'tests': results
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        return {'error': f'SyntaxError en la línea {e.lineno}: {e.msg}', 'tests': []}
+
+    definitions = {}
+    unnamed = []
+    for node in tree.body:
+        names = _bound_names(node)
+        for name in names:
+            definitions.setdefault(name, []).append(node)
+        if not names and not _is_main_guard(node):
+            unnamed.append(node)
+
+    def fingerprint(root):
+        # Cierre transitivo de las definiciones que alcanza el test
+        seen_nodes = {id(root): root}
+        pending = list(_referenced_names(root))
+        visited = set()
+        while pending:
+            name = pending.pop()
+            if name in visited:
+                continue
+            visited.add(name)
+            for node in definitions.get(name, []):
+                if id(node) not in seen_nodes:
+                    seen_nodes[id(node)] = node
+                    pending.extend(_referenced_names(node))
+
+        nodes = sorted(list(seen_nodes.values()) + unnamed, key=lambda n: n.lineno)
+        digest = hashlib.sha1()
+        for node in nodes:
+            digest.update(ast.dump(node).encode('utf-8'))
+        return sorted(visited & set(definitions)), digest.hexdigest()
+
+    tests = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith('test_'):
+            deps, digest = fingerprint(node)
+            tests.append({'name': node.name, 'kind': 'function', 'deps': deps, 'fingerprint': digest})
+        elif isinstance(node, ast.ClassDef):
+            bases = [ast.unparse(base) for base in node.bases]
+            if not any(base.endswith('TestCase') for base in bases):
+                continue
+            deps, digest = fingerprint(node)
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name.startswith('test'):
+                    tests.append({
+                        'name': f'{node.name}.{item.name}',
+                        'kind': 'unittest',
+                        'deps': deps,
+                        'fingerprint': digest,
+                    })
+    return {'error': None, 'tests': tests}
+
+_discover(${toPythonString(code)})
+`;
 }
 
-json.dumps(output)
+/**
+ * Harness que ejecuta un único test sobre una copia fresca del módulo
+ */
+function buildSingleTestHarness(code, test) {
+  return `
+import sys
+import time
+import types
+import traceback
+import unittest
+
+def _run_single_test(source, name, kind):
+    result = {'name': name, 'passed': False, 'message': '', 'error': None}
+
+    # Namespace propio: ningún test ve el estado que dejó otro
+    module = types.ModuleType('_pyhub_test_case')
+    sys.modules[module.__name__] = module
+    start = time.perf_counter()
+    try:
+        try:
+            exec(compile(source, '<tests>', 'exec'), module.__dict__)
+        except Exception as e:
+            result['message'] = f'Error al cargar el módulo: {e}'
+            result['error'] = traceback.format_exc()
+            return result
+
+        if kind == 'unittest':
+            suite = unittest.defaultTestLoader.loadTestsFromName(name, module)
+            outcome = unittest.TestResult()
+            suite.run(outcome)
+            problems = outcome.failures + outcome.errors
+            if problems:
+                result['message'] = 'Test falló'
+                result['error'] = problems[0][1]
+            elif outcome.skipped:
+                result['passed'] = True
+                result['message'] = f'Test omitido: {outcome.skipped[0][1]}'
+            else:
+                result['passed'] = True
+                result['message'] = 'Test pasado'
+            return result
+
+        try:
+            getattr(module, name)()
+            result['passed'] = True
+            result['message'] = 'Test pasado exitosamente'
+        except AssertionError as e:
+            result['message'] = f'Assertion falló: {str(e)}'
+            result['error'] = traceback.format_exc()
+        except Exception as e:
+            result['message'] = f'Error: {str(e)}'
+            result['error'] = traceback.format_exc()
+        return result
+    finally:
+        result['duration'] = round((time.perf_counter() - start) * 1000, 2)
+        sys.modules.pop(module.__name__, None)
+
+_run_single_test(${toPythonString(code)}, ${toPythonString(test.name)}, ${toPythonString(test.kind)})
 `;
+}
 
-  try {
-    const result = await runPythonCode(testRunnerCode, timeout);
-    
-    if (result.success && result.result) {
-      try {
-        const testResults = JSON.parse(result.result);
-        return {
-          success: true,
-          results: testResults,
-          output: result.output
-        };
-      } catch (parseError) {
-        return {
-          success: false,
-          error: 'Error al parsear resultados de tests',
-          output: result.output
-        };
-      }
-    } else {
-      return {
-        success: false,
-        error: result.error || 'Error al ejecutar tests',
-        output: result.output || result.error
-      };
-    }
-  } catch (error) {
-    return {
-      success: false,
-      error: error.message,
-      output: error.message
-    };
+/**
+ * Descubre los tests del código sin ejecutarlo
+ */
+export async function discoverTests(code) {
+  // El descubrimiento solo usa ast: no importa el código, así que no carga paquetes
+  const result = await runTestCode(buildDiscoveryHarness(code), undefined, { packagesFrom: '' });
+  if (!result.success || !result.result) {
+    throw new Error(result.error || 'Error al descubrir tests');
   }
+
+  const discovery = result.result;
+  if (discovery.error) {
+    throw new Error(discovery.error);
+  }
+  return discovery.tests;
 }
 
 /**
- * Ejecuta tests usando unittest framework de Python
+ * Ejecuta un test en cualquier worker libre y normaliza su resultado
  */
-export async function runUnittests(code, timeout = 30000) {
-  const unittestRunnerCode = `
-import sys
-import unittest
-import json
-from io import StringIO
-
-# Código del usuario
-${code}
-
-# Descubrir y ejecutar tests
-loader = unittest.TestLoader()
-suite = loader.loadTestsFromModule(sys.modules[__name__])
-
-# Ejecutar tests con un custom runner
-stream = StringIO()
-runner = unittest.TextTestRunner(stream=stream, verbosity=2)
-test_result = runner.run(suite)
-
-# Recopilar resultados
-results = {
-    'total': test_result.testsRun,
-    'passed': test_result.testsRun - len(test_result.failures) - len(test_result.errors),
-    'failed': len(test_result.failures) + len(test_result.errors),
-    'tests': []
+async function runSingleTest(code, test, timeout) {
+  const result = await runTestCode(buildSingleTestHarness(code, test), timeout, {
+    packagesFrom: code
+  });
+
+  if (result.success && result.result && typeof result.result === 'object') {
+    return { ...result.result, output: result.stdout || '' };
+  }
+
+  // Timeout, interrupción o fallo del worker: el test cuenta como fallado
+  return {
+    name: test.name,
+    passed: false,
+    message: result.error || 'Error al ejecutar el test',
+    error: result.output || null,
+    duration: null,
+    output: ''
+  };
 }
 
-# Agregar tests exitosos
-for test in suite:
-    if hasattr(test, '_testMethodName'):
-        test_name = f"{test.__class__.__name__}.{test._testMethodName}"
-        
-        # Verificar si falló
-        failed = False
-        error_msg = ''
-        
-        for failure in test_result.failures:
-            if failure[0] == test:
-                failed = True
-                error_msg = failure[1]
-                break
-        
-        for error in test_result.errors:
-            if error[0] == test:
-                failed = True
-                error_msg = error[1]
-                break
-        
-        results['tests'].append({
-            'name': test_name,
-            'passed': not failed,
-            'message': 'Test pasado' if not failed else 'Test falló',
-            'error': error_msg if failed else None
-        })
-
-json.dumps(results)
-`;
+/**
+ * Resume una lista de resultados individuales
+ */
+function summarize(tests) {
+  const passed = tests.filter((test) => test.passed).length;
+  return {
+    total: tests.length,
+    passed,
+    failed: tests.length - passed,
+    tests
+  };
+}
 
+/**
+ * Descubre y ejecuta en paralelo los tests de `kinds`
+ */
+async function runDiscoveredTests(code, timeout, kinds, { onTestResult, incremental = true }) {
   try {
-    const result = await runPythonCode(unittestRunnerCode, timeout);
-    
-    if (result.success && result.result) {
-      try {
-        const testResults = JSON.parse(result.result);
-        return {
-          success: true,
-          results: testResults,
-          output: result.output
-        };
-      } catch (parseError) {
-        return {
-          success: false,
-          error: 'Error al parsear resultados de unittest',
-          output: result.output
-        };
+    const tests = (await discoverTests(code)).filter((test) => kinds.includes(test.kind));
+    const results = new Array(tests.length).fill(null);
+    let reused = 0;
+
+    const report = (index) => {
+      if (onTestResult) {
+        onTestResult(results[index], summarize(results.filter(Boolean)));
       }
-    } else {
-      return {
-        success: false,
-        error: result.error || 'Error al ejecutar unittest',
-        output: result.output || result.error
-      };
-    }
+    };
+
+    await Promise.all(
+      tests.map(async (test, index) => {
+        const cached = resultCache.get(test.name);
+        if (incremental && cached && cached.fingerprint === test.fingerprint) {
+          results[index] = { ...cached.result, cached: true };
+          reused++;
+          report(index);
+          return;
+        }
+
+        const result = await runSingleTest(code, test, timeout);
+        results[index] = result;
+        // Los timeouts e interrupciones no se guardan: deben volver a ejecutarse
+        if (result.duration !== null) {
+          resultCache.set(test.name, { fingerprint: test.fingerprint, result });
+        } else {
+          resultCache.delete(test.name);
+        }
+        report(index);
+      })
+    );
+
+    return {
+      success: true,
+      results: { ...summarize(results), reused },
+      output: results.map((test) => (test.cached ? '' : test.output)).filter(Boolean).join('')
+    };
   } catch (error) {
     return {
       success: false,
@@ -189,6 +283,32 @@ json.dumps(results)
   }
 }
 
+/**
+ * Ejecuta los tests definidos en el código Python: funciones que empiezan
+ * con "test_" y métodos de clases unittest.TestCase.
+ *
+ * `timeout` se aplica a cada test por separado. `onTestResult(test, parcial)`
+ * se llama a medida que termina cada test. Con `incremental: false` se
+ * ignoran los resultados guardados y se ejecuta todo.
+ */
+export async function runTests(code, timeout = 30000, options = {}) {
+  return runDiscoveredTests(code, timeout, ['function', 'unittest'], options);
+}
+
+/**
+ * Ejecuta solo los tests del framework unittest de Python
+ */
+export async function runUnittests(code, timeout = 30000, options = {}) {
+  return runDiscoveredTests(code, timeout, ['unittest'], options);
+}
+
+/**
+ * Olvida los resultados guardados para forzar una ejecución completa
+ */
+export function clearTestCache() {
+  resultCache.clear();
+}
+
 /**
  * Valida el código de tests antes de ejecutarlo
  */
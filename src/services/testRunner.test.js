@@ -0,0 +1,59 @@
+import { describe, it, expect, vi } from 'vitest';
+
+// Worker falso: registra qué imports se cargaron y ejecuta los harness de
+// tests como lo haría Python, fallando si el módulo importa un paquete que
+// nadie cargó
+const worker = vi.hoisted(() => ({ loaded: new Set(), testPayloads: [] }));
+
+vi.mock('./workerClient.js', () => ({
+  createWorkerClient: () => ({
+    async request(type, payload) {
+      if (type === 'loadPackages') {
+        // Como find_imports: solo sentencias import, nunca el contenido de strings
+        for (const match of payload.code.matchAll(/^\s*(?:import|from)\s+(\w+)/gm)) {
+          worker.loaded.add(match[1]);
+        }
+        return {};
+      }
+      if (type === 'test') {
+        worker.testPayloads.push(payload);
+        if (payload.code.includes('_discover(')) {
+          const tests = [{ name: 'test_mean', kind: 'function', deps: [], fingerprint: 'f' }];
+          return { success: true, result: { error: null, tests }, stdout: '' };
+        }
+        const passed = worker.loaded.has('numpy');
+        return {
+          success: true,
+          result: {
+            name: 'test_mean',
+            passed,
+            message: passed ? 'Test pasado exitosamente' : "Error al cargar el módulo: No module named 'numpy'",
+            error: null,
+            duration: 1
+          },
+          stdout: ''
+        };
+      }
+      return {};
+    },
+    terminate() {}
+  })
+}));
+
+const { initializePyodide } = await import('./pyodide.js');
+const { runTests } = await import('./testRunner.js');
+
+describe('runTests', () => {
+  it('carga los paquetes que importa el código del usuario, no los del harness', async () => {
+    await initializePyodide(undefined, { poolSize: 2 });
+    const code = 'import numpy as np\n\ndef test_mean():\n    assert np.mean([1, 2, 3]) == 2\n';
+
+    const outcome = await runTests(code, 5000, { incremental: false });
+
+    expect(worker.loaded.has('numpy')).toBe(true);
+    expect(outcome.success).toBe(true);
+    expect(outcome.results.passed).toBe(1);
+    // packagesFrom lo consume el pool: el worker solo recibe el harness
+    expect(worker.testPayloads.every((payload) => !('packagesFrom' in payload))).toBe(true);
+  });
+});
@@ -0,0 +1,82 @@
+/**
+ * Cliente para hablar con el worker de Pyodide mediante el protocolo
+ * de peticiones/respuestas de workerProtocol.js
+ */
+
+import { RESPONSE_TYPES, createRequest } from './workerProtocol.js';
+
+/**
+ * Crea un worker de Pyodide y devuelve una interfaz basada en promesas.
+ * `onCrash` se llama si el worker falla con un error no capturado.
+ */
+export function createWorkerClient({ onCrash } = {}) {
+  const worker = new Worker(new URL('./pyodide.worker.js', import.meta.url), {
+    type: 'module'
+  });
+  const pending = new Map();
+
+  const rejectAll = (error) => {
+    pending.forEach(({ reject }) => reject(error));
+    pending.clear();
+  };
+
+  worker.onmessage = (event) => {
+    const { id, type, payload } = event.data;
+    const entry = pending.get(id);
+    if (!entry) return;
+
+    if (type === RESPONSE_TYPES.PROGRESS) {
+      if (entry.onProgress) entry.onProgress(payload.message);
+      return;
+    }
+
+    if (type === RESPONSE_TYPES.STREAM) {
+      if (entry.onStream) entry.onStream(payload);
+      return;
+    }
+
+    if (type === RESPONSE_TYPES.FRAME) {
+      if (entry.onFrame) {
+        entry.onFrame(payload);
+      } else if (payload.frame.close) {
+        payload.frame.close();
+      }
+      return;
+    }
+
+    pending.delete(id);
+    if (type === RESPONSE_TYPES.RESULT) {
+      entry.resolve(payload);
+    } else {
+      entry.reject(new Error(payload.message));
+    }
+  };
+
+  worker.onerror = (event) => {
+    event.preventDefault();
+    const error = new Error(`Error en el worker de Pyodide: ${event.message || 'desconocido'}`);
+    rejectAll(error);
+    if (onCrash) onCrash(error);
+  };
+
+  /**
+   * Envía una petición y espera su RESULT o ERROR
+   */
+  function request(type, payload = {}, { onProgress, onStream, onFrame } = {}) {
+    const message = createRequest(type, payload);
+    return new Promise((resolve, reject) => {
+      pending.set(message.id, { resolve, reject, onProgress, onStream, onFrame });
+      worker.postMessage(message);
+    });
+  }
+
+  /**
+   * Detiene el worker y rechaza las peticiones pendientes
+   */
+  function terminate() {
+    worker.terminate();
+    rejectAll(new Error('El worker de Pyodide fue detenido'));
+  }
+
+  return { request, terminate };
+}
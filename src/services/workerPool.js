@@ -0,0 +1,464 @@
+/**
+ * Pool de workers de Pyodide precalentados.
+ *
+ * El worker 0 es el "de sesión": guarda el namespace del usuario y recibe
+ * las ejecuciones del editor, el REPL y el reset. El resto de tareas
+ * (lotes de tests, ejecuciones aisladas) van al primer worker libre.
+ * Las consultas rápidas (autocompletado) prefieren el worker de sesión,
+ * que conoce el namespace, pero si está ocupado usan cualquier otro.
+ * Un worker que se cuelga, falla o agota su timeout se sustituye por uno
+ * nuevo en segundo plano.
+ *
+ * Los paquetes instalados con micropip se instalan en todos los workers y
+ * se recuerdan: un worker nuevo los reinstala antes de aceptar tareas.
+ */
+
+import { createWorkerClient } from './workerClient.js';
+import { REQUEST_TYPES, PROFILE_SIGNAL } from './workerProtocol.js';
+import { createOutputStream } from './outputStream.js';
+import { createFramePlayer } from './framePlayer.js';
+
+export const MAX_POOL_SIZE = 4;
+
+export const AFFINITY = Object.freeze({
+  SESSION: 'session',
+  PREFER_SESSION: 'preferSession',
+  ANY: 'any'
+});
+
+// Buffer compartido con el worker: escribir SIGINT lanza KeyboardInterrupt en Python
+const SIGINT = 2;
+const PROFILE_INTERVAL = 4; // ms entre muestras del perfilador
+const INTERRUPT_GRACE_PERIOD = 1000; // ms antes de reemplazar un worker que no responde
+const RESPAWN_DELAY = 2000; // ms entre reintentos al recrear un worker
+const MAX_RESPAWN_ATTEMPTS = 3;
+
+/**
+ * Tamaño por defecto: un worker por núcleo libre, con un máximo razonable
+ * (cada intérprete ocupa decenas de MB)
+ */
+export function getDefaultPoolSize() {
+  const cores = (typeof navigator !== 'undefined' && navigator.hardwareConcurrency) || 2;
+  return Math.max(1, Math.min(cores - 1, MAX_POOL_SIZE));
+}
+
+/**
+ * Crea un Int32Array compartido si la página está aislada (COOP/COEP)
+ */
+function createSharedInt32() {
+  if (typeof SharedArrayBuffer === 'undefined' || !globalThis.crossOriginIsolated) {
+    return null;
+  }
+  return new Int32Array(new SharedArrayBuffer(4));
+}
+
+/**
+ * Resultado de error con la misma forma que una ejecución fallida
+ */
+function failure(message, extra = {}) {
+  return { success: false, error: message, stderr: '', output: message, figures: [], ...extra };
+}
+
+/**
+ * Crea un pool de `size` workers. El worker de sesión arranca primero
+ * (reportando progreso); los demás se precalientan después en segundo plano.
+ */
+export function createWorkerPool({ size = getDefaultPoolSize(), onProgress } = {}) {
+  const slots = new Array(size).fill(null);
+  const queue = [];
+  const installed = []; // paquetes de micropip, en orden de instalación
+  let terminated = false;
+
+  /**
+   * Crea un worker en la posición `index` y lo inicializa
+   */
+  function spawnSlot(index, progress, attempt = 1) {
+    const slot = {
+      index,
+      client: null,
+      interruptBuffer: createSharedInt32(),
+      streamAckBuffer: createSharedInt32(),
+      frameAckBuffer: createSharedInt32(),
+      ready: false,
+      failed: false,
+      task: null
+    };
+    slot.client = createWorkerClient({ onCrash: () => replaceSlot(slot) });
+    slots[index] = slot;
+
+    slot.readyPromise = slot.client
+      .request(
+        REQUEST_TYPES.INIT,
+        {
+          interruptBuffer: slot.interruptBuffer,
+          streamAckBuffer: slot.streamAckBuffer,
+          frameAckBuffer: slot.frameAckBuffer
+        },
+        { onProgress: progress }
+      )
+      .then(() => replayInstalls(slot))
+      .then(() => {
+        slot.ready = true;
+        dispatch();
+      })
+      .catch((error) => {
+        if (slots[index] !== slot || terminated) return;
+        slot.client.terminate();
+        if (attempt < MAX_RESPAWN_ATTEMPTS) {
+          setTimeout(() => {
+            if (slots[index] === slot && !terminated) spawnSlot(index, null, attempt + 1);
+          }, RESPAWN_DELAY);
+        } else {
+          slot.failed = true;
+          console.error(`No se pudo iniciar el worker ${index} de Pyodide:`, error);
+          dispatch();
+        }
+        throw error;
+      });
+
+    return slot;
+  }
+
+  /**
+   * Reinstala en un worker recién arrancado los paquetes de micropip
+   * (incluidos los que se instalen mientras tanto)
+   */
+  async function replayInstalls(slot) {
+    for (let i = 0; i < installed.length; i++) {
+      const result = await slot.client.request(REQUEST_TYPES.INSTALL, { packageName: installed[i] });
+      if (!result.success) {
+        console.warn(`No se pudo reinstalar '${installed[i]}' en el worker ${slot.index}:`, result.error);
+      }
+    }
+  }
+
+  /**
+   * Sustituye un worker colgado o caído por uno nuevo
+   */
+  function replaceSlot(slot) {
+    if (slots[slot.index] !== slot || terminated) return;
+    slot.client.terminate();
+    spawnSlot(slot.index).readyPromise.catch(() => {});
+  }
+
+  /**
+   * Elige un worker libre para la tarea (o null si no hay ninguno)
+   */
+  function pickSlot(task) {
+    const idle = slots.filter((slot) => slot && slot.ready && !slot.task);
+    if (task.slotIndex !== undefined) {
+      return idle.find((slot) => slot.index === task.slotIndex) || null;
+    }
+    if (task.affinity === AFFINITY.SESSION) {
+      return idle.find((slot) => slot.index === 0) || null;
+    }
+    if (task.affinity === AFFINITY.PREFER_SESSION) {
+      return idle.find((slot) => slot.index === 0) || idle[0] || null;
+    }
+    return idle.find((slot) => slot.index !== 0) || idle[0] || null;
+  }
+
+  /**
+   * Asigna las tareas en cola a los workers libres
+   */
+  function dispatch() {
+    // Las tareas fijadas a un worker que no pudo arrancar no pueden avanzar
+    for (let i = queue.length - 1; i >= 0; i--) {
+      const task = queue[i];
+      const target = task.slotIndex !== undefined
+        ? task.slotIndex
+        : task.affinity === AFFINITY.SESSION ? 0 : -1;
+      if (target !== -1 && slots[target] && slots[target].failed) {
+        queue.splice(i, 1);
+        task.resolve(failure(target === 0
+          ? 'El worker principal de Pyodide no está disponible'
+          : `El worker ${target} de Pyodide no está disponible`));
+      }
+    }
+
+    for (let i = 0; i < queue.length; ) {
+      const slot = pickSlot(queue[i]);
+      if (!slot) {
+        i++;
+        continue;
+      }
+      const [task] = queue.splice(i, 1);
+      execute(slot, task);
+    }
+  }
+
+  /**
+   * Interrumpe la tarea que corre en un worker
+   */
+  function interruptSlot(slot, reason) {
+    const task = slot.task;
+    if (!task || task.reason) {
+      return false;
+    }
+
+    task.reason = reason;
+
+    if (!slot.interruptBuffer) {
+      replaceSlot(slot);
+      return true;
+    }
+
+    Atomics.store(slot.interruptBuffer, 0, SIGINT);
+    setTimeout(() => {
+      if (slot.task === task) {
+        replaceSlot(slot);
+      }
+    }, INTERRUPT_GRACE_PERIOD);
+    return true;
+  }
+
+  /**
+   * Ejecuta una tarea en el worker indicado
+   */
+  async function execute(slot, task) {
+    slot.task = task;
+    try {
+      task.resolve(await runOnSlot(slot, task));
+    } catch (error) {
+      task.reject(error);
+    } finally {
+      slot.task = null;
+      dispatch();
+    }
+  }
+
+  /**
+   * Carga paquetes, arma el timeout y el streaming, y lanza la petición
+   */
+  async function runOnSlot(slot, task) {
+    const { type, timeout, onProgress, onOutput, onFrame } = task;
+    const payload = { ...task.payload };
+
+    // Lo que quede en el buffer (una muestra o un SIGINT de la tarea anterior)
+    // no es de esta tarea; desde aquí solo lo escriben su Stop y su timeout
+    if (slot.interruptBuffer) Atomics.store(slot.interruptBuffer, 0, 0);
+
+    // Los paquetes que importa el código se descargan antes de empezar a contar el timeout.
+    // Si `code` es un harness que lleva el código del usuario dentro de un literal,
+    // packagesFrom trae ese código tal cual (find_imports no mira dentro de strings).
+    const packageSource =
+      typeof payload.packagesFrom === 'string' ? payload.packagesFrom : payload.code;
+    delete payload.packagesFrom;
+    if (typeof packageSource === 'string') {
+      try {
+        await slot.client.request(
+          REQUEST_TYPES.LOAD_PACKAGES,
+          { code: packageSource },
+          { onProgress }
+        );
+      } catch (error) {
+        return failure(task.reason || `Error al cargar paquetes: ${error.message}`);
+      }
+      // Detenido durante la descarga: el código ya no se ejecuta
+      if (task.reason) {
+        return failure(task.reason);
+      }
+    }
+
+    const stream = onOutput
+      ? createOutputStream({ onUpdate: onOutput, ackBuffer: slot.streamAckBuffer })
+      : null;
+    if (stream) payload.stream = true;
+
+    const player = onFrame
+      ? createFramePlayer({ onFrame, ackBuffer: slot.frameAckBuffer })
+      : null;
+    if (player) payload.frames = true;
+
+    // Muestreo: se pide una muestra solo si el buffer está libre (nunca se pisa un SIGINT).
+    // En modo memoria la misma señal vigila el pico; sin buffer solo se mide al final.
+    if (payload.profile === 'sampling' && !slot.interruptBuffer) {
+      payload.profile = 'deterministic';
+    }
+    const sampler =
+      slot.interruptBuffer && (payload.profile === 'sampling' || payload.profile === 'memory')
+        ? setInterval(() => {
+            Atomics.compareExchange(slot.interruptBuffer, 0, 0, PROFILE_SIGNAL);
+          }, PROFILE_INTERVAL)
+        : null;
+
+    const timer = timeout
+      ? setTimeout(() => {
+          interruptSlot(slot, 'Timeout: El código tardó más de ' + (timeout/1000) + ' segundos');
+        }, timeout)
+      : null;
+
+    try {
+      const result = await slot.client.request(type, payload, {
+        onProgress,
+        onStream: stream ? stream.push : undefined,
+        onFrame: player ? player.push : undefined
+      });
+      if (task.reason) {
+        return {
+          ...result,
+          success: false,
+          error: task.reason,
+          output: (result.stderr || '') + task.reason
+        };
+      }
+      return result;
+    } catch (error) {
+      return failure(task.reason || error.message || String(error));
+    } finally {
+      if (timer) clearTimeout(timer);
+      if (sampler) clearInterval(sampler);
+      if (stream) stream.close();
+      if (player) player.close();
+    }
+  }
+
+  /**
+   * Encola una petición y devuelve su resultado.
+   *
+   * @param {Object} options
+   * @param {string} options.type - Uno de REQUEST_TYPES
+   * @param {Object} [options.payload] - `packagesFrom` (opcional) es el código
+   *   cuyos imports se cargan en vez de los de `code`; no llega al worker
+   * @param {number} [options.timeout] - ms; sin timeout si se omite
+   * @param {string} [options.affinity] - AFFINITY.SESSION o AFFINITY.ANY
+   * @param {number} [options.slotIndex] - Fija la tarea a un worker (ignora affinity)
+   * @param {Function} [options.onProgress]
+   * @param {Function} [options.onOutput] - Activa el streaming de salida
+   * @param {Function} [options.onFrame] - Activa la reproducción de animaciones
+   * @param {AbortSignal} [options.signal] - Cancela la tarea si aún está en cola
+   */
+  function run({
+    type,
+    payload = {},
+    timeout = null,
+    affinity = AFFINITY.SESSION,
+    slotIndex,
+    onProgress,
+    onOutput,
+    onFrame,
+    signal
+  }) {
+    if (terminated) {
+      return Promise.reject(new Error('El pool de Pyodide fue detenido'));
+    }
+    if (signal && signal.aborted) {
+      return Promise.resolve(failure('Cancelado'));
+    }
+    return new Promise((resolve, reject) => {
+      const task = {
+        type,
+        payload,
+        timeout,
+        affinity,
+        slotIndex,
+        onProgress,
+        onOutput,
+        onFrame,
+        resolve,
+        reject,
+        reason: null
+      };
+      queue.push(task);
+
+      if (signal) {
+        signal.addEventListener(
+          'abort',
+          () => {
+            const index = queue.indexOf(task);
+            if (index !== -1) {
+              queue.splice(index, 1);
+              resolve(failure('Cancelado'));
+            }
+          },
+          { once: true }
+        );
+      }
+      dispatch();
+    });
+  }
+
+  /**
+   * Instala un paquete con micropip: primero en el worker de sesión y, si
+   * funciona, en los demás, para que los tests que lo importan funcionen en
+   * cualquier worker. Los que aún arrancan lo instalan al terminar.
+   */
+  async function install(packageName) {
+    const result = await run({ type: REQUEST_TYPES.INSTALL, payload: { packageName } });
+    if (!result.success) {
+      return result;
+    }
+    installed.push(packageName);
+    await Promise.all(
+      slots
+        .filter((slot) => slot && slot.index !== 0 && slot.ready)
+        .map((slot) =>
+          run({ type: REQUEST_TYPES.INSTALL, payload: { packageName }, slotIndex: slot.index }).then(
+            (other) => {
+              if (!other.success) {
+                console.warn(`No se pudo instalar '${packageName}' en el worker ${slot.index}:`, other.error);
+              }
+            }
+          )
+        )
+    );
+    return result;
+  }
+
+  /**
+   * Interrumpe todas las tareas en ejecución y descarta las que esperan en cola
+   */
+  function stop(reason) {
+    let stopped = false;
+    slots.forEach((slot) => {
+      if (slot && interruptSlot(slot, reason)) stopped = true;
+    });
+    queue.splice(0).forEach((task) => {
+      task.resolve(failure(reason));
+      stopped = true;
+    });
+    return stopped;
+  }
+
+  /**
+   * Restaura el namespace de sesión; si falla, reemplaza el worker de sesión
+   */
+  async function resetSession() {
+    try {
+      const result = await run({ type: REQUEST_TYPES.RESET });
+      if (result.success) {
+        return result;
+      }
+    } catch (error) {
+      console.warn('Error al restaurar el snapshot, reiniciando worker:', error);
+    }
+
+    replaceSlot(slots[0]);
+    try {
+      await slots[0].readyPromise;
+      return { success: true, message: 'Entorno reiniciado (worker nuevo)' };
+    } catch (error) {
+      return { success: false, error: error.message };
+    }
+  }
+
+  /**
+   * Detiene todos los workers y rechaza las tareas en cola
+   */
+  function terminate() {
+    terminated = true;
+    slots.forEach((slot) => slot && slot.client.terminate());
+    queue.splice(0).forEach((task) => task.reject(new Error('El pool de Pyodide fue detenido')));
+  }
+
+  // El worker de sesión primero; el resto se precalienta cuando ya hay
+  // caché (Service Worker y snapshot) para no competir por la red
+  // (sin reintentos: si el arranque inicial falla, el error llega al usuario)
+  const ready = spawnSlot(0, onProgress, MAX_RESPAWN_ATTEMPTS).readyPromise.then(() => {
+    for (let index = 1; index < size; index++) {
+      spawnSlot(index).readyPromise.catch(() => {});
+    }
+  });
+
+  return { ready, run, install, stop, resetSession, terminate, size };
+}
@@ -0,0 +1,81 @@
+import { describe, it, expect, vi } from 'vitest';
+
+// Workers falsos: INIT responde al momento y LOAD_PACKAGES espera a que el
+// test lo suelte, como una descarga lenta de numpy
+const workers = vi.hoisted(() => ({ clients: [], releaseLoad: null }));
+
+vi.mock('./workerClient.js', () => ({
+  createWorkerClient: ({ onCrash }) => {
+    const client = {
+      requests: [],
+      crash: onCrash,
+      request(type, payload) {
+        client.requests.push([type, payload]);
+        if (type === 'loadPackages') {
+          return new Promise((resolve) => {
+            workers.releaseLoad = () => resolve({});
+          });
+        }
+        return Promise.resolve({ success: true, output: '', stdout: '', stderr: '', figures: [] });
+      },
+      terminate() {}
+    };
+    workers.clients.push(client);
+    return client;
+  }
+}));
+
+// El pool solo usa el buffer de interrupción si la página está aislada
+globalThis.crossOriginIsolated = true;
+
+const { createWorkerPool } = await import('./workerPool.js');
+const { REQUEST_TYPES } = await import('./workerProtocol.js');
+
+const sent = (client, type) => client.requests.filter(([sentType]) => sentType === type);
+
+/**
+ * Espera a que el pool termine de arrancar los workers en segundo plano
+ */
+const settle = () => new Promise((resolve) => setTimeout(resolve, 0));
+
+describe('createWorkerPool', () => {
+  it('no ejecuta el código si se detiene mientras carga paquetes', async () => {
+    workers.clients.length = 0;
+    const pool = createWorkerPool({ size: 1 });
+    await pool.ready;
+    const [session] = workers.clients;
+
+    const pending = pool.run({ type: REQUEST_TYPES.RUN, payload: { code: 'import numpy' } });
+    await Promise.resolve();
+    expect(sent(session, REQUEST_TYPES.LOAD_PACKAGES).length).toBe(1);
+
+    expect(pool.stop('Ejecución detenida')).toBe(true);
+    workers.releaseLoad();
+    const result = await pending;
+
+    expect(result.success).toBe(false);
+    expect(result.error).toBe('Ejecución detenida');
+    expect(sent(session, REQUEST_TYPES.RUN).length).toBe(0);
+    pool.terminate();
+  });
+
+  it('instala los paquetes de micropip en todos los workers, también en los nuevos', async () => {
+    workers.clients.length = 0;
+    const pool = createWorkerPool({ size: 2 });
+    await pool.ready;
+    await settle();
+
+    const result = await pool.install('snowballstemmer');
+    expect(result.success).toBe(true);
+    expect(workers.clients.map((client) => sent(client, REQUEST_TYPES.INSTALL).length)).toEqual([1, 1]);
+
+    // Un worker que se cae se sustituye y reinstala el paquete al arrancar
+    workers.clients[1].crash();
+    await settle();
+    const replacement = workers.clients[2];
+    expect(sent(replacement, REQUEST_TYPES.INSTALL)).toEqual([
+      [REQUEST_TYPES.INSTALL, { packageName: 'snowballstemmer' }]
+    ]);
+    pool.terminate();
+  });
+});
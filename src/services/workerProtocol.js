@@ -0,0 +1,97 @@
+/**
+ * Protocolo de mensajes entre el hilo principal y el worker de Pyodide
+ *
+ * Cada petición lleva un `id` único. El worker responde con el mismo `id`:
+ * cero o más mensajes PROGRESS, STREAM o FRAME seguidos de exactamente un RESULT
+ * o ERROR.
+ */
+
+/**
+ * Tipos de petición que acepta el worker
+ */
+export const REQUEST_TYPES = Object.freeze({
+  INIT: 'init',
+  LOAD_PACKAGES: 'loadPackages',
+  RUN: 'run',
+  RESET: 'reset',
+  INSTALL: 'install',
+  TEST: 'test',
+  REPL: 'repl',
+  COMPLETE: 'complete',
+  ANALYZE: 'analyze'
+});
+
+/**
+ * Tipos de respuesta que emite el worker
+ */
+export const RESPONSE_TYPES = Object.freeze({
+  PROGRESS: 'progress',
+  STREAM: 'stream',
+  FRAME: 'frame',
+  RESULT: 'result',
+  ERROR: 'error'
+});
+
+/**
+ * Señal que el hilo principal escribe en el buffer de interrupción para que
+ * el perfilador de muestreo anote la pila en curso (SIGPROF)
+ */
+export const PROFILE_SIGNAL = 27;
+
+/**
+ * @typedef {Object} WorkerRequest
+ * @property {number} id - Identificador de la petición
+ * @property {string} type - Uno de REQUEST_TYPES
+ * @property {Object} payload - Datos específicos de cada tipo
+ *
+ * Payloads:
+ *   INIT    { interruptBuffer, streamAckBuffer, frameAckBuffer: Int32Array | null } (SharedArrayBuffer)
+ *   LOAD_PACKAGES { code: string } (carga los paquetes que importa el código)
+ *   RUN     { code: string, stream?: boolean, frames?: boolean,
+ *           profile?: 'sampling' | 'deterministic' | 'memory' } (el resultado
+ *           incluye `heapSize` en bytes; con profile también `profile`:
+ *           { mode, duration, samples, functions, lines, flame }, o en memoria
+ *           { mode, duration, peak, current, allocations, retained, survivors, heap })
+ *   RESET   {}
+ *   INSTALL { packageName: string }
+ *   TEST    { code: string }
+ *   REPL    { line: string } (una línea de la consola; responde con `status`:
+ *           'complete', 'incomplete' o 'syntax-error')
+ *   COMPLETE { source: string, line: number, column: number } (posición en base 1;
+ *           responde { items: [{ label, kind }], module: string | null })
+ *   ANALYZE { sources: string[] } (bloques de nivel superior; responde
+ *           { blocks: [...] } con el análisis de cada bloque, en el mismo orden)
+ */
+
+/**
+ * @typedef {Object} WorkerResponse
+ * @property {number} id - Identificador de la petición original
+ * @property {string} type - Uno de RESPONSE_TYPES
+ * @property {Object} payload - PROGRESS: { message }, RESULT: resultado, ERROR: { message }
+ *
+ * STREAM { seq: number, segments: [{ stream: 'stdout'|'stderr', text }], dropped: number }
+ *   `seq` crece con cada lote; el hilo principal lo confirma escribiéndolo en
+ *   streamAckBuffer una vez pintado. `dropped` cuenta los caracteres
+ *   descartados por el buffer circular del worker.
+ *
+ * FRAME { seq: number, frame: ImageBitmap | ImageData, dropped: number }
+ *   Un frame de animación (transferido). Igual que en STREAM, `seq` se
+ *   confirma en frameAckBuffer al mostrarlo; `dropped` cuenta los frames
+ *   descartados en el worker desde el anterior.
+ */
+
+let nextRequestId = 1;
+
+/**
+ * Crea una petición con un id único
+ */
+export function createRequest(type, payload = {}) {
+  return { id: nextRequestId++, type, payload };
+}
+
+/**
+ * Crea una respuesta para la petición indicada
+ */
+export function createResponse(id, type, payload = {}) {
+  return { id, type, payload };
+}
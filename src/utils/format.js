@@ -0,0 +1,19 @@
+/**
+ * Formateo de magnitudes para la interfaz
+ */
+
+const BYTE_UNITS = ['B', 'KB', 'MB', 'GB'];
+
+/**
+ * Tamaño en bytes con la unidad más cómoda ("1.5 MB")
+ */
+export function formatBytes(bytes) {
+  let value = bytes;
+  let unit = 0;
+  while (Math.abs(value) >= 1024 && unit < BYTE_UNITS.length - 1) {
+    value /= 1024;
+    unit++;
+  }
+  const digits = unit === 0 || value >= 100 ? 0 : 1;
+  return `${value.toFixed(digits)} ${BYTE_UNITS[unit]}`;
+}
@@ -0,0 +1,39 @@
+/**
+ * Acceso mínimo a IndexedDB: una base de datos con un único object store
+ * sin keyPath (las claves se pasan al guardar)
+ */
+
+/**
+ * Abre (o crea) la base de datos con su object store
+ */
+function openDatabase(dbName, storeName) {
+  return new Promise((resolve, reject) => {
+    const request = indexedDB.open(dbName, 1);
+    request.onupgradeneeded = () => {
+      request.result.createObjectStore(storeName);
+    };
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+/**
+ * Devuelve withStore(mode, operation): ejecuta una operación sobre el object
+ * store en una transacción y devuelve su resultado cuando esta termina
+ */
+export function createIdbStore(dbName, storeName) {
+  return async function withStore(mode, operation) {
+    const db = await openDatabase(dbName, storeName);
+    try {
+      return await new Promise((resolve, reject) => {
+        const transaction = db.transaction(storeName, mode);
+        const request = operation(transaction.objectStore(storeName));
+        transaction.oncomplete = () => resolve(request.result);
+        transaction.onerror = () => reject(transaction.error);
+        transaction.onabort = () => reject(transaction.error);
+      });
+    } finally {
+      db.close();
+    }
+  };
+}
@@ -0,0 +1,133 @@
+/**
+ * Almacén de líneas por bloques para salidas muy grandes
+ *
+ * Las líneas se guardan en bloques de tamaño fijo, así que localizar la
+ * línea N es O(1) y añadir texto nunca copia lo ya almacenado. No hay
+ * truncado: la salida completa sigue disponible para búsqueda y scroll.
+ */
+
+export const LINES_PER_CHUNK = 4096;
+const MAX_SEARCH_RESULTS = 10000;
+
+/**
+ * Crea un almacén de líneas vacío
+ */
+export function createLineStore() {
+  let chunks = [[]];
+  let partial = ''; // última línea, todavía sin salto de línea final
+  let completeLines = 0;
+  let totalChars = 0;
+
+  /**
+   * Guarda una línea completa en el bloque que le corresponde
+   */
+  function pushLine(line) {
+    let chunk = chunks[chunks.length - 1];
+    if (chunk.length === LINES_PER_CHUNK) {
+      chunk = [];
+      chunks.push(chunk);
+    }
+    chunk.push(line);
+    completeLines++;
+  }
+
+  /**
+   * Añade texto al final; puede contener cualquier número de saltos de línea
+   */
+  function append(text) {
+    if (!text) return;
+    totalChars += text.length;
+
+    const pieces = text.split('\n');
+    pieces[0] = partial + pieces[0];
+    partial = pieces.pop();
+    for (const line of pieces) {
+      pushLine(line);
+    }
+  }
+
+  /**
+   * Vacía el almacén
+   */
+  function clear() {
+    chunks = [[]];
+    partial = '';
+    completeLines = 0;
+    totalChars = 0;
+  }
+
+  /**
+   * Sustituye todo el contenido por `text`
+   */
+  function reset(text = '') {
+    clear();
+    append(text);
+  }
+
+  /**
+   * Número de líneas (la última puede estar incompleta)
+   */
+  function lineCount() {
+    if (completeLines === 0 && partial === '') return 0;
+    return completeLines + 1;
+  }
+
+  /**
+   * Devuelve la línea `index` (base 0)
+   */
+  function getLine(index) {
+    if (index === completeLines) return partial;
+    if (index < 0 || index > completeLines) return undefined;
+    return chunks[Math.floor(index / LINES_PER_CHUNK)][index % LINES_PER_CHUNK];
+  }
+
+  /**
+   * Devuelve las líneas del rango [start, end)
+   */
+  function getLines(start, end) {
+    const lines = [];
+    const last = Math.min(end, lineCount());
+    for (let index = Math.max(0, start); index < last; index++) {
+      lines.push(getLine(index));
+    }
+    return lines;
+  }
+
+  /**
+   * Busca `query` (sin distinguir mayúsculas) y devuelve los índices de
+   * las líneas que lo contienen, hasta MAX_SEARCH_RESULTS
+   */
+  function search(query, limit = MAX_SEARCH_RESULTS) {
+    const matches = [];
+    if (!query) return matches;
+    const needle = query.toLowerCase();
+    const total = lineCount();
+
+    for (let index = 0; index < total && matches.length < limit; index++) {
+      const line = getLine(index);
+      if (line.length >= needle.length && line.toLowerCase().includes(needle)) {
+        matches.push(index);
+      }
+    }
+    return matches;
+  }
+
+  /**
+   * Todo el contenido como un único string (solo para salidas pequeñas)
+   */
+  function getText() {
+    return getLines(0, lineCount()).join('\n');
+  }
+
+  return {
+    append,
+    clear,
+    reset,
+    lineCount,
+    getLine,
+    getLines,
+    search,
+    getText,
+    charCount: () => totalChars
+  };
+}
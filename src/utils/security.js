@@ -78,10 +78,29 @@ export function limitOutput(output, maxLength = 10000) {
   return output;
 }
 
+const DEFAULT_TIMEOUT = 30000; // ms
+const MAX_TIMEOUT = 90000; // ms
+// Multiplicador por nivel de bucles anidados de tamaño variable: O(1), O(n), O(n²), O(n³+)
+const ORDER_FACTORS = [1, 2, 6, 20];
+
 /**
- * Estima el tiempo de ejecución basado en el código
+ * Estima el tiempo de ejecución basado en el código.
+ *
+ * Con el resultado de analyzeSource (services/codeAnalysis.js) la
+ * estimación usa el coste estimado por el análisis estático (bucles
+ * anidados, recursión y operaciones O(n) dentro de bucles); sin él, se
+ * guía por la longitud del código.
  */
-export function estimateExecutionTime(code) {
+export function estimateExecutionTime(code, analysis = null) {
+  if (analysis) {
+    const { order, recursive, hotspots } = analysis.estimate;
+    let estimatedTime = analysis.lines.code * 10;
+    estimatedTime *= ORDER_FACTORS[Math.min(order, ORDER_FACTORS.length - 1)];
+    if (recursive) estimatedTime *= 3;
+    estimatedTime *= 1 + hotspots * 0.5;
+    return Math.min(estimatedTime, MAX_TIMEOUT);
+  }
+
   // Heurística simple
   const lines = code.split('\n').length;
   const hasLoops = /for\s+\w+\s+in|while/.test(code);
@@ -96,11 +115,17 @@ export function estimateExecutionTime(code) {
 }
 
 /**
- * Configura timeout dinámico basado en el código
+ * Configura timeout dinámico basado en el código.
+ * La descarga de paquetes no cuenta: el pool la espera antes de armar el
+ * timeout. Aun así nunca baja de DEFAULT_TIMEOUT, porque la estimación
+ * (milisegundos por línea) se queda muy corta con llamadas caras en pocas
+ * líneas (np.linalg, un fit) y el primer import de numpy o matplotlib
+ * inicializa el módulo dentro del tiempo de ejecución. El código con
+ * patrones cuadráticos o recursión recibe más margen.
  */
-export function getRecommendedTimeout(code) {
-  const estimated = estimateExecutionTime(code);
-  return Math.max(5000, Math.min(estimated, 30000));
+export function getRecommendedTimeout(code, analysis = null) {
+  const estimated = estimateExecutionTime(code, analysis);
+  return Math.max(DEFAULT_TIMEOUT, Math.min(estimated, MAX_TIMEOUT));
 }
 
 /**
@@ -0,0 +1,5 @@
+"""Pone la raíz del repositorio en sys.path para importar pyhub."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
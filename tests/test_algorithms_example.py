@@ -0,0 +1,61 @@
+"""Tests de las ordenaciones tipadas de public/examples/algorithms.py.
+
+El ejemplo ejecuta sus demos al importarse; aquí solo se cargan los
+imports, las constantes y las definiciones.
+"""
+import ast
+import os
+from array import array
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('matplotlib')
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'public', 'examples', 'algorithms.py')
+
+def load_definitions(path):
+    with open(path, encoding='utf-8') as source:
+        tree = ast.parse(source.read(), path)
+    kept = (ast.Import, ast.ImportFrom, ast.Try, ast.FunctionDef, ast.ClassDef)
+    tree.body = [node for node in tree.body
+                 if isinstance(node, kept)
+                 or (isinstance(node, ast.Assign)
+                     and all(isinstance(t, ast.Name) and t.id.isupper() for t in node.targets))]
+    namespace = {'__file__': path, '__name__': 'algorithms'}
+    exec(compile(tree, path, 'exec'), namespace)
+    return namespace
+
+@pytest.fixture(scope='module')
+def algorithms():
+    import matplotlib
+    matplotlib.use('Agg')
+    return load_definitions(EXAMPLE)
+
+@pytest.mark.parametrize('sort', ['radix_sort', 'merge_sort_typed'])
+@pytest.mark.parametrize('data', [[], [5]])
+def test_trivial_lists(algorithms, sort, data):
+    expected = list(data)
+    assert algorithms[sort](data) == expected
+
+@pytest.mark.parametrize('sort', ['radix_sort', 'merge_sort_typed'])
+def test_empty_typed_inputs(algorithms, sort):
+    assert algorithms[sort](np.array([], dtype=np.int32)).size == 0
+    assert len(algorithms[sort](array('i'))) == 0
+
+def test_radix_sort_rejects_floats(algorithms):
+    with pytest.raises(TypeError):
+        algorithms['radix_sort']([2.5, 1.0])
+
+@pytest.mark.parametrize('high', [1_000, 2**40])  # counting sort y radix LSD
+def test_radix_sort_in_place(algorithms, high):
+    values = np.random.default_rng(0).integers(-high, high, 5_000)
+    data = values.tolist()
+    assert algorithms['radix_sort'](data) is data
+    assert data == sorted(values.tolist())
+
+def test_radix_sort_array(algorithms):
+    data = array('i', [3, -1, 2, -1, 0])
+    algorithms['radix_sort'](data)
+    assert data.tolist() == [-1, -1, 0, 2, 3]
@@ -0,0 +1,50 @@
+"""Tests de pyhub.benchmark."""
+import json
+import math
+
+import pytest
+
+from pyhub import BenchmarkResult, benchmark, fit_complexity
+
+SIZES = [2 ** k for k in range(7, 17)]
+
+@pytest.mark.parametrize('model, cost', [
+    ('O(n)', lambda n: 3e-8 * n),
+    ('O(n log n)', lambda n: 5e-9 * n * math.log2(n)),
+    ('O(n²)', lambda n: 1e-10 * n * n),
+])
+def test_fit_complexity_picks_model(model, cost):
+    fit = fit_complexity(SIZES, [cost(n) for n in SIZES])
+    assert fit['model'] == model
+    assert fit['error'] == pytest.approx(0, abs=1e-9)
+
+@pytest.mark.parametrize('model, cost, exponent', [
+    ('O(n)', lambda n: 3e-8 * n, 1.0),
+    ('O(n log n)', lambda n: 5e-9 * n * math.log2(n), 1.1),
+    ('O(n²)', lambda n: 1e-10 * n * n, 2.0),
+])
+def test_fit_complexity_tolerates_noise(model, cost, exponent):
+    # ±10 % alternado, como el ruido de un reloj real
+    times = [cost(n) * (1.1 if i % 2 else 0.9) for i, n in enumerate(SIZES)]
+    fit = fit_complexity(SIZES, times)
+    assert fit['model'] == model
+    assert fit['exponent'] == pytest.approx(exponent, abs=0.1)
+
+def test_fit_complexity_ignores_small_sizes():
+    # Por debajo de n=100 domina el coste fijo de la llamada
+    sizes = [1, 10] + SIZES
+    times = [1e-3, 1e-3] + [3e-8 * n for n in SIZES]
+    assert fit_complexity(sizes, times)['model'] == 'O(n)'
+
+def test_fit_complexity_needs_two_points():
+    assert fit_complexity([1000], [1e-3]) is None
+    assert fit_complexity([], []) is None
+
+def test_benchmark_measures_every_size():
+    result = benchmark({'sum': sum}, [100, 1000], lambda n: list(range(n)),
+                       repeats=3, warmup=0, verbose=False)
+    assert isinstance(result, BenchmarkResult)
+    assert [row['size'] for row in result.results['sum']] == [100, 1000]
+    assert all(row['median_ns'] > 0 for row in result.results['sum'])
+    data = json.loads(result.to_json())
+    assert data['results']['sum'][0]['size'] == 100
@@ -0,0 +1,106 @@
+"""Tests de pyhub.graph."""
+import math
+import random
+
+import pytest
+
+from pyhub.graph import (Graph, astar, bidirectional_dijkstra, dijkstra, euclidean,
+                         random_graph)
+
+def brute_force_distances(num_nodes, edges, source):
+    """Bellman-Ford sin optimizar: relaja todas las aristas n-1 veces"""
+    dist = [math.inf] * num_nodes
+    dist[source] = 0.0
+    for _ in range(num_nodes - 1):
+        for u, v, weight in edges:
+            if dist[u] + weight < dist[v]:
+                dist[v] = dist[u] + weight
+    return dist
+
+def random_edges(rng, num_nodes, num_edges):
+    return [(rng.randrange(num_nodes), rng.randrange(num_nodes), rng.randint(1, 20))
+            for _ in range(num_edges)]
+
+def path_length(graph, path):
+    adjacency = graph.to_dict()
+    return sum(adjacency[u][v] for u, v in zip(path, path[1:]))
+
+@pytest.mark.parametrize('seed', range(20))
+def test_dijkstra_matches_brute_force(seed):
+    rng = random.Random(seed)
+    num_nodes = rng.randint(1, 30)
+    edges = random_edges(rng, num_nodes, rng.randint(0, 80))
+    graph = Graph.from_edges(num_nodes, edges)
+    paths = dijkstra(graph, 0)
+    expected = brute_force_distances(num_nodes, edges, 0)
+    for node in range(num_nodes):
+        assert paths.distance(node) == expected[node]
+        path = paths.path(node)
+        if expected[node] == math.inf:
+            assert path is None
+        else:
+            assert path[0] == 0 and path[-1] == node
+            assert path_length(graph, path) == expected[node]
+
+@pytest.mark.parametrize('seed', range(20))
+def test_astar_without_heuristic_equals_dijkstra(seed):
+    rng = random.Random(seed)
+    num_nodes = rng.randint(2, 30)
+    graph = Graph.from_edges(num_nodes, random_edges(rng, num_nodes, 60))
+    target = rng.randrange(num_nodes)
+    route = astar(graph, 0, target)
+    assert route.distance == dijkstra(graph, 0).distance(target)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_bidirectional_equals_unidirectional(seed):
+    rng = random.Random(seed)
+    num_nodes = rng.randint(2, 30)
+    graph = Graph.from_edges(num_nodes, random_edges(rng, num_nodes, 60))
+    target = rng.randrange(num_nodes)
+    route = bidirectional_dijkstra(graph, 0, target)
+    assert route.distance == dijkstra(graph, 0).distance(target)
+    if route.path is not None:
+        assert route.path[0] == 0 and route.path[-1] == target
+        assert path_length(graph, route.path) == route.distance
+
+def test_unreachable_target():
+    graph = Graph.from_edges(4, [(0, 1, 1.0), (2, 3, 1.0)])
+    assert dijkstra(graph, 0).distance(3) == math.inf
+    assert dijkstra(graph, 0).path(3) is None
+    for search in (astar, bidirectional_dijkstra):
+        route = search(graph, 0, 3)
+        assert route.distance == math.inf
+        assert route.path is None
+
+def test_directed_edges_are_one_way():
+    graph = Graph.from_edges(2, [(0, 1, 5.0)], directed=True)
+    assert dijkstra(graph, 0).distance(1) == 5.0
+    assert dijkstra(graph, 1).distance(0) == math.inf
+    assert bidirectional_dijkstra(graph, 1, 0).path is None
+
+def test_labels_from_dict():
+    graph = Graph.from_dict({'A': {'B': 4, 'C': 2}, 'C': {'B': 1}})
+    paths = dijkstra(graph, 'A')
+    assert paths.distance('B') == 3.0
+    assert paths.path('B') == ['A', 'C', 'B']
+    assert astar(graph, 'A', 'B').path == ['A', 'C', 'B']
+    with pytest.raises(KeyError):
+        dijkstra(graph, 'Z')
+
+def test_negative_weight_rejected():
+    with pytest.raises(ValueError):
+        Graph.from_edges(2, [(0, 1, -1.0)])
+
+@pytest.mark.parametrize('num_nodes', [0, 1])
+def test_random_graph_needs_two_nodes_for_edges(num_nodes):
+    with pytest.raises(ValueError):
+        random_graph(num_nodes, 1, seed=0)
+    graph = random_graph(num_nodes, 0, seed=0)
+    assert (graph.num_nodes, graph.num_edges) == (num_nodes, 0)
+
+def test_astar_euclidean_on_random_graph():
+    graph = random_graph(2000, 10000, seed=1)
+    exact = dijkstra(graph, 0)
+    for target in (1, 500, 1999):
+        route = astar(graph, 0, target, euclidean(graph.coords))
+        assert route.distance == pytest.approx(exact.distance(target))
@@ -4,6 +4,10 @@ import react from '@vitejs/plugin-react';
 export default defineConfig({
   plugins: [react()],
   base: './',
+  worker: {
+    // Los workers de Pyodide importan el runtime como módulo ES
+    format: 'es'
+  },
   build: {
     outDir: 'dist',
     sourcemap: false,